@@ -3,11 +3,12 @@ CLI模块 - 交互式命令行界面
 
 提供:
 - InteractiveMenu: 交互式菜单系统
+- NonInteractiveMenu / make_menu: 非交互模式菜单及按环境选择菜单的工厂
 - ScannerOutput: 规范化输出格式
 - ProgressTracker: 进度追踪
 """
 
 from .output import ScannerOutput
-from .menu import InteractiveMenu
+from .menu import InteractiveMenu, NonInteractiveMenu, make_menu
 
-__all__ = ['ScannerOutput', 'InteractiveMenu']
+__all__ = ['ScannerOutput', 'InteractiveMenu', 'NonInteractiveMenu', 'make_menu']
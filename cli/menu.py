@@ -9,19 +9,58 @@
 - 配置确认
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, NamedTuple
 import sys
 import json
 import os
+import functools
+import importlib.util
+import operator
+import re
+import stat
+import tempfile
+from collections import defaultdict
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from types import MappingProxyType
+
+# questionary（依赖 prompt_toolkit）导入较慢：这里只检查是否已安装，
+# 真正的导入推迟到交互模式第一次用到时（见 _q()）
+QUESTIONARY_AVAILABLE = importlib.util.find_spec("questionary") is not None
+
+
+@functools.lru_cache(maxsize=None)
+def _q():
+    """questionary 模块（首次调用时导入）"""
+    import questionary
+    return questionary
+
+
+from .output import ScannerOutput
 
+# 可选：orjson 加速 config.json / tag_categories.json 读写
 try:
-    import questionary
-    from questionary import Style
-    QUESTIONARY_AVAILABLE = True
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
 except ImportError:
-    QUESTIONARY_AVAILABLE = False
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
 
-from .output import ScannerOutput
+
+# 终端/平台检测结果在进程内不会变化，模块加载时计算一次
+_IS_TTY = sys.stdin.isatty() if hasattr(sys.stdin, 'isatty') else False
+_IS_WIN32 = sys.platform == 'win32'
+
+# Windows 控制台是否已切换为 UTF-8 输出（每个进程只需切换一次）
+_STDOUT_CONFIGURED = False
 
 
 # 导入场景常量
@@ -34,17 +73,488 @@ except ImportError:
         STRATEGY_SCAN = "strategy_scan"
 
 
-# 自定义questionary样式
-MENU_STYLE = Style([
-    ('qmark', 'fg:cyan bold'),
-    ('question', 'bold'),
-    ('answer', 'fg:green bold'),
-    ('pointer', 'fg:cyan bold'),
-    ('highlighted', 'fg:cyan bold'),
-    ('selected', 'fg:green'),
-    ('separator', 'fg:gray'),
-    ('instruction', 'fg:gray'),
-]) if QUESTIONARY_AVAILABLE else None
+@functools.lru_cache(maxsize=None)
+def _menu_style():
+    """自定义questionary样式（首次使用时构建）"""
+    return _q().Style([
+        ('qmark', 'fg:cyan bold'),
+        ('question', 'bold'),
+        ('answer', 'fg:green bold'),
+        ('pointer', 'fg:cyan bold'),
+        ('highlighted', 'fg:cyan bold'),
+        ('selected', 'fg:green'),
+        ('separator', 'fg:gray'),
+        ('instruction', 'fg:gray'),
+    ])
+
+
+# 领域关键词（用于根据调用方提供的文本提示直接判定领域，无需交互选择）
+_DOMAIN_KEYWORDS = {
+    "crypto": (
+        'bitcoin', 'btc', 'ethereum', 'eth', 'crypto', 'cryptocurrency',
+        'solana', 'sol', 'dogecoin', 'doge', 'xrp', 'defi', 'token', 'stablecoin',
+    ),
+    "politics": (
+        'election', 'congress', 'senate', 'president', 'presidential', 'trump', 'biden',
+        'republican', 'democrat', 'vote', 'ballot', 'governor', 'primary',
+    ),
+    "sports": (
+        'nba', 'nfl', 'mlb', 'nhl', 'world cup', 'super bowl', 'championship',
+        'game', 'team', 'player', 'match', 'tournament', 'playoffs',
+    ),
+}
+
+# 每个领域一个整词匹配的交替正则（导入时编译一次）
+_DOMAIN_PATTERNS = {
+    domain: re.compile(r'\b(?:' + '|'.join(map(re.escape, words)) + r')\b', re.IGNORECASE)
+    for domain, words in _DOMAIN_KEYWORDS.items()
+}
+
+# 判定领域所需的最少关键词命中数
+_DOMAIN_MIN_HITS = 2
+
+
+def classify_domain(text: Optional[str]) -> Optional[str]:
+    """
+    根据关键词判定文本所属领域
+
+    命中数最多且至少命中 _DOMAIN_MIN_HITS 次的领域胜出；
+    没有足够命中或多个领域并列时返回 None（交给用户选择）。
+
+    Args:
+        text: 提示文本，如市场问题、slug 或用户输入
+
+    Returns:
+        领域标识 ('crypto' / 'politics' / 'sports')，无法确定时为 None
+    """
+    if not text:
+        return None
+
+    hits = sorted(
+        ((len(pattern.findall(text)), domain) for domain, pattern in _DOMAIN_PATTERNS.items()),
+        reverse=True
+    )
+    best_hits, best_domain = hits[0]
+    if best_hits < _DOMAIN_MIN_HITS or best_hits == hits[1][0]:
+        return None
+    return best_domain
+
+
+# 回测预设时间范围（timedelta 在导入时构建一次）
+_TIME_RANGE_DELTAS = {
+    "24h": timedelta(hours=24),
+    "3d": timedelta(days=3),
+    "7d": timedelta(days=7),
+}
+
+
+# 静态菜单选项（首次使用时构建一次，之后每次渲染菜单直接复用）
+@functools.lru_cache(maxsize=None)
+def _main_menu_choices() -> list:
+    """主菜单选项"""
+    q = _q()
+    return [
+        q.Choice("开始扫描", value="scan"),
+        q.Choice("LLM配置", value="llm_config"),
+        q.Choice("配置设置", value="config"),
+        q.Choice("Tags智能分类", value="classify_tags"),
+        q.Choice("历史回测", value="backtest"),
+        q.Choice("灵敏度分析", value="sensitivity_analysis"),
+        q.Choice("同步结算状态", value="sync_settlements"),
+        q.Choice("收益统计 (PnL)", value="stats"),
+        q.Choice("查看历史", value="history"),
+        q.Choice("帮助文档", value="help"),
+        q.Separator(),
+        q.Choice("退出", value="exit"),
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _domain_choices() -> list:
+    """领域选项"""
+    q = _q()
+    return [
+        q.Choice(
+            title="加密货币 (推荐) - 规则清晰，流动性好",
+            value="crypto"
+        ),
+        q.Choice(
+            title="体育赛事 - 规则较标准",
+            value="sports"
+        ),
+        q.Choice(
+            title="政治选举 - 风险较高，需人工验证",
+            value="politics"
+        ),
+        q.Choice(
+            title="其他市场",
+            value="other"
+        ),
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _run_mode_choices() -> list:
+    """运行模式选项"""
+    q = _q()
+    return [
+        q.Choice(
+            "PRODUCTION - 自动保存，无人值守 (推荐)",
+            value="production"
+        ),
+        q.Choice(
+            "DEBUG - 逐个确认，适合调试",
+            value="debug"
+        ),
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _cache_choices() -> list:
+    """缓存选项"""
+    q = _q()
+    return [
+        q.Choice(
+            "使用缓存数据 (推荐，速度更快)",
+            value=False
+        ),
+        q.Choice(
+            "强制刷新市场数据 (从API重新获取最新价格)",
+            value=True
+        ),
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _llm_action_choices() -> list:
+    """LLM配置确认后的操作选项"""
+    q = _q()
+    return [
+        q.Choice("继续使用此配置", value="continue"),
+        q.Choice("切换到其他LLM配置", value="change"),
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _backtest_range_choices() -> list:
+    """回测时间范围选项"""
+    q = _q()
+    return [
+        q.Choice("最近 24 小时", value="24h"),
+        q.Choice("最近 3 天", value="3d"),
+        q.Choice("最近 7 天", value="7d"),
+        q.Choice("自定义范围", value="custom"),
+        q.Separator(),
+        q.Choice("返回", value="back"),
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _backtest_domain_choices() -> list:
+    """回测领域选项"""
+    q = _q()
+    return [
+        q.Choice("加密货币 (Crypto)", value="crypto"),
+        q.Choice("政治 (Politics)", value="politics"),
+        q.Choice("体育 (Sports)", value="sports"),
+        q.Choice("其他 (Other)", value="other"),
+        q.Choice("所有领域", value="all"),
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _tags_classify_choices() -> list:
+    """Tags分类二级菜单选项"""
+    q = _q()
+    return [
+        q.Choice("刷新分类标签 (从API重新拉取)", value="refresh"),
+        q.Choice("细分Other分类 (将other重分类)", value="refine"),
+        q.Separator(),
+        q.Choice("返回主菜单", value="back"),
+    ]
+
+
+def _select(message: str, choices, shortcuts: bool = False):
+    """统一的单选提示（固定使用菜单样式）"""
+    return _q().select(
+        message,
+        choices=choices,
+        style=_menu_style(),
+        use_shortcuts=shortcuts
+    ).ask()
+
+
+# 子类别多选中"全部"选项的值（分组选项的值为 ("GROUP", 分组名) 元组）
+_SUBCAT_ALL = object()
+
+
+def _validate_strategy_selection(selected) -> Any:
+    """策略多选校验：至少选择一个"""
+    return len(selected) > 0 or "请至少选择一个策略"
+
+
+@functools.lru_cache(maxsize=1)
+def _get_llm_manager():
+    """
+    获取共享的 LLMConfigManager（首次调用时读取 config.json 中的 llm_profiles）
+
+    菜单之间来回切换时复用同一实例；config.json 被修改后调用
+    _get_llm_manager.cache_clear() 使其重新加载。
+    """
+    from llm_config import LLMConfigManager
+    return LLMConfigManager()
+
+
+@functools.lru_cache(maxsize=64)
+def _model_icon(model: str) -> str:
+    """模型图标（按模型名缓存）"""
+    from llm_providers import get_model_icon
+    return get_model_icon(model)
+
+
+@functools.lru_cache(maxsize=None)
+def _rich_panel():
+    """rich.panel.Panel 类（首次使用时导入，之后直接返回缓存的类）"""
+    from rich.panel import Panel
+    return Panel
+
+
+# LLM 配置 Panel 文本模板（模块加载时定义一次，渲染时用 % 填充）
+_CONFIRM_PANEL_TMPL = (
+    "[bold cyan]系统LLM配置[/bold cyan]  [dim](config.json)[/dim]\n\n"
+    "%s [bold]%s[/bold]: %s\n"
+    "[dim]%s[/dim]"
+    "%s"
+)
+_CONFIRM_SCENARIO_TMPL = "\n[dim]  • Tag分类: %s\n  • 策略扫描: %s[/dim]"
+
+_CURRENT_PANEL_TMPL = (
+    "[bold cyan]当前LLM配置[/bold cyan]\n\n"
+    "%s [bold]%s[/bold]\n"
+    "[dim]模型: %s[/dim]"
+    "%s"
+)
+_CURRENT_SCENARIO_TMPL = (
+    "\n\n[dim]场景化模型配置：\n"
+    "  • Tag分类: %s\n"
+    "  • 策略扫描: %s[/dim]"
+)
+
+
+# Tags智能分类说明 Panel 文本
+_REFRESH_PANEL_TEXT = (
+    "[bold cyan]Tags智能分类 - 刷新标签[/bold cyan]\n\n"
+    "从Polymarket API获取所有tags，\n"
+    "使用LLM智能分类到9个类别。\n\n"
+    "[dim]• 批量分类，快速高效\n"
+    "• 生成预览报告，确认后应用\n"
+    "• 自动备份原配置文件\n\n"
+    "分类类别：\n"
+    "crypto, politics, sports, finance, tech,\n"
+    "entertainment, science, weather, misc[/dim]"
+)
+
+_REFINE_PANEL_TEXT = (
+    "[bold cyan]Tags智能分类 - 细分Other[/bold cyan]\n\n"
+    "将当前标记为'other'的tags（约2439个）\n"
+    "重新分类到6个细分类别。\n\n"
+    "[dim]• finance (传统金融)\n"
+    "• tech (科技/AI)\n"
+    "• entertainment (娱乐/文化)\n"
+    "• science (科学/研究)\n"
+    "• weather (天气/自然)\n"
+    "• misc (杂项)\n\n"
+    "预计需要约120次LLM调用[/dim]"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _refresh_panel():
+    """刷新分类标签的说明 Panel（首次使用时构建，之后复用）"""
+    return _rich_panel().fit(_REFRESH_PANEL_TEXT, border_style="cyan", padding=(1, 2))
+
+
+@functools.lru_cache(maxsize=None)
+def _refine_panel():
+    """细分Other分类的说明 Panel（首次使用时构建，之后复用）"""
+    return _rich_panel().fit(_REFINE_PANEL_TEXT, border_style="cyan", padding=(1, 2))
+
+
+# config.json 解析结果缓存（按文件修改时间失效）
+_CONFIG_CACHE = {'mtime_ns': None, 'config': None}
+
+
+def _get_app_config():
+    """
+    获取应用配置（AppConfig.load() 的缓存版本）
+
+    仅当 config.json 的修改时间变化时才重新解析；文件不存在时每次从环境变量加载。
+    """
+    from config import Config as AppConfig
+
+    try:
+        mtime_ns = os.stat("config.json").st_mtime_ns
+    except OSError:
+        return AppConfig.load()
+
+    if _CONFIG_CACHE['config'] is None or _CONFIG_CACHE['mtime_ns'] != mtime_ns:
+        _CONFIG_CACHE['config'] = AppConfig.load()
+        _CONFIG_CACHE['mtime_ns'] = mtime_ns
+    return _CONFIG_CACHE['config']
+
+
+# 子类别分组配置文件（导入时解析一次路径）
+_TAG_CATEGORIES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'data',
+    'tag_categories.json'
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_subcategory_groups_cached(mtime_ns: int, domain: str) -> Optional[Dict[str, List[str]]]:
+    """
+    读取并分组 tag_categories.json（按文件修改时间和领域缓存）
+
+    调用方只读使用返回值，不要修改。
+    """
+    try:
+        with open(_TAG_CATEGORIES_PATH, 'rb') as f:
+            data = _json_loads(f.read())
+
+        # 优先使用 groups 配置
+        groups = data.get('groups', {}).get(domain, {})
+        if groups:
+            return groups
+
+        # 回退到首字母分组（兼容旧配置）
+        subcats = data.get('categories', {}).get(domain, [])
+        if not subcats:
+            return None
+
+        # 按首字母分组
+        grouped = defaultdict(list)
+        for tag in sorted(subcats):
+            first_char = tag[:1].upper() or '其他'
+            group_name = f"{first_char}开头" if first_char.isalpha() else '其他'
+            grouped[group_name].append(tag)
+
+        return dict(grouped) or None
+
+    except Exception:
+        return None
+
+
+# 默认策略列表（当注册表不可用时使用）
+_DEFAULT_STRATEGIES = [
+    {
+        'id': 'monotonicity',
+        'name': '单调性违背套利',
+        'name_en': 'Monotonicity Violation',
+        'description': '检测阈值市场的价格倒挂',
+        'risk_level': 'low',
+        'priority': 1,
+        'domains': ['crypto'],
+        'help_detail': '检测原理: 检测阈值市场的价格倒挂现象\n适用条件: 加密货币阈值市场（如 BTC>100k, ETH>5k）',
+        'example': '示例: BTC>100k 价格 65¢，BTC>95k 价格 60¢\n套利: 买入 BTC>95k YES，卖出 BTC>100k YES\n收益: 5¢（约8.3%）'
+    },
+    {
+        'id': 'interval',
+        'name': '区间套利',
+        'name_en': 'Interval Arbitrage',
+        'description': '区间覆盖关系套利',
+        'risk_level': 'low',
+        'priority': 2,
+        'domains': ['crypto', 'all'],
+        'help_detail': '检测原理: 利用区间覆盖关系和完备性\n适用条件: 价格区间类市场',
+        'example': '示例: 完备区间总和 < 1 时，买入所有区间的YES'
+    },
+    {
+        'id': 'exhaustive',
+        'name': '完备集套利',
+        'name_en': 'Exhaustive Set',
+        'description': '互斥完备集定价不足',
+        'risk_level': 'medium',
+        'priority': 3,
+        'domains': ['all'],
+        'help_detail': '检测原理: 互斥完备集的YES价格总和应等于1\n适用条件: 多选项市场',
+        'example': '示例: 选举候选人价格总和 < 1 时，买入所有候选人YES'
+    },
+    {
+        'id': 'implication',
+        'name': '蕴含关系套利',
+        'name_en': 'Implication Violation',
+        'description': 'A -> B 价格违背',
+        'risk_level': 'medium',
+        'priority': 4,
+        'domains': ['all'],
+        'help_detail': '检测原理: 利用逻辑蕴含关系 P(B) >= P(A)\n适用条件: 存在逻辑蕴含关系的两个市场',
+        'example': '示例: "BTC>100k" 蕴含 "BTC>95k"\n套利: 买入B_YES + 买入A_NO'
+    },
+    {
+        'id': 'equivalent',
+        'name': '等价市场套利',
+        'name_en': 'Equivalent Markets',
+        'description': '同事件不同表述',
+        'risk_level': 'medium',
+        'priority': 5,
+        'domains': ['all'],
+        'help_detail': '检测原理: 同一事件的不同表述应有相同价格\n适用条件: 语义等价的两个市场',
+        'example': '示例: 同一BTC目标价的不同表述有价差时，低买高卖'
+    },
+]
+
+# 预先生成策略多选菜单的标题，避免每次渲染时重复格式化
+for _s in _DEFAULT_STRATEGIES:
+    _s['_title'] = f"{_s['name']} ({_s['name_en']})\n    [{_s['risk_level'].upper()}] {_s['description']}"
+del _s
+
+# 默认策略条目只读共享（菜单缓存直接返回这些对象）
+_DEFAULT_STRATEGIES = tuple(MappingProxyType(s) for s in _DEFAULT_STRATEGIES)
+
+
+@functools.lru_cache(maxsize=8)
+def _default_strategies_for(domain: str) -> tuple:
+    """按领域过滤默认策略列表（缓存）"""
+    return tuple(
+        s for s in _DEFAULT_STRATEGIES
+        if 'all' in s['domains'] or domain in s['domains']
+    )
+
+
+class StrategyView(NamedTuple):
+    """策略菜单展示所需字段（统一 dict 和 StrategyMetadata 两种来源）"""
+    id: str
+    name: str
+    title: str
+    priority: int
+
+
+def _normalize_meta(meta) -> StrategyView:
+    """将默认策略 dict 或 StrategyMetadata 转换为 StrategyView"""
+    if isinstance(meta, Mapping):
+        # 默认策略的标题已在模块加载时生成
+        return StrategyView(meta['id'], meta['name'], meta['_title'], meta['priority'])
+
+    risk = meta.risk_level.value if hasattr(meta.risk_level, 'value') else meta.risk_level
+    title = f"{meta.name} ({meta.name_en})\n    [{risk.upper()}] {meta.description}"
+    return StrategyView(meta.id, meta.name, title, meta.priority)
+
+
+@functools.lru_cache(maxsize=None)
+def _strategy_registry():
+    """策略注册表（延迟导入避免循环依赖；不可用时返回 None，结果缓存）"""
+    try:
+        from strategies import StrategyRegistry
+    except ImportError:
+        return None
+    return StrategyRegistry
+
+
+@functools.lru_cache(maxsize=8)
+def _default_strategies_by_id(domain: str) -> Dict[str, Dict]:
+    """按策略ID索引的默认策略（缓存）"""
+    return {s['id']: s for s in _default_strategies_for(domain)}
 
 
 class InteractiveMenu:
@@ -70,12 +580,18 @@ class InteractiveMenu:
             output: ScannerOutput实例，用于格式化输出
         """
         self.output = output or ScannerOutput()
-        self.is_interactive = QUESTIONARY_AVAILABLE and sys.stdin.isatty()
+        # 输出模式在会话内不变，缓存以减少菜单渲染时的属性链查找
+        self._use_rich = bool(getattr(self.output, 'use_rich', False))
+        self._console = getattr(self.output, 'console', None)
+        self.is_interactive = QUESTIONARY_AVAILABLE and _IS_TTY
 
         # 保存当前会话中选择的LLM配置
         self.current_llm_profile = None
         self.current_llm_model = None
 
+        # 按领域缓存的可用策略: {domain: (注册策略数, 策略元数据列表)}
+        self._strategy_cache: Dict[str, tuple] = {}
+
     def show_llm_confirmation_prompt(self, config) -> Optional[Dict[str, str]]:
         """
         显示当前配置的LLM并提供快速切换选项
@@ -89,10 +605,7 @@ class InteractiveMenu:
             None: 继续使用配置文件中的LLM
             Dict: 用户选择的新LLM配置 {"profile": "xxx", "model": "xxx"}
         """
-        from llm_config import LLMConfigManager
-        from llm_providers import get_model_icon
-
-        manager = LLMConfigManager()
+        manager = _get_llm_manager()
 
         # 获取active_profile
         active_profile_name = getattr(config, 'active_profile', None)
@@ -118,9 +631,10 @@ class InteractiveMenu:
             return self.select_llm_profile()
 
         # 显示当前配置
-        if self.output.use_rich:
-            from rich.panel import Panel
-            icon = get_model_icon(active_profile.model)
+        if self._use_rich:
+            Panel = _rich_panel()
+            icon = _model_icon(active_profile.model)
+            model_short = active_profile.model.rsplit('/', 1)[-1]
 
             # 检查是否有场景化模型配置
             scenario_info = ""
@@ -128,17 +642,19 @@ class InteractiveMenu:
                 tag_model = active_profile.scenario_models.get("tag_classification", active_profile.model)
                 scan_model = active_profile.scenario_models.get("strategy_scan", active_profile.model)
                 if tag_model != active_profile.model or scan_model != active_profile.model:
-                    scenario_info = f"\n[dim]  • Tag分类: {tag_model.split('/')[-1]}\n  • 策略扫描: {scan_model.split('/')[-1]}[/dim]"
+                    tag_short = tag_model.rsplit('/', 1)[-1]
+                    scan_short = scan_model.rsplit('/', 1)[-1]
+                    scenario_info = _CONFIRM_SCENARIO_TMPL % (tag_short, scan_short)
 
             panel = Panel.fit(
-                f"[bold cyan]系统LLM配置[/bold cyan]  [dim](config.json)[/dim]\n\n"
-                f"{icon} [bold]{active_profile.name}[/bold]: {active_profile.model.split('/')[-1]}\n"
-                f"[dim]{active_profile.description}[/dim]"
-                f"{scenario_info}",
+                _CONFIRM_PANEL_TMPL % (
+                    icon, active_profile.name, model_short,
+                    active_profile.description, scenario_info
+                ),
                 border_style="cyan",
                 padding=(0, 2)
             )
-            self.output.console.print(panel)
+            self._console.print(panel)
         else:
             print(f"\n当前LLM配置: {active_profile.name}")
             print(f"  模型: {active_profile.model}")
@@ -151,16 +667,9 @@ class InteractiveMenu:
             return None
 
         # 询问是否切换
-        choices = [
-            questionary.Choice("继续使用此配置", value="continue"),
-            questionary.Choice("切换到其他LLM配置", value="change"),
-        ]
+        choices = _llm_action_choices()
 
-        action = questionary.select(
-            "请选择操作:",
-            choices=choices,
-            style=MENU_STYLE
-        ).ask()
+        action = _select("请选择操作:", choices)
 
         if action == "change":
             return self.select_llm_profile()
@@ -183,10 +692,7 @@ class InteractiveMenu:
         if not self.is_interactive:
             return
 
-        from llm_config import LLMConfigManager
-        from llm_providers import get_model_icon
-
-        manager = LLMConfigManager()
+        manager = _get_llm_manager()
 
         # 获取当前LLM配置
         if self.current_llm_profile:
@@ -195,8 +701,7 @@ class InteractiveMenu:
         else:
             # 使用默认配置（从config.json读取）
             try:
-                from config import Config as AppConfig
-                config = AppConfig.load()
+                config = _get_app_config()
                 active_profile_name = getattr(config, 'active_profile', None)
                 if active_profile_name:
                     profile = manager.get_profile(active_profile_name)
@@ -210,9 +715,9 @@ class InteractiveMenu:
             return
 
         # 显示Panel
-        if self.output.use_rich:
-            from rich.panel import Panel
-            icon = get_model_icon(profile.model)
+        if self._use_rich:
+            Panel = _rich_panel()
+            icon = _model_icon(profile.model)
 
             # 构建场景模型信息
             scenario_info = ""
@@ -220,21 +725,16 @@ class InteractiveMenu:
                 tag_model = profile.scenario_models.get("tag_classification", profile.model)
                 scan_model = profile.scenario_models.get("strategy_scan", profile.model)
                 if tag_model != profile.model or scan_model != profile.model:
-                    scenario_info = (
-                        f"\n\n[dim]场景化模型配置：\n"
-                        f"  • Tag分类: {tag_model.split('/')[-1]}\n"
-                        f"  • 策略扫描: {scan_model.split('/')[-1]}[/dim]"
-                    )
+                    tag_short = tag_model.rsplit('/', 1)[-1]
+                    scan_short = scan_model.rsplit('/', 1)[-1]
+                    scenario_info = _CURRENT_SCENARIO_TMPL % (tag_short, scan_short)
 
             panel = Panel.fit(
-                f"[bold cyan]当前LLM配置[/bold cyan]\n\n"
-                f"{icon} [bold]{profile.name}[/bold]\n"
-                f"[dim]模型: {profile.model}[/dim]"
-                f"{scenario_info}",
+                _CURRENT_PANEL_TMPL % (icon, profile.name, profile.model, scenario_info),
                 border_style="cyan",
                 padding=(0, 2)
             )
-            self.output.console.print(panel)
+            self._console.print(panel)
             print()  # 添加空行
         else:
             print(f"\n当前LLM配置: {profile.name}")
@@ -251,27 +751,7 @@ class InteractiveMenu:
         if not self.is_interactive:
             return "scan"  # 非交互模式默认扫描
 
-        choices = [
-            questionary.Choice("开始扫描", value="scan"),
-            questionary.Choice("LLM配置", value="llm_config"),
-            questionary.Choice("配置设置", value="config"),
-            questionary.Choice("Tags智能分类", value="classify_tags"),
-            questionary.Choice("历史回测", value="backtest"),
-            questionary.Choice("灵敏度分析", value="sensitivity_analysis"),
-            questionary.Choice("同步结算状态", value="sync_settlements"),
-            questionary.Choice("收益统计 (PnL)", value="stats"),
-            questionary.Choice("查看历史", value="history"),
-            questionary.Choice("帮助文档", value="help"),
-            questionary.Separator(),
-            questionary.Choice("退出", value="exit"),
-        ]
-
-        result = questionary.select(
-            "请选择操作:",
-            choices=choices,
-            style=MENU_STYLE,
-            use_shortcuts=True
-        ).ask()
+        result = _select("请选择操作:", _main_menu_choices(), shortcuts=True)
 
         return result or "exit"
 
@@ -285,10 +765,7 @@ class InteractiveMenu:
         if not self.is_interactive:
             return {}
 
-        from llm_config import LLMConfigManager
-        from llm_providers import is_reasoning_model, get_model_icon
-
-        manager = LLMConfigManager()
+        manager = _get_llm_manager()
         configured = manager.get_configured_profiles()
 
         if not configured:
@@ -303,7 +780,7 @@ class InteractiveMenu:
         # 1. 选择Provider/Profile
         choices = []
         for p in configured:
-            icon = get_model_icon(p.model)
+            icon = _model_icon(p.model)
             desc = p.description or p.name
             # 显示场景模型配置提示
             scenario_hint = ""
@@ -311,20 +788,15 @@ class InteractiveMenu:
                 if LLMScenario.TAG_CLASSIFICATION in p.scenario_models:
                     tag_model = p.scenario_models[LLMScenario.TAG_CLASSIFICATION]
                     if tag_model != p.model:
-                        scenario_hint = f" [Tag: {tag_model.split('/')[-1]}]"
+                        scenario_hint = f" [Tag: {tag_model.rsplit('/', 1)[-1]}]"
 
-            choices.append(questionary.Choice(
-                title=f"{icon} {p.name}: {p.model.split('/')[-1]}{scenario_hint}",
+            choices.append(_q().Choice(
+                title=f"{icon} {p.name}: {p.model.rsplit('/', 1)[-1]}{scenario_hint}",
                 value=p.name,
                 description=desc
             ))
 
-        profile_name = questionary.select(
-            "选择LLM配置:",
-            choices=choices,
-            style=MENU_STYLE,
-            use_shortcuts=True
-        ).ask()
+        profile_name = _select("选择LLM配置:", choices, shortcuts=True)
 
         if not profile_name:
             return {}
@@ -334,41 +806,39 @@ class InteractiveMenu:
 
         # 2. 如果profile有多个可用模型，提供模型选择
         if profile.models_available and len(profile.models_available) > 1:
-            model_choices = []
-
-            # 按思考模型分组
-            reasoning_models = [m for m in profile.models_available if is_reasoning_model(m)]
-            fast_models = [m for m in profile.models_available if not is_reasoning_model(m)]
-
-            # 先添加思考模型
-            if reasoning_models:
-                for model in reasoning_models:
-                    marker = " [当前Tag分类]" if model == profile.scenario_models.get(LLMScenario.TAG_CLASSIFICATION, "") else ""
-                    model_choices.append(questionary.Choice(
-                        title=f"🧪 {model} [THINK]{marker}",
-                        value=model
-                    ))
-
-            # 再添加快速模型
-            if fast_models:
-                for model in fast_models:
-                    marker = " [当前策略扫描]" if model == profile.scenario_models.get(LLMScenario.STRATEGY_SCAN, "") else ""
-                    model_choices.append(questionary.Choice(
-                        title=f"⚡ {model} [FAST]{marker}",
-                        value=model
-                    ))
-
-            model_choices.append(questionary.Separator())
-            model_choices.append(questionary.Choice(
+            from llm_providers import is_reasoning_model
+
+            # 按思考模型分组（单次遍历）
+            reasoning_models, fast_models = [], []
+            for m in profile.models_available:
+                (reasoning_models if is_reasoning_model(m) else fast_models).append(m)
+
+            # 当前场景模型只需查找一次
+            tag_sel = profile.scenario_models.get(LLMScenario.TAG_CLASSIFICATION, "")
+            scan_sel = profile.scenario_models.get(LLMScenario.STRATEGY_SCAN, "")
+
+            # 先添加思考模型，再添加快速模型
+            model_choices = [
+                _q().Choice(
+                    title=f"🧪 {model} [THINK]{' [当前Tag分类]' if model == tag_sel else ''}",
+                    value=model
+                )
+                for model in reasoning_models
+            ] + [
+                _q().Choice(
+                    title=f"⚡ {model} [FAST]{' [当前策略扫描]' if model == scan_sel else ''}",
+                    value=model
+                )
+                for model in fast_models
+            ]
+
+            model_choices.append(_q().Separator())
+            model_choices.append(_q().Choice(
                 title="使用默认配置 (保持场景化模型设置)",
                 value=profile.model
             ))
 
-            selected_model = questionary.select(
-                "选择默认模型 (可稍后在扫描时按场景自动切换):",
-                choices=model_choices,
-                style=MENU_STYLE
-            ).ask()
+            selected_model = _select("选择默认模型 (可稍后在扫描时按场景自动切换):", model_choices)
 
             if selected_model:
                 result["model"] = selected_model
@@ -395,35 +865,55 @@ class InteractiveMenu:
         """
         config_path = "config.json"
 
-        if not os.path.exists(config_path):
-            return False
-
         try:
-            # 读取现有配置
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            # 读取现有配置（直接打开，文件不存在时由 FileNotFoundError 处理）
+            with open(config_path, 'rb') as f:
+                config = _json_loads(f.read())
 
             # 更新 active_profile
             config['active_profile'] = profile_name
 
-            # 保存回文件
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            # 先完整写入临时文件再原子替换，避免写入中断导致 config.json 损坏；
+            # 临时文件沿用原文件权限（config.json 含 API Key，不能因替换而放宽），失败时删除
+            payload = _json_dumps(config).encode('utf-8')
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(config_path)),
+                prefix=".config.json.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.chmod(tmp_path, stat.S_IMODE(os.stat(config_path).st_mode))
+                os.replace(tmp_path, config_path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+            # config.json 已变更，下次使用时重新加载 LLM 配置和应用配置
+            _get_llm_manager.cache_clear()
+            _CONFIG_CACHE['config'] = None
 
             # 提示用户
-            if self.output.use_rich:
-                self.output.console.print(
+            if self._use_rich:
+                self._console.print(
                     f"[green]✓ 已保存LLM配置: {profile_name}[/green]"
                 )
-                self.output.console.print(
+                self._console.print(
                     "[dim]提示: 下次启动将自动使用此配置[/dim]"
                 )
 
             return True
 
+        except FileNotFoundError:
+            return False
         except Exception as e:
-            if self.output.use_rich:
-                self.output.console.print(
+            if self._use_rich:
+                self._console.print(
                     f"[yellow]⚠ 保存配置失败: {e}[/yellow]"
                 )
             return False
@@ -442,97 +932,97 @@ class InteractiveMenu:
             categories = scanner.get_available_categories()
             return categories[0] if categories else None
 
-        # 获取可用类别
-        if scanner.use_dynamic_categories:
-            self.output.print_info("🔍 正在获取市场分类...")
-            categories = scanner.get_available_categories()
-        else:
-            categories = scanner.get_available_categories()
+        choices = None
+        choices_key = None
 
-        if not categories:
-            self.output.print_error("未找到任何可用类别")
-            return None
+        # 刷新/切换模式后回到循环顶部重新展示菜单（代替递归调用）
+        while True:
+            # 获取可用类别
+            if scanner.use_dynamic_categories:
+                self.output.print_info("🔍 正在获取市场分类...")
+                categories = scanner.get_available_categories()
+            else:
+                categories = scanner.get_available_categories()
 
-        # 构建菜单选项
-        choices = []
-        for cat in sorted(categories, key=lambda c: c.priority):
-            icon = cat.icon or "📁"
-            # 只有动态分类才有市场统计
-            market_hint = f" ({cat.market_count} markets)" if cat.market_count > 0 else ""
+            if not categories:
+                self.output.print_error("未找到任何可用类别")
+                return None
 
-            choices.append(questionary.Choice(
-                title=f"{icon} {cat.name_zh} - {cat.description[:50]}{market_hint}",
+            # 类别列表和分类模式都未变化时复用已构建的菜单选项
+            key = (id(categories), scanner.use_dynamic_categories)
+            if key != choices_key:
+                choices = self._build_category_choices(categories, scanner.use_dynamic_categories)
+                choices_key = key
+
+            result = _select("选择扫描类别:", choices)
+
+            # 处理特殊操作
+            if result == "refresh":
+                self.output.print_info("正在重新分析市场 tags...")
+                scanner.get_available_categories(force_refresh=True)
+                continue
+            elif result == "switch_mode":
+                scanner.use_dynamic_categories = not scanner.use_dynamic_categories
+                mode_name = "动态分类" if scanner.use_dynamic_categories else "固定分类"
+                self.output.print_info(f"已切换到 {mode_name} 模式")
+                continue
+            elif result is None:
+                # 用户按了 Ctrl+C
+                return categories[0]
+            else:
+                return result
+
+    @staticmethod
+    def _build_category_choices(categories, use_dynamic_categories: bool) -> list:
+        """构建类别菜单选项（按优先级排序，末尾附加管理选项）"""
+        # scanner.get_available_categories() 已按优先级排序返回，已有序时跳过重排
+        if any(a.priority > b.priority for a, b in zip(categories, categories[1:])):
+            categories = sorted(categories, key=operator.attrgetter('priority'))
+
+        # 只有动态分类才有市场统计
+        choices = [
+            _q().Choice(
+                title=(
+                    f"{cat.icon or '📁'} {cat.name_zh} - {cat.description[:50]}"
+                    f"{f' ({cat.market_count} markets)' if cat.market_count > 0 else ''}"
+                ),
                 value=cat
-            ))
+            )
+            for cat in categories
+        ]
 
         # 添加管理选项
-        choices.append(questionary.Separator())
-        if scanner.use_dynamic_categories:
-            choices.append(questionary.Choice(
+        choices.append(_q().Separator())
+        if use_dynamic_categories:
+            choices.append(_q().Choice(
                 title="🔄 重新发现分类 (强制刷新 LLM 分析)",
                 value="refresh"
             ))
 
-        choices.append(questionary.Choice(
+        choices.append(_q().Choice(
             title="⚙️ 切换分类模式 (动态/固定)",
             value="switch_mode"
         ))
 
-        result = questionary.select(
-            "选择扫描类别:",
-            choices=choices,
-            style=MENU_STYLE
-        ).ask()
-
-        # 处理特殊操作
-        if result == "refresh":
-            self.output.print_info("正在重新分析市场 tags...")
-            scanner.get_available_categories(force_refresh=True)
-            return self.select_category(scanner)  # 递归调用
-        elif result == "switch_mode":
-            scanner.use_dynamic_categories = not scanner.use_dynamic_categories
-            mode_name = "动态分类" if scanner.use_dynamic_categories else "固定分类"
-            self.output.print_info(f"已切换到 {mode_name} 模式")
-            return self.select_category(scanner)
-        elif result is None:
-            # 用户按了 Ctrl+C
-            return categories[0]
-        else:
-            return result
+        return choices
 
-    def select_domain(self) -> str:
+    def select_domain(self, hint: Optional[str] = None) -> str:
         """
         选择扫描领域 (旧版 API 兼容)
 
         注意：新代码应优先使用 select_category
+
+        Args:
+            hint: 可选的文本提示（如市场问题或slug），能按关键词确定领域时跳过交互选择
         """
+        domain = classify_domain(hint)
+        if domain:
+            return domain
+
         if not self.is_interactive:
             return "crypto"
 
-        domains = [
-            questionary.Choice(
-                title="加密货币 (推荐) - 规则清晰，流动性好",
-                value="crypto"
-            ),
-            questionary.Choice(
-                title="体育赛事 - 规则较标准",
-                value="sports"
-            ),
-            questionary.Choice(
-                title="政治选举 - 风险较高，需人工验证",
-                value="politics"
-            ),
-            questionary.Choice(
-                title="其他市场",
-                value="other"
-            ),
-        ]
-
-        result = questionary.select(
-            "选择扫描领域:",
-            choices=domains,
-            style=MENU_STYLE
-        ).ask()
+        result = _select("选择扫描领域:", _domain_choices())
 
         return result or "crypto"
 
@@ -553,12 +1043,8 @@ class InteractiveMenu:
                 raise KeyError(strategy_id)
         except (ImportError, KeyError):
             # 从默认列表获取
-            all_strategies = self._get_default_strategies(domain)
-            for s in all_strategies:
-                if s['id'] == strategy_id:
-                    meta = s
-                    break
-            else:
+            meta = _default_strategies_by_id(domain).get(strategy_id)
+            if meta is None:
                 return
 
         # 兼容dict和StrategyMetadata
@@ -602,14 +1088,15 @@ class InteractiveMenu:
         help_text += "="*60 + "\n"
 
         # 使用 UTF-8 编码输出
-        import sys
-        if sys.platform == 'win32':
+        global _STDOUT_CONFIGURED
+        if _IS_WIN32 and not _STDOUT_CONFIGURED:
             # Windows 控制台使用 UTF-8
             sys.stdout.reconfigure(encoding='utf-8')
+            _STDOUT_CONFIGURED = True
         print(help_text)
         if self.is_interactive:
             try:
-                questionary.press_any_key_to_continue("按任意键返回...").ask()
+                _q().press_any_key_to_continue("按任意键返回...").ask()
             except Exception:
                 # 非交互环境，跳过
                 pass
@@ -624,156 +1111,73 @@ class InteractiveMenu:
         Returns:
             选中的策略ID列表
         """
-        # 延迟导入避免循环依赖
-        try:
-            from strategies import StrategyRegistry
-            available = StrategyRegistry.get_for_domain(domain)
-        except ImportError:
-            # 注册表尚未加载，使用硬编码列表
-            available = self._get_default_strategies(domain)
+        available = self._available_strategies(domain)
 
         if not self.is_interactive:
             # 非交互模式返回所有可用策略
             return [m.id if hasattr(m, 'id') else m['id'] for m in available]
 
+        q = _q()
+        views = [_normalize_meta(m) for m in available]
+
         # 首先询问是否查看策略说明
-        show_help = questionary.confirm(
+        show_help = q.confirm(
             "是否先查看策略详细说明?",
             default=False,
-            style=MENU_STYLE
+            style=_menu_style()
         ).ask()
 
         if show_help:
             # 显示策略说明菜单
-            strategy_choices = []
-            for meta in available:
-                if hasattr(meta, 'id'):
-                    strategy_id = meta.id
-                    name = meta.name
-                else:
-                    strategy_id = meta['id']
-                    name = meta['name']
-
-                strategy_choices.append(questionary.Choice(
-                    title=f"{name}",
-                    value=strategy_id
-                ))
-
-            strategy_choices.append(questionary.Separator())
-            strategy_choices.append(questionary.Choice("返回策略选择", value="back"))
+            strategy_choices = [q.Choice(title=v.name, value=v.id) for v in views]
+            strategy_choices += [
+                q.Separator(),
+                q.Choice("返回策略选择", value="back"),
+            ]
 
             while True:
-                choice = questionary.select(
-                    "选择要查看的策略:",
-                    choices=strategy_choices,
-                    style=MENU_STYLE
-                ).ask()
+                choice = _select("选择要查看的策略:", strategy_choices)
 
                 if choice == "back" or choice is None:
                     break
                 self.show_strategy_help(choice, domain)
 
-        # 构建选项
-        choices = []
-        for meta in available:
-            # 兼容dict和StrategyMetadata
-            if hasattr(meta, 'id'):
-                meta_id = meta.id
-                meta_name = meta.name
-                meta_name_en = meta.name_en
-                meta_description = meta.description
-                meta_risk = meta.risk_level.value if hasattr(meta.risk_level, 'value') else meta.risk_level
-                meta_priority = meta.priority
-            else:
-                meta_id = meta['id']
-                meta_name = meta['name']
-                meta_name_en = meta['name_en']
-                meta_description = meta['description']
-                meta_risk = meta['risk_level']
-                meta_priority = meta['priority']
-
-            label = f"{meta_name} ({meta_name_en})"
-            hint = f"[{meta_risk.upper()}] {meta_description}"
-
-            choices.append(questionary.Choice(
-                title=f"{label}\n    {hint}",
-                value=meta_id,
-                checked=(meta_priority <= 3)  # 高优先级默认选中
-            ))
+        # 构建选项（高优先级默认选中）
+        choices = [
+            q.Choice(title=v.title, value=v.id, checked=(v.priority <= 3))
+            for v in views
+        ]
 
-        selected = questionary.checkbox(
+        selected = q.checkbox(
             "选择套利策略 (空格选择，回车确认):",
             choices=choices,
-            style=MENU_STYLE,
-            validate=lambda x: len(x) > 0 or "请至少选择一个策略"
+            style=_menu_style(),
+            validate=_validate_strategy_selection
         ).ask()
 
         return selected or []
 
+    def _available_strategies(self, domain: str) -> list:
+        """
+        获取领域可用的策略元数据（按领域缓存）
+
+        注册表中的策略数量变化时重新查询；注册表不可用时使用硬编码列表。
+        """
+        registry = _strategy_registry()
+        if registry is None:
+            # 注册表尚未加载，使用硬编码列表
+            return self._get_default_strategies(domain)
+
+        version = len(registry.list_ids())
+        cached = self._strategy_cache.get(domain)
+        if cached is None or cached[0] != version:
+            cached = (version, registry.get_for_domain(domain))
+            self._strategy_cache[domain] = cached
+        return cached[1]
+
     def _get_default_strategies(self, domain: str) -> List[Dict]:
         """获取默认策略列表（当注册表不可用时）"""
-        all_strategies = [
-            {
-                'id': 'monotonicity',
-                'name': '单调性违背套利',
-                'name_en': 'Monotonicity Violation',
-                'description': '检测阈值市场的价格倒挂',
-                'risk_level': 'low',
-                'priority': 1,
-                'domains': ['crypto'],
-                'help_detail': '检测原理: 检测阈值市场的价格倒挂现象\n适用条件: 加密货币阈值市场（如 BTC>100k, ETH>5k）',
-                'example': '示例: BTC>100k 价格 65¢，BTC>95k 价格 60¢\n套利: 买入 BTC>95k YES，卖出 BTC>100k YES\n收益: 5¢（约8.3%）'
-            },
-            {
-                'id': 'interval',
-                'name': '区间套利',
-                'name_en': 'Interval Arbitrage',
-                'description': '区间覆盖关系套利',
-                'risk_level': 'low',
-                'priority': 2,
-                'domains': ['crypto', 'all'],
-                'help_detail': '检测原理: 利用区间覆盖关系和完备性\n适用条件: 价格区间类市场',
-                'example': '示例: 完备区间总和 < 1 时，买入所有区间的YES'
-            },
-            {
-                'id': 'exhaustive',
-                'name': '完备集套利',
-                'name_en': 'Exhaustive Set',
-                'description': '互斥完备集定价不足',
-                'risk_level': 'medium',
-                'priority': 3,
-                'domains': ['all'],
-                'help_detail': '检测原理: 互斥完备集的YES价格总和应等于1\n适用条件: 多选项市场',
-                'example': '示例: 选举候选人价格总和 < 1 时，买入所有候选人YES'
-            },
-            {
-                'id': 'implication',
-                'name': '蕴含关系套利',
-                'name_en': 'Implication Violation',
-                'description': 'A -> B 价格违背',
-                'risk_level': 'medium',
-                'priority': 4,
-                'domains': ['all'],
-                'help_detail': '检测原理: 利用逻辑蕴含关系 P(B) >= P(A)\n适用条件: 存在逻辑蕴含关系的两个市场',
-                'example': '示例: "BTC>100k" 蕴含 "BTC>95k"\n套利: 买入B_YES + 买入A_NO'
-            },
-            {
-                'id': 'equivalent',
-                'name': '等价市场套利',
-                'name_en': 'Equivalent Markets',
-                'description': '同事件不同表述',
-                'risk_level': 'medium',
-                'priority': 5,
-                'domains': ['all'],
-                'help_detail': '检测原理: 同一事件的不同表述应有相同价格\n适用条件: 语义等价的两个市场',
-                'example': '示例: 同一BTC目标价的不同表述有价差时，低买高卖'
-            },
-        ]
-
-        return [
-            s for s in all_strategies
-            if 'all' in s['domains'] or domain in s['domains']
-        ]
+        return list(_default_strategies_for(domain))
 
     def select_subcategories(self, domain: str) -> Optional[List[str]]:
         """
@@ -796,31 +1200,33 @@ class InteractiveMenu:
             return None  # 非交互模式默认全部
 
         # 构建分组选项
-        choices = [questionary.Choice("全部 (所有标签)", value="__ALL__", checked=True)]
-
-        for group_name, tags in groups.items():
-            tag_count = len(tags)
-            choices.append(questionary.Choice(
-                title=f"{group_name} ({tag_count}个标签)",
-                value=f"GROUP:{group_name}",
-                checked=False
-            ))
+        choices = [
+            _q().Choice("全部 (所有标签)", value=_SUBCAT_ALL, checked=True),
+            *(
+                _q().Choice(
+                    title=f"{group_name} ({len(tags)}个标签)",
+                    value=("GROUP", group_name),
+                    checked=False
+                )
+                for group_name, tags in groups.items()
+            ),
+        ]
 
-        selected = questionary.checkbox(
+        selected = _q().checkbox(
             "选择子类别分组 (留空或选择'全部'=所有子类别):",
             choices=choices,
-            style=MENU_STYLE
+            style=_menu_style()
         ).ask()
 
-        if not selected or "__ALL__" in selected:
+        if not selected or _SUBCAT_ALL in selected:
             return None
 
         # 展开选中的分组，返回所有相关标签
         expanded_tags = []
         for selection in selected:
-            if selection.startswith("GROUP:"):
-                group_name = selection.replace("GROUP:", "")
-                expanded_tags.extend(groups.get(group_name, []))
+            if isinstance(selection, tuple):
+                _, group_name = selection
+                expanded_tags.extend(groups.get(group_name, ()))
 
         return expanded_tags if expanded_tags else None
 
@@ -828,53 +1234,21 @@ class InteractiveMenu:
         """
         加载子类别分组配置
 
+        结果按 (文件修改时间, 领域) 缓存；Tags 智能分类重写文件后自动重新加载。
+
         Args:
             domain: 当前领域
 
         Returns:
             分组字典，如 {"BTC相关": ["bitcoin", "bitcoin-prices", ...]}
         """
-        config_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            'data',
-            'tag_categories.json'
-        )
-
-        if not os.path.exists(config_path):
-            return None
-
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # 优先使用 groups 配置
-            groups = data.get('groups', {}).get(domain, {})
-            if groups:
-                return groups
-
-            # 回退到首字母分组（兼容旧配置）
-            subcats = data.get('categories', {}).get(domain, [])
-            if not subcats:
-                return None
-
-            # 按首字母分组
-            grouped = {}
-            for tag in sorted(subcats):
-                first_char = tag[0].upper() if tag else '其他'
-                if first_char.isalpha():
-                    group_name = f"{first_char}开头"
-                else:
-                    group_name = '其他'
-
-                if group_name not in grouped:
-                    grouped[group_name] = []
-                grouped[group_name].append(tag)
-
-            return grouped if grouped else None
-
-        except Exception:
+            mtime_ns = os.stat(_TAG_CATEGORIES_PATH).st_mtime_ns
+        except OSError:
             return None
 
+        return _load_subcategory_groups_cached(mtime_ns, domain)
+
     def select_run_mode(self) -> str:
         """
         选择运行模式
@@ -885,22 +1259,7 @@ class InteractiveMenu:
         if not self.is_interactive:
             return "production"
 
-        choices = [
-            questionary.Choice(
-                "PRODUCTION - 自动保存，无人值守 (推荐)",
-                value="production"
-            ),
-            questionary.Choice(
-                "DEBUG - 逐个确认，适合调试",
-                value="debug"
-            ),
-        ]
-
-        result = questionary.select(
-            "选择运行模式:",
-            choices=choices,
-            style=MENU_STYLE
-        ).ask()
+        result = _select("选择运行模式:", _run_mode_choices())
 
         return result or "production"
 
@@ -914,22 +1273,7 @@ class InteractiveMenu:
         if not self.is_interactive:
             return False
 
-        choices = [
-            questionary.Choice(
-                "使用缓存数据 (推荐，速度更快)",
-                value=False
-            ),
-            questionary.Choice(
-                "强制刷新市场数据 (从API重新获取最新价格)",
-                value=True
-            ),
-        ]
-
-        result = questionary.select(
-            "选择数据来源:",
-            choices=choices,
-            style=MENU_STYLE
-        ).ask()
+        result = _select("选择数据来源:", _cache_choices())
 
         return result if result is not None else False
 
@@ -948,10 +1292,10 @@ class InteractiveMenu:
         if not self.is_interactive:
             return True
 
-        return questionary.confirm(
+        return _q().confirm(
             "确认开始扫描?",
             default=True,
-            style=MENU_STYLE
+            style=_menu_style()
         ).ask() or False
 
     def gather_backtest_config(self) -> Dict[str, Any]:
@@ -965,65 +1309,41 @@ class InteractiveMenu:
             return {}
 
         # 1. 选择时间范围
-        from datetime import datetime, timedelta
         now = datetime.now()
         
-        choices = [
-            questionary.Choice("最近 24 小时", value="24h"),
-            questionary.Choice("最近 3 天", value="3d"),
-            questionary.Choice("最近 7 天", value="7d"),
-            questionary.Choice("自定义范围", value="custom"),
-            questionary.Separator(),
-            questionary.Choice("返回", value="back"),
-        ]
+        choices = _backtest_range_choices()
         
-        time_range = questionary.select(
-            "请选择回测时间范围:",
-            choices=choices,
-            style=MENU_STYLE
-        ).ask()
+        time_range = _select("请选择回测时间范围:", choices)
         
         if not time_range or time_range == "back":
             return None
             
         start_time = ""
-        end_time = now.isoformat()
+        now_iso = now.isoformat()
+        end_time = now_iso
         
-        if time_range == "24h":
-            start_time = (now - timedelta(hours=24)).isoformat()
-        elif time_range == "3d":
-            start_time = (now - timedelta(days=3)).isoformat()
-        elif time_range == "7d":
-            start_time = (now - timedelta(days=7)).isoformat()
+        delta = _TIME_RANGE_DELTAS.get(time_range)
+        if delta is not None:
+            start_time = (now - delta).isoformat()
         elif time_range == "custom":
             # 简单实现：输入 ISO 格式
-            start_time = questionary.text(
+            start_time = _q().text(
                 "请输入开始时间 (ISO格式, 例如 2026-01-01T00:00:00):",
                 default=(now - timedelta(days=1)).isoformat()
             ).ask()
             
-            end_time = questionary.text(
+            end_time = _q().text(
                 "请输入结束时间 (ISO格式):",
-                default=now.isoformat()
+                default=now_iso
             ).ask()
 
         # 2. 选择策略 (复用 select_strategies，但传入 "all" 以显示所有策略)
         # 注意：这里我们假设回测通常跨越多个领域，或者让用户自己过滤
         # 为了简化，我们先让用户选择领域，或者直接显示所有
         
-        domain_choices = [
-            questionary.Choice("加密货币 (Crypto)", value="crypto"),
-            questionary.Choice("政治 (Politics)", value="politics"),
-            questionary.Choice("体育 (Sports)", value="sports"),
-            questionary.Choice("其他 (Other)", value="other"),
-            questionary.Choice("所有领域", value="all")
-        ]
+        domain_choices = _backtest_domain_choices()
         
-        domain = questionary.select(
-            "请选择主要回测领域 (用于筛选策略):",
-            choices=domain_choices,
-            style=MENU_STYLE
-        ).ask()
+        domain = _select("请选择主要回测领域 (用于筛选策略):", domain_choices)
         
         if not domain:
             return None
@@ -1038,10 +1358,13 @@ class InteractiveMenu:
             "strategies": strategies
         }
 
-    def gather_scan_config(self) -> Dict[str, Any]:
+    def gather_scan_config(self, hint: Optional[str] = None) -> Dict[str, Any]:
         """
         收集完整的扫描配置
 
+        Args:
+            hint: 可选的领域文本提示，传给 select_domain
+
         Returns:
             配置字典
         """
@@ -1054,7 +1377,7 @@ class InteractiveMenu:
             config['llm_model'] = llm_config.get('model')
 
         # 1. 选择领域
-        config['domain'] = self.select_domain()
+        config['domain'] = self.select_domain(hint)
 
         # 2. 选择策略
         config['strategies'] = self.select_strategies(config['domain'])
@@ -1074,13 +1397,13 @@ class InteractiveMenu:
         """询问是否继续"""
         if not self.is_interactive:
             return True
-        return questionary.confirm(prompt, default=True, style=MENU_STYLE).ask() or False
+        return _q().confirm(prompt, default=True, style=_menu_style()).ask() or False
 
     def ask_input(self, prompt: str, default: str = "") -> str:
         """获取文本输入"""
         if not self.is_interactive:
             return default
-        return questionary.text(prompt, default=default, style=MENU_STYLE).ask() or default
+        return _q().text(prompt, default=default, style=_menu_style()).ask() or default
 
     def show_help(self):
         """显示帮助信息"""
@@ -1120,7 +1443,7 @@ Polymarket 组合套利扫描系统 - 帮助
 """
         print(help_text)
         if self.is_interactive:
-            questionary.press_any_key_to_continue("按任意键返回...").ask()
+            _q().press_any_key_to_continue("按任意键返回...").ask()
 
     def tags_classify_menu(self) -> bool:
         """
@@ -1139,20 +1462,13 @@ Polymarket 组合套利扫描系统 - 帮助
             self.output.print_info("Tags分类需要交互模式，跳过...")
             return False
 
+        use_rich = self._use_rich
+        console = self._console
+
         # 1. 显示二级菜单选项
-        choices = [
-            questionary.Choice("刷新分类标签 (从API重新拉取)", value="refresh"),
-            questionary.Choice("细分Other分类 (将other重分类)", value="refine"),
-            questionary.Separator(),
-            questionary.Choice("返回主菜单", value="back"),
-        ]
+        choices = _tags_classify_choices()
 
-        action = questionary.select(
-            "Tags分类操作:",
-            choices=choices,
-            style=MENU_STYLE,
-            use_shortcuts=True
-        ).ask()
+        action = _select("Tags分类操作:", choices, shortcuts=True)
 
         if action == "back" or not action:
             return False
@@ -1160,22 +1476,8 @@ Polymarket 组合套利扫描系统 - 帮助
         # 2. 根据选择显示不同的说明Panel
         if action == "refresh":
             # 显示"刷新分类标签"说明
-            if self.output.use_rich:
-                from rich.panel import Panel
-                panel = Panel.fit(
-                    "[bold cyan]Tags智能分类 - 刷新标签[/bold cyan]\n\n"
-                    "从Polymarket API获取所有tags，\n"
-                    "使用LLM智能分类到9个类别。\n\n"
-                    "[dim]• 批量分类，快速高效\n"
-                    "• 生成预览报告，确认后应用\n"
-                    "• 自动备份原配置文件\n\n"
-                    "分类类别：\n"
-                    "crypto, politics, sports, finance, tech,\n"
-                    "entertainment, science, weather, misc[/dim]",
-                    border_style="cyan",
-                    padding=(1, 2)
-                )
-                self.output.console.print(panel)
+            if use_rich:
+                console.print(_refresh_panel())
             else:
                 print("\n" + "=" * 40)
                 print("Tags智能分类 - 刷新标签")
@@ -1183,10 +1485,10 @@ Polymarket 组合套利扫描系统 - 帮助
                 print("从API获取tags并使用LLM智能分类到9个类别")
 
             # 确认是否继续
-            confirm = questionary.confirm(
+            confirm = _q().confirm(
                 "开始从API获取tags并进行智能分类?",
                 default=True,
-                style=MENU_STYLE
+                style=_menu_style()
             ).ask()
 
             if not confirm:
@@ -1201,23 +1503,8 @@ Polymarket 组合套利扫描系统 - 帮助
 
         elif action == "refine":
             # 显示"细分Other分类"说明
-            if self.output.use_rich:
-                from rich.panel import Panel
-                panel = Panel.fit(
-                    "[bold cyan]Tags智能分类 - 细分Other[/bold cyan]\n\n"
-                    "将当前标记为'other'的tags（约2439个）\n"
-                    "重新分类到6个细分类别。\n\n"
-                    "[dim]• finance (传统金融)\n"
-                    "• tech (科技/AI)\n"
-                    "• entertainment (娱乐/文化)\n"
-                    "• science (科学/研究)\n"
-                    "• weather (天气/自然)\n"
-                    "• misc (杂项)\n\n"
-                    "预计需要约120次LLM调用[/dim]",
-                    border_style="cyan",
-                    padding=(1, 2)
-                )
-                self.output.console.print(panel)
+            if use_rich:
+                console.print(_refine_panel())
             else:
                 print("\n" + "=" * 40)
                 print("Tags智能分类 - 细分Other")
@@ -1225,10 +1512,10 @@ Polymarket 组合套利扫描系统 - 帮助
                 print("将other标签重新分类到细分类别")
 
             # 确认是否继续
-            confirm = questionary.confirm(
+            confirm = _q().confirm(
                 "开始对Other标签进行细分分类?",
                 default=True,
-                style=MENU_STYLE
+                style=_menu_style()
             ).ask()
 
             if not confirm:
@@ -1242,3 +1529,49 @@ Polymarket 组合套利扫描系统 - 帮助
             )
 
         return False
+
+
+class NonInteractiveMenu(InteractiveMenu):
+    """
+    非交互模式菜单（无TTY或questionary不可用时使用）
+
+    直接返回各菜单的默认值，不再在每次调用时判断 is_interactive。
+    """
+
+    def __init__(self, output: ScannerOutput = None):
+        super().__init__(output)
+        self.is_interactive = False
+
+    def main_menu(self) -> str:
+        return "scan"
+
+    def select_domain(self, hint: Optional[str] = None) -> str:
+        return classify_domain(hint) or "crypto"
+
+    def select_run_mode(self) -> str:
+        return "production"
+
+    def select_cache_option(self) -> bool:
+        return False
+
+    def select_category(self, scanner) -> Any:
+        categories = scanner.get_available_categories()
+        return categories[0] if categories else None
+
+    def select_strategies(self, domain: str) -> List[str]:
+        return [m.id if hasattr(m, 'id') else m['id'] for m in self._available_strategies(domain)]
+
+    def select_subcategories(self, domain: str) -> Optional[List[str]]:
+        return None
+
+    def confirm_config(self, config: Dict[str, Any]) -> bool:
+        # 无需确认，但仍输出配置表，便于在 CI / 重定向日志中查看本次扫描参数
+        self.output.print_config_table(config)
+        return True
+
+
+def make_menu(output: ScannerOutput = None) -> InteractiveMenu:
+    """根据运行环境创建菜单：终端交互用 InteractiveMenu，否则用 NonInteractiveMenu"""
+    if QUESTIONARY_AVAILABLE and _IS_TTY:
+        return InteractiveMenu(output)
+    return NonInteractiveMenu(output)
@@ -8,25 +8,26 @@
 - 扫描摘要
 """
 
+from bisect import bisect_right
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import List, Optional, Generator, Any
 from dataclasses import dataclass
+import importlib.util
 import sys
 
-try:
-    from rich.console import Console
-    from rich.progress import (
-        Progress, SpinnerColumn, TextColumn,
-        BarColumn, TaskProgressColumn, TimeElapsedColumn
-    )
-    from rich.panel import Panel
-    from rich.table import Table
-    from rich.text import Text
-    from rich.live import Live
-    from rich.style import Style
-    RICH_AVAILABLE = True
-except ImportError:
-    RICH_AVAILABLE = False
+# rich 只检测是否安装，子模块在各方法中按需导入（非 TTY / 简单模式不产生导入开销）
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
+
+# 可选：numba 加速大批量机会的摘要统计（同样延迟到首次使用时导入）
+NUMBA_AVAILABLE = (
+    importlib.util.find_spec("numba") is not None
+    and importlib.util.find_spec("numpy") is not None
+)
+
+# 终端检测在进程内不变，模块加载时计算一次
+_IS_TTY = sys.stdout.isatty() if hasattr(sys.stdout, 'isatty') else False
+_USE_RICH_DEFAULT = RICH_AVAILABLE and _IS_TTY
 
 
 # 颜色和样式定义
@@ -42,6 +43,95 @@ STYLES = {
     'profit_low': 'yellow',
 }
 
+# 利润率分档：阈值升序，_PROFIT_STYLES[i] 为 (利润样式, 边框样式)
+_PROFIT_BUCKETS = (2.0, 5.0)
+_PROFIT_STYLES = (
+    (STYLES['profit_low'], "dim"),
+    (STYLES['profit_medium'], "yellow"),
+    (STYLES['profit_high'], "green"),
+)
+
+
+@lru_cache(maxsize=None)
+def _progress_columns() -> tuple:
+    """Rich 进度条列（列对象不持有任务状态，可在多次扫描间复用）"""
+    from rich.progress import (
+        SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeElapsedColumn
+    )
+    return (
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        TimeElapsedColumn(),
+    )
+
+
+@lru_cache(maxsize=None)
+def _opportunity_panel_parts() -> tuple:
+    """(escape, Panel, Text)：首次构建机会 Panel 时导入，之后每次只取缓存的元组"""
+    from rich.markup import escape
+    from rich.panel import Panel
+    from rich.text import Text
+    return escape, Panel, Text
+
+
+# 机会数量超过该值才走 numba 内核（数量少时 numpy 转换开销大于收益）
+_NUMBA_MIN_ITEMS = 512
+
+
+@lru_cache(maxsize=None)
+def _numba_profit_sum_max():
+    """numba 版 (总和, 最大值) 统计函数，不可用时返回 None"""
+    if not NUMBA_AVAILABLE:
+        return None
+    try:
+        from .summary_kernels import profit_sum_max
+    except ImportError:
+        return None
+    return profit_sum_max
+
+
+def _profit_stats(opportunities: List[Any]) -> Optional[tuple]:
+    """一次遍历计算 (平均利润, 最大利润)，无机会时返回 None"""
+    if len(opportunities) > _NUMBA_MIN_ITEMS:
+        kernel = _numba_profit_sum_max()
+        if kernel is not None:
+            total, max_profit = kernel(opportunities)
+            return total / len(opportunities), max_profit
+
+    total = 0.0
+    max_profit = float('-inf')
+    n = 0
+    for o in opportunities:
+        p = o.profit_pct
+        total += p
+        if p > max_profit:
+            max_profit = p
+        n += 1
+    if not n:
+        return None
+    return total / n, max_profit
+
+
+# 按输出模式特化的公开方法（实现见 ScannerOutput._<name>_rich / _<name>_plain）
+_SPECIALIZED_METHODS = (
+    'welcome',
+    'print_step',
+    'print_market_fetch',
+    'print_strategy_start',
+    'print_strategy_result',
+    'print_error',
+    'print_warning',
+    'print_info',
+    'print_report_saved',
+    'print_opportunity',
+    'print_opportunities',
+    'print_summary',
+    'print_config_table',
+    'scan_progress',
+)
+
 
 class ScannerOutput:
     """
@@ -67,77 +157,157 @@ class ScannerOutput:
         Args:
             force_simple: 强制使用简单输出（不使用Rich）
         """
-        self.use_rich = RICH_AVAILABLE and not force_simple and sys.stdout.isatty()
+        self.use_rich = _USE_RICH_DEFAULT and not force_simple
         if self.use_rich:
+            from rich.console import Console
             self.console = Console()
         else:
             self.console = None
 
-    def _print(self, message: str, style: str = None):
+        # 底层输出函数只选择一次，热路径不再判断 use_rich
+        self._emit = self.console.print if self.use_rich else print
+
+        # 按输出模式绑定各输出方法的 Rich / 纯文本版本，方法体内不再判断 use_rich
+        suffix = "_rich" if self.use_rich else "_plain"
+        for name in _SPECIALIZED_METHODS:
+            setattr(self, name, getattr(self, f"_{name}{suffix}"))
+        self._print = getattr(self, f"_print{suffix}")
+
+        # 行缓冲：一行内的多个片段先拼接，整行只交给 Rich 解析/输出一次
+        self._line_buffer: List[str] = []
+
+    def write(self, fragment: str):
+        """追加输出片段到当前行缓冲（不立即输出）"""
+        self._line_buffer.append(fragment)
+
+    def writeln(self, fragment: str = ""):
+        """追加片段并输出整行（Rich 模式下一行只调用一次 console.print）"""
+        buffer = self._line_buffer
+        buffer.append(fragment)
+        line = "".join(buffer)
+        buffer.clear()
+        self._emit(line)
+
+    # ---- 以下方法各有 Rich / 纯文本两个版本，__init__ 中按 use_rich 绑定到去掉后缀的名字 ----
+
+    def _print_rich(self, message: str, style: str = None):
         """内部打印方法"""
-        if self.use_rich and self.console:
-            if style:
-                self.console.print(message, style=style)
-            else:
-                self.console.print(message)
+        if style:
+            self._emit(message, style=style)
         else:
-            print(message)
+            self._emit(message)
+
+    def _print_plain(self, message: str, style: str = None):
+        """内部打印方法"""
+        self._emit(message)
 
-    def welcome(self, version: str = "2.2"):
+    def _welcome_rich(self, version: str = "2.2"):
         """显示欢迎界面"""
-        if self.use_rich:
-            panel = Panel.fit(
-                f"[bold cyan]Polymarket 组合套利扫描系统[/bold cyan]\n"
-                f"[dim]v{version} - 交互式版本[/dim]",
-                border_style="cyan",
-                padding=(1, 4)
-            )
-            self.console.print(panel)
-            self.console.print()
-        else:
-            print("=" * 50)
-            print(f"  Polymarket 组合套利扫描系统 v{version}")
-            print("=" * 50)
-            print()
+        from rich.panel import Panel
+        panel = Panel.fit(
+            f"[bold cyan]Polymarket 组合套利扫描系统[/bold cyan]\n"
+            f"[dim]v{version} - 交互式版本[/dim]",
+            border_style="cyan",
+            padding=(1, 4)
+        )
+        self.console.print(panel)
+        self.console.print()
+
+    def _welcome_plain(self, version: str = "2.2"):
+        """显示欢迎界面"""
+        print(
+            f"{'=' * 50}\n"
+            f"  Polymarket 组合套利扫描系统 v{version}\n"
+            f"{'=' * 50}\n"
+        )
 
-    def print_step(self, step: int, total: int, description: str):
+    def _print_step_rich(self, step: int, total: int, description: str):
         """打印步骤标题"""
-        if self.use_rich:
-            self.console.print(f"\n[bold cyan][{step}/{total}][/] {description}")
-        else:
-            print(f"\n[{step}/{total}] {description}")
+        self.writeln(f"\n[bold cyan][{step}/{total}][/] {description}")
+
+    def _print_step_plain(self, step: int, total: int, description: str):
+        """打印步骤标题"""
+        self.writeln(f"\n[{step}/{total}] {description}")
 
-    def print_market_fetch(self, count: int, domain: str, subcats: List[str] = None):
+    def _print_market_fetch_rich(self, count: int, domain: str, subcats: List[str] = None):
         """打印市场获取结果"""
         subcat_info = f" ({', '.join(subcats)})" if subcats else ""
-        if self.use_rich:
-            self.console.print(
-                f"  [green]OK[/] 获取到 [bold]{count}[/] 个 {domain}{subcat_info} 市场"
-            )
-        else:
-            print(f"  OK: 获取到 {count} 个 {domain}{subcat_info} 市场")
+        self.write(f"  [green]OK[/] 获取到 [bold]{count}[/] 个 ")
+        self.writeln(f"{domain}{subcat_info} 市场")
+
+    def _print_market_fetch_plain(self, count: int, domain: str, subcats: List[str] = None):
+        """打印市场获取结果"""
+        subcat_info = f" ({', '.join(subcats)})" if subcats else ""
+        self.write(f"  OK: 获取到 {count} 个 ")
+        self.writeln(f"{domain}{subcat_info} 市场")
 
-    def print_strategy_start(self, strategy_name: str):
+    def _print_strategy_start_rich(self, strategy_name: str):
         """打印策略开始执行"""
-        if self.use_rich:
-            self.console.print(f"  [cyan]▶[/] 执行 [bold]{strategy_name}[/]...")
+        self.writeln(f"  [cyan]▶[/] 执行 [bold]{strategy_name}[/]...")
+
+    def _print_strategy_start_plain(self, strategy_name: str):
+        """打印策略开始执行"""
+        self.writeln(f"  > 执行 {strategy_name}...")
+
+    def _print_strategy_result_rich(self, strategy_name: str, count: int):
+        """打印策略执行结果"""
+        if count > 0:
+            self.writeln(f"    [green]✓[/] 发现 [bold green]{count}[/] 个机会")
         else:
-            print(f"  > 执行 {strategy_name}...")
+            self.writeln("    [dim]○ 未发现机会[/]")
 
-    def print_strategy_result(self, strategy_name: str, count: int):
+    def _print_strategy_result_plain(self, strategy_name: str, count: int):
         """打印策略执行结果"""
         if count > 0:
-            if self.use_rich:
-                self.console.print(f"    [green]✓[/] 发现 [bold green]{count}[/] 个机会")
-            else:
-                print(f"    ✓ 发现 {count} 个机会")
+            self.writeln(f"    ✓ 发现 {count} 个机会")
         else:
-            if self.use_rich:
-                self.console.print(f"    [dim]○ 未发现机会[/]")
-            else:
-                print(f"    ○ 未发现机会")
+            self.writeln("    ○ 未发现机会")
 
-    def print_opportunity(self, opp: Any, index: int = None):
+    def _opportunity_panel(self, opp: Any, index: int = None) -> 'Panel':
+        """构建单个套利机会的 Rich Panel"""
+        escape, Panel, Text = _opportunity_panel_parts()
+
+        idx_str = f"#{index} " if index else ""
+
+        # 根据利润率选择样式
+        profit_style, border_style = _PROFIT_STYLES[bisect_right(_PROFIT_BUCKETS, opp.profit_pct)]
+
+        # 构建内容（单个 markup 字符串一次解析为 Text；外部文本需转义）
+        reasoning_markup = ""
+        if hasattr(opp, 'reasoning') and opp.reasoning:
+            # 截取推理的前100个字符
+            reasoning_short = opp.reasoning[:100] + "..." if len(opp.reasoning) > 100 else opp.reasoning
+            reasoning_markup = f"[dim italic]{escape(reasoning_short)}[/]"
+
+        content = Text.from_markup(
+            f"[bold]{escape(str(opp.type))}[/]\n\n"
+            f"[dim]利润: [/][{profit_style}]{opp.profit_pct:.2f}%[/]\n"
+            f"[dim]成本: [/][white]${opp.total_cost:.4f}[/]\n"
+            f"[dim]回报: [/][white]${opp.guaranteed_return:.4f}[/]\n\n"
+            f"{reasoning_markup}"
+        )
+
+        return Panel(
+            content,
+            title=f"{idx_str}套利机会",
+            border_style=border_style,
+            padding=(0, 1)
+        )
+
+    @staticmethod
+    def _opportunity_text(opp: Any, index: int = None) -> str:
+        """构建单个套利机会的纯文本块"""
+        idx_str = f"#{index} " if index else ""
+        return (
+            f"\n{'─' * 50}\n"
+            f"{idx_str}套利机会: {opp.type}\n"
+            f"利润: {opp.profit_pct:.2f}%\n"
+            f"成本: ${opp.total_cost:.4f}\n"
+            f"回报: ${opp.guaranteed_return:.4f}\n"
+            f"{'─' * 50}"
+        )
+
+    def _print_opportunity_rich(self, opp: Any, index: int = None):
         """
         打印单个套利机会
 
@@ -145,51 +315,53 @@ class ScannerOutput:
             opp: ArbitrageOpportunity 对象
             index: 序号
         """
-        idx_str = f"#{index} " if index else ""
+        self.console.print(self._opportunity_panel(opp, index))
 
-        # 根据利润率选择样式
-        if opp.profit_pct >= 5:
-            profit_style = STYLES['profit_high']
-            border_style = "green"
-        elif opp.profit_pct >= 2:
-            profit_style = STYLES['profit_medium']
-            border_style = "yellow"
-        else:
-            profit_style = STYLES['profit_low']
-            border_style = "dim"
+    def _print_opportunity_plain(self, opp: Any, index: int = None):
+        """
+        打印单个套利机会
 
-        if self.use_rich:
-            # 构建内容
-            content = Text()
-            content.append(f"{opp.type}\n\n", style="bold")
-            content.append("利润: ", style="dim")
-            content.append(f"{opp.profit_pct:.2f}%\n", style=profit_style)
-            content.append("成本: ", style="dim")
-            content.append(f"${opp.total_cost:.4f}\n", style="white")
-            content.append("回报: ", style="dim")
-            content.append(f"${opp.guaranteed_return:.4f}\n\n", style="white")
-
-            if hasattr(opp, 'reasoning') and opp.reasoning:
-                # 截取推理的前100个字符
-                reasoning_short = opp.reasoning[:100] + "..." if len(opp.reasoning) > 100 else opp.reasoning
-                content.append(reasoning_short, style="dim italic")
-
-            panel = Panel(
-                content,
-                title=f"{idx_str}套利机会",
-                border_style=border_style,
-                padding=(0, 1)
-            )
-            self.console.print(panel)
-        else:
-            print(f"\n{'─' * 50}")
-            print(f"{idx_str}套利机会: {opp.type}")
-            print(f"利润: {opp.profit_pct:.2f}%")
-            print(f"成本: ${opp.total_cost:.4f}")
-            print(f"回报: ${opp.guaranteed_return:.4f}")
-            print(f"{'─' * 50}")
-
-    def print_summary(self, opportunities: List[Any], elapsed_time: float):
+        Args:
+            opp: ArbitrageOpportunity 对象
+            index: 序号
+        """
+        print(self._opportunity_text(opp, index))
+
+    @staticmethod
+    def _opportunity_indices(count: int, start_index: Optional[int]):
+        """批量打印时各机会的序号，start_index 为 None 时不编号"""
+        if start_index is None:
+            return [None] * count
+        return range(start_index, start_index + count)
+
+    def _print_opportunities_rich(self, opps: List[Any], start_index: int = None):
+        """
+        批量打印套利机会（整批只输出一次，避免逐个 Panel 刷新终端）
+
+        Args:
+            opps: ArbitrageOpportunity 列表
+            start_index: 起始序号，None 表示不编号
+        """
+        if not opps:
+            return
+        from rich.console import Group
+        indices = self._opportunity_indices(len(opps), start_index)
+        self.console.print(Group(*map(self._opportunity_panel, opps, indices)))
+
+    def _print_opportunities_plain(self, opps: List[Any], start_index: int = None):
+        """
+        批量打印套利机会（整批只输出一次）
+
+        Args:
+            opps: ArbitrageOpportunity 列表
+            start_index: 起始序号，None 表示不编号
+        """
+        if not opps:
+            return
+        indices = self._opportunity_indices(len(opps), start_index)
+        print("\n".join(map(self._opportunity_text, opps, indices)))
+
+    def _print_summary_rich(self, opportunities: List[Any], elapsed_time: float):
         """
         打印扫描摘要
 
@@ -197,94 +369,111 @@ class ScannerOutput:
             opportunities: 套利机会列表
             elapsed_time: 耗时（秒）
         """
-        if self.use_rich:
-            table = Table(title="扫描结果摘要", show_header=True)
-            table.add_column("指标", style="cyan", width=15)
-            table.add_column("值", style="green", width=25)
-
-            table.add_row("发现机会", str(len(opportunities)))
-            table.add_row("扫描耗时", f"{elapsed_time:.1f}秒")
-
-            if opportunities:
-                profits = [o.profit_pct for o in opportunities]
-                avg_profit = sum(profits) / len(profits)
-                max_profit = max(profits)
-                table.add_row("平均利润", f"{avg_profit:.2f}%")
-                table.add_row("最大利润", f"{max_profit:.2f}%")
-
-            self.console.print()
-            self.console.print(table)
-        else:
-            print("\n" + "=" * 40)
-            print("扫描结果摘要")
-            print("=" * 40)
-            print(f"发现机会: {len(opportunities)}")
-            print(f"扫描耗时: {elapsed_time:.1f}秒")
-            if opportunities:
-                profits = [o.profit_pct for o in opportunities]
-                print(f"平均利润: {sum(profits)/len(profits):.2f}%")
-                print(f"最大利润: {max(profits):.2f}%")
-            print("=" * 40)
-
-    def print_error(self, message: str, exception: Exception = None):
+        from rich.table import Table
+        table = Table(title="扫描结果摘要", show_header=True)
+        table.add_column("指标", style="cyan", width=15)
+        table.add_column("值", style="green", width=25)
+
+        table.add_row("发现机会", str(len(opportunities)))
+        table.add_row("扫描耗时", f"{elapsed_time:.1f}秒")
+
+        stats = _profit_stats(opportunities)
+        if stats:
+            avg_profit, max_profit = stats
+            table.add_row("平均利润", f"{avg_profit:.2f}%")
+            table.add_row("最大利润", f"{max_profit:.2f}%")
+
+        self.console.print()
+        self.console.print(table)
+
+    def _print_summary_plain(self, opportunities: List[Any], elapsed_time: float):
+        """
+        打印扫描摘要
+
+        Args:
+            opportunities: 套利机会列表
+            elapsed_time: 耗时（秒）
+        """
+        lines = [
+            "\n" + "=" * 40,
+            "扫描结果摘要",
+            "=" * 40,
+            f"发现机会: {len(opportunities)}",
+            f"扫描耗时: {elapsed_time:.1f}秒",
+        ]
+        stats = _profit_stats(opportunities)
+        if stats:
+            avg_profit, max_profit = stats
+            lines.append(f"平均利润: {avg_profit:.2f}%")
+            lines.append(f"最大利润: {max_profit:.2f}%")
+        lines.append("=" * 40)
+        print("\n".join(lines))
+
+    def _print_error_rich(self, message: str, exception: Exception = None):
         """打印错误信息"""
-        if self.use_rich:
-            self.console.print(f"[bold red]错误:[/] {message}")
-            if exception:
-                self.console.print(f"[dim]{type(exception).__name__}: {exception}[/]")
-        else:
-            print(f"错误: {message}")
-            if exception:
-                print(f"  {type(exception).__name__}: {exception}")
+        self.console.print(f"[bold red]错误:[/] {message}")
+        if exception:
+            self.console.print(f"[dim]{type(exception).__name__}: {exception}[/]")
+
+    def _print_error_plain(self, message: str, exception: Exception = None):
+        """打印错误信息"""
+        print(f"错误: {message}")
+        if exception:
+            print(f"  {type(exception).__name__}: {exception}")
 
-    def print_warning(self, message: str):
+    def _print_warning_rich(self, message: str):
         """打印警告信息"""
-        if self.use_rich:
-            self.console.print(f"[yellow]警告:[/] {message}")
-        else:
-            print(f"警告: {message}")
+        self.console.print(f"[yellow]警告:[/] {message}")
+
+    def _print_warning_plain(self, message: str):
+        """打印警告信息"""
+        print(f"警告: {message}")
 
-    def print_info(self, message: str):
+    def _print_info_rich(self, message: str):
         """打印信息"""
-        if self.use_rich:
-            self.console.print(f"[cyan]ℹ[/] {message}")
-        else:
-            print(f"[INFO] {message}")
+        self.console.print(f"[cyan]ℹ[/] {message}")
+
+    def _print_info_plain(self, message: str):
+        """打印信息"""
+        print(f"[INFO] {message}")
 
-    def print_config_table(self, config: dict):
+    def _print_config_table_rich(self, config: dict):
         """打印配置确认表格"""
-        if self.use_rich:
-            table = Table(title="扫描配置确认", show_header=True)
-            table.add_column("参数", style="cyan", width=12)
-            table.add_column("值", style="green")
-
-            table.add_row("领域", config.get("domain", "-"))
-            strategies = config.get("strategies", [])
-            table.add_row("策略", ", ".join(strategies) if strategies else "全部")
-            subcats = config.get("subcategories", [])
-            table.add_row("子类别", ", ".join(subcats) if subcats else "全部")
-            table.add_row("运行模式", config.get("mode", "production"))
-            table.add_row("缓存", "刷新" if config.get("force_refresh") else "使用缓存")
-
-            self.console.print()
-            self.console.print(table)
-        else:
-            print("\n配置确认:")
-            print(f"  领域: {config.get('domain', '-')}")
-            print(f"  策略: {', '.join(config.get('strategies', ['全部']))}")
-            print(f"  子类别: {', '.join(config.get('subcategories', ['全部']))}")
-            print(f"  运行模式: {config.get('mode', 'production')}")
-            print(f"  缓存: {'刷新' if config.get('force_refresh') else '使用缓存'}")
-
-    def print_report_saved(self, filepath: str):
+        from rich.table import Table
+        table = Table(title="扫描配置确认", show_header=True)
+        table.add_column("参数", style="cyan", width=12)
+        table.add_column("值", style="green")
+
+        table.add_row("领域", config.get("domain", "-"))
+        strategies = config.get("strategies", [])
+        table.add_row("策略", ", ".join(strategies) if strategies else "全部")
+        subcats = config.get("subcategories", [])
+        table.add_row("子类别", ", ".join(subcats) if subcats else "全部")
+        table.add_row("运行模式", config.get("mode", "production"))
+        table.add_row("缓存", "刷新" if config.get("force_refresh") else "使用缓存")
+
+        self.console.print()
+        self.console.print(table)
+
+    def _print_config_table_plain(self, config: dict):
+        """打印配置确认表格"""
+        print("\n配置确认:")
+        print(f"  领域: {config.get('domain', '-')}")
+        print(f"  策略: {', '.join(config.get('strategies', ['全部']))}")
+        print(f"  子类别: {', '.join(config.get('subcategories', ['全部']))}")
+        print(f"  运行模式: {config.get('mode', 'production')}")
+        print(f"  缓存: {'刷新' if config.get('force_refresh') else '使用缓存'}")
+
+    def _print_report_saved_rich(self, filepath: str):
         """打印报告保存信息"""
-        if self.use_rich:
-            self.console.print(f"[green]✓[/] 报告已保存: [dim]{filepath}[/]")
-        else:
-            print(f"✓ 报告已保存: {filepath}")
+        self.console.print(f"[green]✓[/] 报告已保存: [dim]{filepath}[/]")
+
+    def _print_report_saved_plain(self, filepath: str):
+        """打印报告保存信息"""
+        print(f"✓ 报告已保存: {filepath}")
 
     @contextmanager
-    def scan_progress(self, total_steps: int = 5) -> Generator['ScanProgressContext', None, None]:
+    def _scan_progress_rich(self, total_steps: int = 5) -> Generator['ScanProgressContext', None, None]:
         """
         扫描进度上下文管理器
 
@@ -294,20 +483,23 @@ class ScannerOutput:
                 # ...
                 progress.advance("分析逻辑关系...")
         """
-        if self.use_rich:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn(),
-                TimeElapsedColumn(),
-                console=self.console,
-                transient=False
-            ) as progress:
-                task = progress.add_task("初始化...", total=total_steps)
-                yield ScanProgressContext(progress, task, self.console)
-        else:
-            yield SimpleProgressContext(total_steps)
+        from rich.progress import Progress
+        with Progress(
+            *_progress_columns(),
+            console=self.console,
+            transient=False
+        ) as progress:
+            task = progress.add_task("初始化...", total=total_steps)
+            yield ScanProgressContext(progress, task, self.console)
+
+    @contextmanager
+    def _scan_progress_plain(self, total_steps: int = 5) -> Generator['SimpleProgressContext', None, None]:
+        """扫描进度上下文管理器（纯文本，退出时输出剩余缓冲）"""
+        progress = SimpleProgressContext(total_steps)
+        try:
+            yield progress
+        finally:
+            progress.flush()
 
 
 class ScanProgressContext:
@@ -337,21 +529,43 @@ class ScanProgressContext:
 
 
 class SimpleProgressContext:
-    """简单进度上下文（无Rich时使用）"""
+    """
+    简单进度上下文（无Rich时使用）
+
+    输出先写入行缓冲，在每次 advance、缓冲满 _FLUSH_LINES 行或上下文退出时
+    合并为一次 stdout 写入（Windows 控制台逐行 print 代价很高）
+    """
+
+    _FLUSH_LINES = 8
 
     def __init__(self, total_steps: int):
         self.total_steps = total_steps
         self.current_step = 0
+        self._lines: List[str] = []
+
+    def _write(self, line: str):
+        lines = self._lines
+        lines.append(line)
+        if len(lines) >= self._FLUSH_LINES:
+            self.flush()
+
+    def flush(self):
+        """输出缓冲中的所有行"""
+        if self._lines:
+            sys.stdout.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+            sys.stdout.flush()
 
     def advance(self, description: str):
         """推进到下一步"""
         self.current_step += 1
-        print(f"[{self.current_step}/{self.total_steps}] {description}")
+        self._lines.append(f"[{self.current_step}/{self.total_steps}] {description}")
+        self.flush()
 
     def update(self, description: str):
         """更新描述"""
-        print(f"  > {description}")
+        self._write(f"  > {description}")
 
     def print(self, message: str, style: str = None):
         """打印消息"""
-        print(message)
+        self._write(message)
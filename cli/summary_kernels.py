@@ -0,0 +1,31 @@
+"""
+扫描摘要统计内核（Numba JIT）
+
+仅在机会数量较多时由 output._profit_stats 按需导入；
+numpy / numba 任一缺失时导入失败，调用方回退到纯 Python 实现。
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def _profit_sum_max(profits):
+    """一次遍历计算 (总和, 最大值)，profits 为非空 float64 数组"""
+    total = 0.0
+    max_profit = profits[0]
+    for i in range(profits.size):
+        p = profits[i]
+        total += p
+        if p > max_profit:
+            max_profit = p
+    return total, max_profit
+
+
+def profit_sum_max(opportunities) -> tuple:
+    """利润率的 (总和, 最大值)，opportunities 需非空"""
+    profits = np.fromiter(
+        (o.profit_pct for o in opportunities), dtype=np.float64, count=len(opportunities)
+    )
+    total, max_profit = _profit_sum_max(profits)
+    return float(total), float(max_profit)
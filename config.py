@@ -7,12 +7,21 @@
 """
 
 import os
+import copy
 import json
-from dataclasses import dataclass, field, asdict
+import functools
+from dataclasses import dataclass, field, fields
 from typing import Optional, Dict, Any, List
 
+# 可选：orjson（C 实现，配置文件读写更快）
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+
+@dataclass(slots=True)
 class LLMSettings:
     """LLM配置"""
     # 提供商: openai / anthropic / aliyun / zhipu / deepseek / ollama / openai_compatible
@@ -33,7 +42,7 @@ class LLMSettings:
     timeout: int = 60
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanSettings:
     """扫描配置"""
     # 获取市场数量
@@ -54,6 +63,12 @@ class ScanSettings:
     # 每次扫描最大LLM调用次数
     max_llm_calls: int = 300
 
+    # 市场对 LLM 分析的并发请求数（1 表示串行）
+    llm_max_concurrency: int = 4
+
+    # 共享同一市场B的市场对合并为一次 LLM 请求的最大个数（1 表示逐对分析）
+    llm_group_size: int = 1
+
     # 🆕 向量化相关配置
     # 是否启用语义聚类（向量化模式）
     use_semantic_clustering: bool = True
@@ -61,6 +76,10 @@ class ScanSettings:
     # 聚类相似度阈值 (0.0-1.0)
     semantic_threshold: float = 0.85
 
+    # LLM 分析结果语义缓存：改写过的同一市场对复用已有分析（默认关闭）
+    enable_semantic_llm_cache: bool = False
+    semantic_cache_threshold: float = 0.95
+
     # Embedding模型名称
     embedding_model: str = "BAAI/bge-large-zh-v1.5"
 
@@ -117,7 +136,7 @@ class ScanSettings:
     target_size_usd: float = 500.0     # 模拟交易规模 (用于验证滑点)
 
 
-@dataclass
+@dataclass(slots=True)
 class OutputSettings:
     """输出配置"""
     # 输出目录
@@ -133,7 +152,7 @@ class OutputSettings:
     detailed_log: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class NotificationSettings:
     """通知配置"""
     enable_telegram: bool = False
@@ -147,7 +166,75 @@ class NotificationSettings:
     min_apy_to_notify: float = 30.0    # 仅推送高收益机会
 
 
-@dataclass
+def _env_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+def _env_list(value: str) -> List[str]:
+    """逗号分隔列表，忽略空项（如末尾多余的逗号）"""
+    return [item for item in value.split(",") if item] if value else []
+
+
+# 环境变量映射表: (字段名, 环境变量名, 类型转换, 默认值)
+# 环境变量未设置时使用默认值，设置时用转换函数解析
+_LLM_ENV_SCHEMA = (
+    ("provider", "LLM_PROVIDER", str, "openai"),
+    ("model", "LLM_MODEL", str, ""),
+    ("api_key", "LLM_API_KEY", str, ""),
+    ("api_base", "LLM_API_BASE", str, ""),
+    ("max_tokens", "LLM_MAX_TOKENS", int, 2000),
+    ("temperature", "LLM_TEMPERATURE", float, 0.7),
+)
+
+_SCAN_ENV_SCHEMA = (
+    ("market_limit", "MARKET_LIMIT", int, 200),
+    ("min_profit_pct", "MIN_PROFIT_PCT", float, 2.0),
+    ("min_liquidity", "MIN_LIQUIDITY", float, 10000.0),
+    ("min_confidence", "MIN_CONFIDENCE", float, 0.8),
+    ("llm_max_concurrency", "LLM_MAX_CONCURRENCY", int, 4),
+    ("llm_group_size", "LLM_GROUP_SIZE", int, 1),
+    ("use_semantic_clustering", "USE_SEMANTIC_CLUSTERING", _env_bool, True),
+    ("semantic_threshold", "SEMANTIC_THRESHOLD", float, 0.85),
+    ("enable_cache", "ENABLE_CACHE", _env_bool, True),
+    ("cache_ttl", "CACHE_TTL", int, 3600),
+    ("scan_domain", "SCAN_DOMAIN", str, "crypto"),
+    ("scan_subcategories", "SCAN_SUBCATEGORIES", _env_list, None),
+)
+
+_OUTPUT_ENV_SCHEMA = (
+    ("output_dir", "OUTPUT_DIR", str, "./output"),
+    ("log_level", "LOG_LEVEL", str, "INFO"),
+    ("detailed_log", "DETAILED_LOG", _env_bool, True),
+)
+
+_NOTIFY_ENV_SCHEMA = (
+    ("enable_telegram", "ENABLE_TELEGRAM", _env_bool, False),
+    ("telegram_bot_token", "TELEGRAM_BOT_TOKEN", str, ""),
+    ("telegram_chat_id", "TELEGRAM_CHAT_ID", str, ""),
+    ("enable_wechat", "ENABLE_WECHAT", _env_bool, False),
+    ("wechat_webhook_url", "WECHAT_WEBHOOK_URL", str, ""),
+    ("min_apy_to_notify", "MIN_APY_TO_NOTIFY", float, 30.0),
+)
+
+
+def _plain_dict(obj) -> Dict[str, Any]:
+    """浅层转 dict（字段均为 JSON 基本类型，无需 asdict 的递归深拷贝）"""
+    return {f.name: getattr(obj, f.name) for f in fields(obj)}
+
+
+def _env_values(schema) -> Dict[str, Any]:
+    """按映射表读取环境变量（默认值为 None 的字段交给 dataclass 默认值处理）"""
+    environ = os.environ
+    values = {}
+    for name, env, cast, default in schema:
+        if env in environ:
+            values[name] = cast(environ[env])
+        elif default is not None:
+            values[name] = default
+    return values
+
+
+@dataclass(slots=True)
 class Config:
     """主配置类"""
     llm: LLMSettings = field(default_factory=LLMSettings)
@@ -163,46 +250,21 @@ class Config:
     def from_env(cls) -> "Config":
         """从环境变量加载配置"""
         return cls(
-            llm=LLMSettings(
-                provider=os.getenv("LLM_PROVIDER", "openai"),
-                model=os.getenv("LLM_MODEL", ""),
-                api_key=os.getenv("LLM_API_KEY", ""),
-                api_base=os.getenv("LLM_API_BASE", ""),
-                max_tokens=int(os.getenv("LLM_MAX_TOKENS", "2000")),
-                temperature=float(os.getenv("LLM_TEMPERATURE", "0.7")),
-            ),
-            scan=ScanSettings(
-                market_limit=int(os.getenv("MARKET_LIMIT", "200")),
-                min_profit_pct=float(os.getenv("MIN_PROFIT_PCT", "2.0")),
-                min_liquidity=float(os.getenv("MIN_LIQUIDITY", "10000")),
-                min_confidence=float(os.getenv("MIN_CONFIDENCE", "0.8")),
-                use_semantic_clustering=os.getenv("USE_SEMANTIC_CLUSTERING", "true").lower() == "true",
-                semantic_threshold=float(os.getenv("SEMANTIC_THRESHOLD", "0.85")),
-                enable_cache=os.getenv("ENABLE_CACHE", "true").lower() == "true",
-                cache_ttl=int(os.getenv("CACHE_TTL", "3600")),
-                scan_domain=os.getenv("SCAN_DOMAIN", "crypto"),
-                scan_subcategories=os.getenv("SCAN_SUBCATEGORIES", "").split(",") if os.getenv("SCAN_SUBCATEGORIES") else [],
-            ),
-            output=OutputSettings(
-                output_dir=os.getenv("OUTPUT_DIR", "./output"),
-                log_level=os.getenv("LOG_LEVEL", "INFO"),
-                detailed_log=os.getenv("DETAILED_LOG", "true").lower() == "true",
-            ),
-            notify=NotificationSettings(
-                enable_telegram=os.getenv("ENABLE_TELEGRAM", "false").lower() == "true",
-                telegram_bot_token=os.getenv("TELEGRAM_BOT_TOKEN", ""),
-                telegram_chat_id=os.getenv("TELEGRAM_CHAT_ID", ""),
-                enable_wechat=os.getenv("ENABLE_WECHAT", "false").lower() == "true",
-                wechat_webhook_url=os.getenv("WECHAT_WEBHOOK_URL", ""),
-                min_apy_to_notify=float(os.getenv("MIN_APY_TO_NOTIFY", "30.0")),
-            )
+            llm=LLMSettings(**_env_values(_LLM_ENV_SCHEMA)),
+            scan=ScanSettings(**_env_values(_SCAN_ENV_SCHEMA)),
+            output=OutputSettings(**_env_values(_OUTPUT_ENV_SCHEMA)),
+            notify=NotificationSettings(**_env_values(_NOTIFY_ENV_SCHEMA)),
         )
     
     @classmethod
     def from_file(cls, path: str) -> "Config":
         """从JSON文件加载配置"""
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if ORJSON_AVAILABLE:
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
 
         def _filter_comments(d: dict) -> dict:
             """过滤掉以 _ 开头的注释字段"""
@@ -234,13 +296,17 @@ class Config:
     def to_file(self, path: str):
         """保存配置到文件"""
         data = {
-            "llm": asdict(self.llm),
-            "scan": asdict(self.scan),
-            "output": asdict(self.output),
-            "notify": asdict(self.notify),
+            "llm": _plain_dict(self.llm),
+            "scan": _plain_dict(self.scan),
+            "output": _plain_dict(self.output),
+            "notify": _plain_dict(self.notify),
         }
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
 
     def get_llm_profile(self, profile_name: Optional[str] = None) -> LLMSettings:
         """
@@ -285,16 +351,37 @@ class Config:
         3. 环境变量
         4. 默认值
         """
-        # 尝试从文件加载
-        if config_path and os.path.exists(config_path):
-            return cls.from_file(config_path)
-        
-        if os.path.exists("config.json"):
-            return cls.from_file("config.json")
+        # 尝试从文件加载（按文件修改时间缓存解析结果，每次返回独立副本）
+        for path in (config_path, "config.json"):
+            if not path or not _path_exists(path):
+                continue
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            return copy.deepcopy(_load_file_cached(os.path.abspath(path), mtime_ns))
         
         # 从环境变量加载
         return cls.from_env()
 
+    @staticmethod
+    def clear_cache():
+        """清空 load() 的文件存在性和解析缓存"""
+        _path_exists.cache_clear()
+        _load_file_cached.cache_clear()
+
+
+@functools.lru_cache(maxsize=4)
+def _path_exists(path: str) -> bool:
+    """配置文件是否存在（进程内缓存；新建配置文件后需调用 Config.clear_cache）"""
+    return os.path.exists(path)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_file_cached(path: str, mtime_ns: int) -> Config:
+    """解析配置文件（按绝对路径和修改时间缓存；调用方需自行复制后再修改）"""
+    return Config.from_file(path)
+
 
 # 默认配置模板
 DEFAULT_CONFIG_TEMPLATE = """{
@@ -343,6 +430,7 @@ def create_default_config(path: str = "config.json"):
     """创建默认配置文件"""
     with open(path, "w", encoding="utf-8") as f:
         f.write(DEFAULT_CONFIG_TEMPLATE)
+    _path_exists.cache_clear()
     print(f"✅ 已创建配置文件: {path}")
 
 
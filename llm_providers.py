@@ -28,6 +28,8 @@ LLM提供商抽象层
 
 import os
 import json
+import time
+import functools
 import httpx
 import logging
 import traceback
@@ -67,6 +69,7 @@ class LLMConfig:
     max_tokens: int = 2000
     temperature: float = 0.7
     timeout: int = 60
+    max_retries: int = 3  # 连接失败及 429/5xx 响应的最大重试次数
     
     # 额外参数（不同提供商可能需要）
     extra_params: Optional[Dict[str, Any]] = None
@@ -126,12 +129,57 @@ ENV_API_KEYS = {
 # 抽象基类
 # ============================================================
 
+# 可重试的 HTTP 状态码（限流 / 服务端临时错误）
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# 连接池：并发分析时复用 keep-alive 连接，避免每次请求重新握手 TLS
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=75)
+
+
 class BaseLLMClient(ABC):
     """LLM客户端抽象基类"""
     
     def __init__(self, config: LLMConfig):
         self.config = config
-        self.http_client = httpx.Client(timeout=config.timeout)
+        # 保持 httpx 默认传输层：自定义 transport 会让 HTTPS_PROXY/ALL_PROXY 等环境代理失效
+        self.http_client = httpx.Client(timeout=config.timeout, limits=HTTP_POOL_LIMITS)
+        self.retry_backoff = 0.5
+
+    def _post(self, url: str, **kwargs) -> httpx.Response:
+        """
+        带重试的 POST
+
+        - 连接建立失败（ConnectError / ConnectTimeout）重试
+        - 429 / 5xx 响应按指数退避重试（响应带 Retry-After 时优先使用）
+        重试次数由 config.max_retries 控制，用尽后返回最后一次响应或抛出最后一次异常。
+        """
+        max_retries = self.config.max_retries
+        attempt = 0
+        while True:
+            try:
+                response = self.http_client.post(url, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                if attempt >= max_retries:
+                    raise
+                delay = self.retry_backoff * (2 ** attempt)
+                logger.warning(f"LLM连接失败 ({e})，{delay:.1f}秒后重试 ({attempt + 1}/{max_retries})")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+                    return response
+                delay = self._retry_delay(response, attempt)
+                response.close()
+                logger.warning(f"LLM请求返回 {response.status_code}，{delay:.1f}秒后重试 ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+            attempt += 1
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), 60.0)
+            except ValueError:
+                pass
+        return self.retry_backoff * (2 ** attempt)
     
     @abstractmethod
     def chat(self, 
@@ -208,7 +256,7 @@ class OpenAIClient(BaseLLMClient):
             "temperature": kwargs.get("temperature", self.config.temperature),
         }
         
-        response = self.http_client.post(
+        response = self._post(
             f"{self.api_base}/chat/completions",
             headers=headers,
             json=payload
@@ -271,7 +319,7 @@ class AnthropicClient(BaseLLMClient):
         if system_prompt:
             payload["system"] = system_prompt
         
-        response = self.http_client.post(
+        response = self._post(
             f"{self.api_base}/v1/messages",
             headers=headers,
             json=payload
@@ -327,7 +375,7 @@ class AliyunClient(BaseLLMClient):
             "temperature": kwargs.get("temperature", self.config.temperature),
         }
         
-        response = self.http_client.post(
+        response = self._post(
             f"{self.api_base}/chat/completions",
             headers=headers,
             json=payload
@@ -387,7 +435,7 @@ class ZhipuClient(BaseLLMClient):
             "temperature": kwargs.get("temperature", self.config.temperature),
         }
         
-        response = self.http_client.post(
+        response = self._post(
             f"{self.api_base}/chat/completions",
             headers=headers,
             json=payload
@@ -447,7 +495,7 @@ class DeepSeekClient(BaseLLMClient):
             "temperature": kwargs.get("temperature", self.config.temperature),
         }
         
-        response = self.http_client.post(
+        response = self._post(
             f"{self.api_base}/chat/completions",
             headers=headers,
             json=payload
@@ -501,7 +549,7 @@ class OllamaClient(BaseLLMClient):
             }
         }
         
-        response = self.http_client.post(
+        response = self._post(
             f"{self.api_base}/api/chat",
             json=payload
         )
@@ -577,7 +625,7 @@ class OpenAICompatibleClient(BaseLLMClient):
             prompt_summary = last_msg[:100] + "..." if len(last_msg) > 100 else last_msg
 
         try:
-            response = self.http_client.post(url, headers=headers, json=payload)
+            response = self._post(url, headers=headers, json=payload)
             response.raise_for_status()
             data = response.json()
 
@@ -720,7 +768,7 @@ class ModelScopeClient(BaseLLMClient):
             prompt_summary = last_msg[:100] + "..." if len(last_msg) > 100 else last_msg
 
         try:
-            response = self.http_client.post(url, headers=headers, json=payload)
+            response = self._post(url, headers=headers, json=payload)
             response.raise_for_status()
             data = response.json()
 
@@ -902,6 +950,7 @@ def create_llm_client(
         max_tokens=kwargs.get("max_tokens", 2000),
         temperature=kwargs.get("temperature", 0.7),
         timeout=kwargs.get("timeout", 60),
+        max_retries=kwargs.get("max_retries", 3),
         extra_params=kwargs.get("extra_params"),
     )
     
@@ -979,6 +1028,7 @@ def get_provider_info(provider: str) -> Dict[str, Any]:
 # 思考模型识别
 # ============================================================
 
+@functools.lru_cache(maxsize=256)
 def is_reasoning_model(model_name: str) -> bool:
     """
     判断模型是否为思考模型（推理模型）
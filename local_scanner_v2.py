@@ -32,18 +32,22 @@ Polymarket 组合套利系统 - 本地完整版 v2
 
 import logging
 import traceback
+import hashlib
 import requests
 import json
 import os
+import re
 import sys
 import sqlite3
 import argparse
+import operator
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, field, asdict, is_dataclass
+from dataclasses import dataclass, field, fields, asdict, is_dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple, Any
-from collections import defaultdict
+from typing import List, Optional, Dict, Tuple, Any, Iterator
+from collections import defaultdict, OrderedDict
 from enum import Enum
 
 # ============================================================
@@ -55,11 +59,12 @@ from datetime import datetime, UTC, timezone, timedelta
 from enum import Enum
 
 # 导入LLM提供商和配置
-from llm_providers import create_llm_client, BaseLLMClient, LLMResponse
+from llm_providers import create_llm_client, BaseLLMClient, LLMResponse, is_reasoning_model
 from config import Config as AppConfig
 from prompts import (
     format_analysis_prompt,
     format_exhaustive_prompt,
+    format_grouped_analysis_prompt,
     PromptConfig,
     RELATIONSHIP_ANALYSIS_PROMPT_V2
 )
@@ -74,7 +79,7 @@ from category_discovery import CategoryDiscovery, CategoryInfo
 from validation_engine import ValidationEngine
 from notifier import ArbitrageNotifier
 from execution_engine import ExecutionEngine
-from semantic_cluster import SemanticClusterer
+from semantic_cluster import SemanticClusterer, SemanticAnalysisCache
 from data_recorder import TimeSeriesRecorder
 from backtest_engine import BacktestEngine
 from secret_manager import secrets
@@ -82,15 +87,23 @@ from ws_client import PolymarketWSClient
 
 # ✅ 新增：导入 CLI 模块（v3.1）
 try:
-    from cli import InteractiveMenu, ScannerOutput
+    from cli import InteractiveMenu, ScannerOutput, make_menu
     from strategies import StrategyRegistry, BaseArbitrageStrategy, StrategyMetadata
     CLI_AVAILABLE = True
 except ImportError:
     CLI_AVAILABLE = False
     InteractiveMenu = None
     ScannerOutput = None
+    make_menu = None
     StrategyRegistry = None
 
+# 可选：orjson（C 实现的 JSON 解析/序列化，缓存和报告文件较大时明显更快）
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # ============================================================
 # Logging 配置
 # ============================================================
@@ -194,6 +207,11 @@ class Market:
     def __repr__(self):
         return f"Market('{self.question[:50]}...', YES=${self.yes_price:.2f}, spread={self.spread:.3f})"
 
+    @cached_property
+    def question_lower(self) -> str:
+        """小写问题文本（首次访问时计算并缓存，供分类/过滤/规则匹配复用）"""
+        return self.question.lower()
+
     @property
     def full_description(self) -> str:
         """获取完整的描述信息（优先使用event_description）"""
@@ -292,6 +310,153 @@ def json_serialize(obj: Any) -> Any:
         return obj
 
 
+def _json_default(obj: Any) -> Any:
+    """
+    json/orjson 的 default 钩子：写出时才按需展开 dataclass 和 Enum
+
+    与 json_serialize 输出一致，但不需要预先 asdict 复制整棵对象树；
+    只展开 dataclass 字段（不含 cached_property 等实例缓存）。
+    """
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if isinstance(obj, Enum):
+        return obj.value
+    # orjson 不直接序列化 float/int 的子类（如 numpy.float64），交给 default 处理；
+    # 标准库 json 本身就接受这些值，这里转换为内置类型保持两条路径一致
+    if isinstance(obj, float):
+        return float(obj)
+    if isinstance(obj, int):
+        return int(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_load_file(path) -> Any:
+    """读取 JSON 文件（优先使用 orjson）"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def json_dump_file(data: Any, path) -> None:
+    """
+    写入 JSON 文件（缩进 2，保留非 ASCII 字符；优先使用 orjson）
+
+    data 中可以直接包含 dataclass / Enum 对象，由 _json_default 在写出时展开，
+    调用方无需先 json_serialize。
+    """
+    if ORJSON_AVAILABLE:
+        option = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+                  | orjson.OPT_SERIALIZE_NUMPY)
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, default=_json_default, option=option))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=_json_default)
+
+
+# LLM 响应中的 JSON：优先取任意位置的 ```json 代码块，其次第一个裸 ``` 代码块，
+# 否则取第一个 '{' 到最后一个 '}' 之间的内容（兼容前后夹杂说明文字）；
+# 未闭合的代码块取到文本末尾
+_LLM_JSON_FENCE_RE = re.compile(r"```json(.*?)(?:```|\Z)", re.DOTALL)
+_LLM_BARE_FENCE_RE = re.compile(r"```(.*?)(?:```|\Z)", re.DOTALL)
+_LLM_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def llm_json_text(content: str) -> str:
+    """
+    从 LLM 原始响应中提取 JSON 文本（不做解析）
+
+    优先级：任意位置的 ```json 代码块 > 第一个普通 ``` 代码块 > 最外层花括号范围 > 原文。
+    响应先展示其他代码块、再给出 ```json 块时，仍取 JSON 块。
+    """
+    m = (_LLM_JSON_FENCE_RE.search(content)
+         or _LLM_BARE_FENCE_RE.search(content)
+         or _LLM_JSON_OBJECT_RE.search(content))
+    return (m.group(m.lastindex or 0) if m else content).strip()
+
+
+def parse_llm_json(content: str) -> Any:
+    """
+    解析 LLM 响应中的 JSON（优先使用 orjson）
+
+    解析失败时抛出 json.JSONDecodeError（orjson.JSONDecodeError 是其子类）。
+    """
+    text = llm_json_text(content)
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+# 标签分类文件（菜单 --list-subcats / --subcat 及固定分类模式共用）
+TAG_CATEGORIES_FILE = Path(__file__).parent / "data" / "tag_categories.json"
+
+
+@lru_cache(maxsize=4)
+def _load_tag_categories_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """读取 tag_categories.json（按路径和修改时间缓存，文件重写后自动失效）"""
+    return json_load_file(path)
+
+
+def load_tag_categories_file(path: Path = TAG_CATEGORIES_FILE) -> Dict[str, Any]:
+    """
+    读取标签分类文件的完整内容（缓存版本）
+
+    返回的字典在多次调用间共享，调用方只读使用，不要修改。
+    文件不存在时抛出 FileNotFoundError。
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    return _load_tag_categories_cached(os.fspath(path), mtime_ns)
+
+
+def _intern_str(value: Any) -> Any:
+    """驻留字符串（非字符串原样返回）"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=1)
+def _interval_parser():
+    """
+    共享的区间解析器（首次使用时导入并构造一次，解析规则在构造时编译）
+
+    interval_parser_v2 不可用时返回 None：市场照常解析，只是不带区间字段。
+    """
+    try:
+        from interval_parser_v2 import IntervalParser
+    except ImportError:
+        logging.warning("interval_parser_v2 不可用，跳过区间字段解析")
+        return None
+    return IntervalParser()
+
+
+@lru_cache(maxsize=4096)
+def _parse_interval_fields(group_item_title: str, question: str) -> Tuple[str, Optional[float], Optional[float]]:
+    """
+    按 (groupItemTitle, question) 缓存的区间解析，返回 (类型, 下界, 上界)
+
+    同一市场会出现在多个标签/事件的返回结果里，跨扫描也会反复拉取，
+    缓存后每个文本组合只走一遍正则解析。返回不可变元组，可安全共享。
+    """
+    parser = _interval_parser()
+    if parser is None:
+        return ("", None, None)
+    # 优先从 groupItemTitle 解析，如果没有则从 question 解析
+    interval = parser.parse(group_item_title, question)
+    if not interval:
+        return ("", None, None)
+    upper = interval.upper if interval.upper != float('inf') else None
+    return (interval.type.value, interval.lower, upper)
+
+
+# outcomePrices 形如 '["0.535", "0.465"]'，只需要第一个元素（YES价格）
+# 锚定到数组第一个元素（带引号或不带引号的数字），不匹配时交给 json.loads 按原逻辑处理/报错
+# 引号内按 float() 可接受的写法（".5"、"5."），裸数字按 JSON 数字语法
+_QUOTED_NUM = r'-?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?'
+_JSON_NUM = r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?'
+_FIRST_NUM_RE = re.compile(rf'^\s*\[\s*(?:"({_QUOTED_NUM})"|({_JSON_NUM}))\s*[,\]]')
+
+
 # ============================================================
 # 速率限制器
 # ============================================================
@@ -322,6 +487,57 @@ class RateLimiter:
             self.last_call = time.time()
 
 
+# ============================================================
+# LLM 响应缓存
+# ============================================================
+
+class LLMResponseCache:
+    """
+    LLM 响应精确匹配缓存（LRU + TTL，线程安全）
+
+    以规范化后 prompt 的 SHA-256 为键，重复扫描同一批市场时相同 prompt 不再重复请求
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(prompt: str) -> str:
+        """去掉首尾空白后取 SHA-256"""
+        return hashlib.sha256(prompt.strip().encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """命中且未过期时返回缓存内容（并移到最近使用端）"""
+        import time
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, content = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return content
+
+    def put(self, key: str, content: str):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        import time
+        with self.lock:
+            self._entries[key] = (time.monotonic() + self.ttl, content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str):
+        """删除条目（如响应无法解析时，避免缓存错误结果）"""
+        with self.lock:
+            self._entries.pop(key, None)
+
+
 # ============================================================
 # Polymarket API客户端
 # ============================================================
@@ -407,12 +623,13 @@ class PolymarketClient:
         """
         try:
             outcome_prices = data.get('outcomePrices', '["0.5","0.5"]')
-            if isinstance(outcome_prices, str):
-                prices = json.loads(outcome_prices)
+            match = _FIRST_NUM_RE.match(outcome_prices) if isinstance(outcome_prices, str) else None
+            if match:
+                # 常见格式直接取第一个元素，无需把整个 JSON 数组解析成 list
+                yes_price = float(match.group(1) or match.group(2))
             else:
-                prices = outcome_prices
-
-            yes_price = float(prices[0]) if prices else 0.5
+                prices = json.loads(outcome_prices) if isinstance(outcome_prices, str) else outcome_prices
+                yes_price = float(prices[0]) if prices else 0.5
 
             outcomes_str = data.get('outcomes', '["Yes","No"]')
             if isinstance(outcomes_str, str):
@@ -451,28 +668,23 @@ class PolymarketClient:
             group_item_threshold = data.get('groupItemThreshold', '')
 
             # 使用区间解析器解析区间信息
-            interval_type = ""
-            interval_lower = None
-            interval_upper = None
-
             question = data.get('question', '')
 
             if group_item_title or question:
-                from interval_parser_v2 import IntervalParser
-                parser = IntervalParser()
-
-                # 优先从 groupItemTitle 解析，如果没有则从 question 解析
-                interval = parser.parse(group_item_title, question)
-                if interval:
-                    interval_type = interval.type.value
-                    interval_lower = interval.lower
-                    interval_upper = interval.upper if interval.upper != float('inf') else None
+                interval_type, interval_lower, interval_upper = _parse_interval_fields(
+                    group_item_title or "", question or ""
+                )
+            else:
+                interval_type, interval_lower, interval_upper = "", None, None
 
             # /events API 返回的market数据没有liquidity字段，使用volume作为流动性指标
             liquidity_value = data.get('liquidity')
             if liquidity_value is None:
                 liquidity_value = data.get('volume', 0)
 
+            # 低基数字符串（日期、事件、结果名等）在成千上万个市场间大量重复，
+            # 驻留后共享同一对象，分组/比较时可走指针相等的快速路径
+            intern = _intern_str
             market = Market(
                 id=data.get('id', ''),
                 condition_id=data.get('conditionId', ''),
@@ -482,11 +694,11 @@ class PolymarketClient:
                 no_price=1 - yes_price,
                 volume=float(data.get('volume', 0) or 0),
                 liquidity=float(liquidity_value or 0),
-                end_date=data.get('endDate', ''),
-                event_id=(event_data.get('slug', '') if event_data else '') or data.get('eventSlug', '') or '',
-                event_title=(event_data.get('title', '') if event_data else '') or data.get('groupItemTitle', '') or '',
-                resolution_source=data.get('resolutionSource', ''),
-                outcomes=outcomes,
+                end_date=intern(data.get('endDate', '')),
+                event_id=intern((event_data.get('slug', '') if event_data else '') or data.get('eventSlug', '') or ''),
+                event_title=intern((event_data.get('title', '') if event_data else '') or data.get('groupItemTitle', '') or ''),
+                resolution_source=intern(data.get('resolutionSource', '')),
+                outcomes=[intern(o) for o in outcomes] if isinstance(outcomes, list) else outcomes,
                 token_id=yes_token_id,
                 no_token_id=no_token_id,
                 event_description=event_description,
@@ -495,7 +707,7 @@ class PolymarketClient:
                 # ✅ 新增: 区间市场字段
                 group_item_title=group_item_title,
                 group_item_threshold=group_item_threshold,
-                interval_type=interval_type,
+                interval_type=intern(interval_type),
                 interval_lower=interval_lower,
                 interval_upper=interval_upper
             )
@@ -902,10 +1114,20 @@ class PolymarketClient:
 
         if fetch_orderbook:
             print(f"正在获取 {len(markets)} 个市场的订单簿数据...")
-            for i, market in enumerate(markets):
-                self.enrich_market_with_orderbook(market)
-                if (i + 1) % 20 == 0:
-                    print(f"  已处理 {i + 1}/{len(markets)} 个市场")
+            # 并发请求订单簿（共享 session 连接池），RateLimiter 控制实际请求频率
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                futures = [executor.submit(self.enrich_market_with_orderbook, m) for m in markets]
+                try:
+                    for i, future in enumerate(as_completed(futures)):
+                        # 与串行版本一致：补充订单簿时的异常抛给调用方
+                        future.result()
+                        if (i + 1) % 20 == 0:
+                            print(f"  已处理 {i + 1}/{len(markets)} 个市场")
+                except BaseException:
+                    # 出错后不再发起尚未开始的请求
+                    for f in futures:
+                        f.cancel()
+                    raise
 
         return markets
 
@@ -938,35 +1160,42 @@ class PolymarketClient:
 
         all_markets = []
         seen_ids = set()
+        if not search_queries:
+            return all_markets
 
         logging.info(f"🔍 使用 {len(search_queries)} 个关键词搜索加密货币市场...")
 
-        for query in search_queries:
-            # 使用关键词搜索市场
-            # 注意：Gamma API可能不支持直接的关键词搜索参数
-            # 这里我们获取大量市场，然后通过客户端过滤
-            markets_batch = self.get_markets(
-                limit=200,  # 每次获取200个
-                active=True,
-                min_liquidity=min_liquidity
-            )
-
-            # 客户端过滤：关键词匹配
-            query_lower = query.lower()
-            filtered = [
-                m for m in markets_batch
-                if (query_lower in m.question.lower() or
-                    query_lower in m.description.lower() or
-                    query_lower in m.event_title.lower())
-            ]
+        # 注意：Gamma API可能不支持直接的关键词搜索参数
+        # 每个关键词请求的参数完全相同，因此只获取一次市场列表，
+        # 再用合并后的关键词正则在客户端一次性过滤
+        markets_batch = self.get_markets(
+            limit=200,  # 获取200个
+            active=True,
+            min_liquidity=min_liquidity
+        )
 
-            # 去重
-            for m in filtered:
-                if m.id not in seen_ids:
-                    all_markets.append(m)
-                    seen_ids.add(m.id)
+        keywords = list(dict.fromkeys(q.lower() for q in search_queries))
+        keyword_re = re.compile('|'.join(re.escape(kw) for kw in keywords))
+        # 各关键词命中的市场数（仅用于日志，只在已命中合并正则的市场上逐词统计）
+        keyword_counts = dict.fromkeys(keywords, 0)
+
+        for m in markets_batch:
+            question_lower = m.question_lower
+            description_lower = m.description.lower()
+            event_title_lower = m.event_title.lower()
+            if not (keyword_re.search(question_lower) or
+                    keyword_re.search(description_lower) or
+                    keyword_re.search(event_title_lower)):
+                continue
+            for kw in keywords:
+                if kw in question_lower or kw in description_lower or kw in event_title_lower:
+                    keyword_counts[kw] += 1
+            if m.id not in seen_ids:
+                all_markets.append(m)
+                seen_ids.add(m.id)
 
-            logging.info(f"  关键词 '{query}': 找到 {len(filtered)} 个市场")
+        for query in search_queries:
+            logging.info(f"  关键词 '{query}': 找到 {keyword_counts[query.lower()]} 个市场")
 
         # 按流动性排序（降序）
         all_markets.sort(key=lambda m: m.liquidity, reverse=True)
@@ -1004,6 +1233,11 @@ class MarketDomainClassifier:
         'game', 'team', 'player', 'score', 'match', 'tournament'
     ]
 
+    # 每个领域的关键词合并为一个交替正则，单次扫描完成子串匹配
+    _CRYPTO_RE = re.compile('|'.join(map(re.escape, CRYPTO_KEYWORDS)))
+    _POLITICS_RE = re.compile('|'.join(map(re.escape, POLITICS_KEYWORDS)))
+    _SPORTS_RE = re.compile('|'.join(map(re.escape, SPORTS_KEYWORDS)))
+
     def classify(self, market: Market) -> str:
         """
         判断市场所属领域
@@ -1021,15 +1255,15 @@ class MarketDomainClassifier:
         )
 
         # 加密货币
-        if any(kw in text for kw in self.CRYPTO_KEYWORDS):
+        if self._CRYPTO_RE.search(text):
             return 'crypto'
 
         # 政治
-        if any(kw in text for kw in self.POLITICS_KEYWORDS):
+        if self._POLITICS_RE.search(text):
             return 'politics'
 
         # 体育
-        if any(kw in text for kw in self.SPORTS_KEYWORDS):
+        if self._SPORTS_RE.search(text):
             return 'sports'
 
         return 'other'
@@ -1077,8 +1311,7 @@ class MarketCache:
     def _load_cache(self, cache_file: str) -> List[Market]:
         """从缓存文件加载市场数据"""
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = json_load_file(cache_file)
 
             markets = []
             for item in data:
@@ -1098,9 +1331,7 @@ class MarketCache:
     def _save_cache(self, cache_file: str, markets: List[Market]):
         """保存市场数据到缓存文件"""
         try:
-            data = [json_serialize(m) for m in markets]
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            json_dump_file(markets, cache_file)
 
             logging.info(f"💾 已保存缓存: {cache_file}")
 
@@ -1216,12 +1447,28 @@ ANALYSIS_PROMPT = RELATIONSHIP_ANALYSIS_PROMPT_V2
 class LLMAnalyzer:
     """LLM分析器 - 支持多种提供商"""
 
+    # 单个 JSON 结论（市场对关系 / 完备集验证）的输出上限：
+    # 足够容纳完整 schema，同时截断模型在 JSON 之后继续输出的解释文字
+    ANALYSIS_MAX_TOKENS = 1024
+
+    # LLM 响应质量信号 -> 置信度上限（_normalize_llm_response 中多个信号同时出现时取最小值；
+    # 可在实例上覆盖以调整策略）
+    CONFIDENCE_CAPS: Dict[str, float] = {
+        "inconsistent_reasoning": 0.0,  # reasoning 与 relationship 矛盾（同时降级为 INDEPENDENT）
+        "direction_mismatch": 0.5,      # reasoning 提到相反的蕴含方向
+    }
+
     def __init__(self, config: AppConfig = None, profile_name: str = None, model_override: str = None):
         self.config = config
         self.use_llm = True
         self.client: Optional[BaseLLMClient] = None
         self.profile_name = profile_name
         self.model_name = model_override
+        self.response_cache = LLMResponseCache(
+            ttl=config.scan.cache_ttl if config else 3600
+        )
+        # 可选：语义缓存（由 ArbitrageScanner 在语义聚类器可用时设置）
+        self.semantic_cache: Optional[SemanticAnalysisCache] = None
 
         try:
             # 方式1: 命令行指定 --profile
@@ -1340,6 +1587,31 @@ class LLMAnalyzer:
         self.model_name = model
         print(f"[OK] LLM已初始化 (自动检测): {profile.name} / {model}")
     
+    @cached_property
+    def analysis_max_tokens(self) -> Optional[int]:
+        """
+        单个 JSON 结论请求的 max_tokens
+
+        思考模型的推理过程计入输出 token，不做限制（返回 None，沿用客户端配置）。
+        """
+        if not self.client or is_reasoning_model(self.client.config.model):
+            return None
+        return min(self.client.config.max_tokens, self.ANALYSIS_MAX_TOKENS)
+
+    def chat_cached(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        """
+        发送 prompt 并返回响应文本（相同 prompt 在 TTL 内直接返回缓存结果）
+
+        调用方解析失败时应调用 self.response_cache.discard(LLMResponseCache.make_key(prompt))
+        """
+        key = LLMResponseCache.make_key(prompt)
+        content = self.response_cache.get(key)
+        if content is None:
+            kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+            content = self.client.chat(prompt, **kwargs).content
+            self.response_cache.put(key, content)
+        return content
+
     def analyze(self, market_a: Market, market_b: Market) -> Dict:
         """分析两个市场的逻辑关系"""
         if self.use_llm and self.client:
@@ -1347,52 +1619,191 @@ class LLMAnalyzer:
         else:
             return self._analyze_with_rules(market_a, market_b)
     
-    def _analyze_with_llm(self, market_a: Market, market_b: Market) -> Dict:
-        """使用LLM分析"""
-        # 将Market对象转换为字典格式
-        market_a_dict = {
-            "question": market_a.question,
-            "description": market_a.description or "",
-            "yes_price": market_a.yes_price,
-            "end_date": market_a.end_date or "未指定",
-            "event_id": market_a.event_id or "未指定",
-            "resolution_source": market_a.resolution_source or "未指定",
-        }
-        market_b_dict = {
-            "question": market_b.question,
-            "description": market_b.description or "",
-            "yes_price": market_b.yes_price,
-            "end_date": market_b.end_date or "未指定",
-            "event_id": market_b.event_id or "未指定",
-            "resolution_source": market_b.resolution_source or "未指定",
+    def analyze_many(self, pairs: List[tuple], max_workers: int = 4,
+                     group_size: int = 1) -> Iterator[Optional[Dict]]:
+        """
+        并发分析多个市场对（各对的 LLM 请求相互独立，用线程池重叠网络等待）
+
+        Args:
+            pairs: [(market_a, market_b), ...]
+            max_workers: 并发请求数（规则匹配模式下串行执行）
+            group_size: 大于 1 时，共享同一个 market_b 的市场对每 group_size 个合并为
+                一次 analyze_group 请求；分组结果缺失的对回退到单独分析
+
+        Returns:
+            与 pairs 顺序一致的结果迭代器，单个市场对分析异常时对应位置为 None
+        """
+        def analyze_pair(pair):
+            try:
+                return self.analyze(pair[0], pair[1])
+            except Exception as e:
+                logger.debug(f"市场对分析失败: {e}")
+                return None
+
+        if not (self.use_llm and self.client) or len(pairs) <= 1:
+            yield from map(analyze_pair, pairs)
+            return
+
+        if self.semantic_cache is not None:
+            # 本批问题的向量合并为一次 Embedding 请求，逐对查询时不再单独请求
+            self.semantic_cache.prime(q for a, b in pairs for q in (a.question, b.question))
+
+        if group_size <= 1:
+            if max_workers <= 1:
+                yield from map(analyze_pair, pairs)
+                return
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+                yield from executor.map(analyze_pair, pairs)
+            return
+
+        def analyze_chunk(chunk):
+            reference = pairs[chunk[0]][1]
+            try:
+                results = self.analyze_group(reference, [pairs[i][0] for i in chunk])
+            except Exception as e:
+                logger.debug(f"分组关系分析失败，回退逐对分析: {e}")
+                results = [None] * len(chunk)
+            return [r if r is not None else analyze_pair(pairs[i]) for i, r in zip(chunk, results)]
+
+        chunks, singles = self._group_pair_indices(pairs, group_size)
+        # slots[i] = (future, 该对在分组结果中的位置；单独分析时为 None)
+        slots: List[Optional[tuple]] = [None] * len(pairs)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks) + len(singles)))) as executor:
+            for chunk in chunks:
+                future = executor.submit(analyze_chunk, chunk)
+                for offset, i in enumerate(chunk):
+                    slots[i] = (future, offset)
+            for i in singles:
+                slots[i] = (executor.submit(analyze_pair, pairs[i]), None)
+
+            for future, offset in slots:
+                result = future.result()
+                yield result if offset is None else result[offset]
+
+    @staticmethod
+    def _group_pair_indices(pairs: List[tuple], group_size: int) -> Tuple[List[List[int]], List[int]]:
+        """
+        按 market_b 对市场对下标分组
+
+        Returns:
+            (chunks, singles): chunks 为每组不超过 group_size 个、至少 2 个的下标列表，
+            singles 为无法成组的下标
+        """
+        by_reference: Dict[str, List[int]] = defaultdict(list)
+        for i, (_, market_b) in enumerate(pairs):
+            by_reference[market_b.id].append(i)
+
+        chunks, singles = [], []
+        for indices in by_reference.values():
+            for start in range(0, len(indices), group_size):
+                chunk = indices[start:start + group_size]
+                if len(chunk) > 1:
+                    chunks.append(chunk)
+                else:
+                    singles.extend(chunk)
+        return chunks, singles
+
+    def analyze_group(self, reference: Market, candidates: List[Market]) -> List[Optional[Dict]]:
+        """
+        一次 LLM 请求分析多个候选市场（作为市场A）与同一参考市场（市场B）的关系
+
+        参考市场部分在各候选间共享，N 个市场对只需一次请求。
+
+        Returns:
+            与 candidates 顺序一致的标准化结果，解析失败或模型遗漏的候选为 None
+        """
+        results: List[Optional[Dict]] = [None] * len(candidates)
+        if not (self.use_llm and self.client) or not candidates:
+            return results
+
+        prompt = format_grouped_analysis_prompt(
+            self._market_prompt_info(reference),
+            [self._market_prompt_info(m) for m in candidates]
+        )
+        try:
+            data = parse_llm_json(self.chat_cached(prompt))
+        except json.JSONDecodeError as e:
+            self.response_cache.discard(LLMResponseCache.make_key(prompt))
+            logger.warning(f"分组关系分析JSON解析失败: {e}")
+            return results
+        except Exception as e:
+            logger.warning(f"分组关系分析失败: {e}")
+            return results
+
+        items = data.get("candidates", []) if isinstance(data, dict) else []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            index = item.get("index")
+            if isinstance(index, int) and 0 <= index < len(results) and results[index] is None:
+                # 单个候选字段异常（如 relationship 为 null）时保留 None，由调用方回退逐对分析
+                try:
+                    results[index] = self._normalize_llm_response(item)
+                except Exception as e:
+                    logger.warning(f"分组关系分析候选 {index} 结果无效: {e}")
+        if not any(results):
+            # 没有任何可用候选结果的响应不保留，下次重新请求
+            self.response_cache.discard(LLMResponseCache.make_key(prompt))
+        return results
+
+    _PROMPT_FIELDS = operator.attrgetter(
+        "question", "description", "yes_price", "end_date", "event_id", "resolution_source"
+    )
+
+    @staticmethod
+    def _market_prompt_info(market: Market) -> Dict:
+        """将 Market 对象转换为 Prompt 格式化所需的字典（一次 attrgetter 取齐全部字段）"""
+        question, description, yes_price, end_date, event_id, source = LLMAnalyzer._PROMPT_FIELDS(market)
+        return {
+            "question": question,
+            "description": description or "",
+            "yes_price": yes_price,
+            "end_date": end_date or "未指定",
+            "event_id": event_id or "未指定",
+            "resolution_source": source or "未指定",
         }
 
+    def _analyze_with_llm(self, market_a: Market, market_b: Market) -> Dict:
+        """使用LLM分析"""
         # 使用新版Prompt格式化函数
         prompt = format_analysis_prompt(
-            market_a_dict,
-            market_b_dict,
+            self._market_prompt_info(market_a),
+            self._market_prompt_info(market_b),
             PromptConfig(version="v2")
         )
 
-        try:
-            response = self.client.chat(prompt)
-            content = response.content
-
-            # 提取JSON
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
+        # 语义缓存：同一市场对的改写版本已分析过时直接复用
+        # 精确响应缓存命中时不查语义缓存（省去 Embedding 请求）；
+        # 结算日期参与分组，描述指纹用于识别规则已变化的同一市场对
+        semantic_cache = self.semantic_cache
+        semantic_context = {}
+        if semantic_cache is not None:
+            semantic_context = {
+                "end_dates": (market_a.end_date, market_b.end_date),
+                "fingerprint": hash((market_a.description, market_b.description)),
+            }
+            if self.response_cache.get(LLMResponseCache.make_key(prompt)) is None:
+                cached = semantic_cache.get(market_a.question, market_b.question, **semantic_context)
+                if cached is not None:
+                    return dict(cached)
 
-            result = json.loads(content.strip())
+        raw_content = content = ""
+        try:
+            raw_content = self.chat_cached(prompt, max_tokens=self.analysis_max_tokens)
+            content = llm_json_text(raw_content)
+            result = orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content)
 
             # 标准化输出格式（兼容新旧格式）
             normalized = self._normalize_llm_response(result)
+            if semantic_cache is not None:
+                semantic_cache.put(market_a.question, market_b.question, dict(normalized), **semantic_context)
             return normalized
 
         except json.JSONDecodeError as e:
+            # 无法解析的响应不保留在缓存中，下次重新请求
+            self.response_cache.discard(LLMResponseCache.make_key(prompt))
             # 保存完整LLM响应用于调试
-            self._save_llm_error_response(market_a, market_b, response.content, content, str(e))
+            self._save_llm_error_response(market_a, market_b, raw_content, content, str(e))
 
             error_msg = (
                 f"JSON解析失败\n"
@@ -1405,6 +1816,9 @@ class LLMAnalyzer:
             print(f"    JSON解析失败: {e} (完整响应已保存)")
             return self._analyze_with_rules(market_a, market_b)
         except Exception as e:
+            # 能解析为 JSON 但标准化失败（如 relationship 为 null）的响应同样不保留，
+            # 否则 TTL 内该市场对每次扫描都会退化为规则匹配
+            self.response_cache.discard(LLMResponseCache.make_key(prompt))
             error_msg = (
                 f"LLM分析失败\n"
                 f"  错误类型: {type(e).__name__}\n"
@@ -1434,6 +1848,9 @@ class LLMAnalyzer:
             'confidence': confidence
         }
 
+        # 触发的质量信号，最后统一按 CONFIDENCE_CAPS 限制置信度
+        signals = []
+
         # ✅ 调用一致性检查方法
         is_consistent, consistency_error = self._validate_llm_response_consistency(temp_result)
 
@@ -1442,7 +1859,7 @@ class LLMAnalyzer:
             print(f"       降级为 INDEPENDENT 以防止假套利")
             # 降级为 INDEPENDENT
             relationship = "INDEPENDENT"
-            confidence = 0.0
+            signals.append("inconsistent_reasoning")
 
         # 一致性检查: 检测 relationship 与 reasoning 是否矛盾（保留原有逻辑作为双重检查）
         reasoning_upper = reasoning.upper() if isinstance(reasoning, str) else ""
@@ -1455,9 +1872,12 @@ class LLMAnalyzer:
             print(f"    [WARNING] LLM响应不一致: relationship={relationship}, 但reasoning提到IMPLIES_AB")
             inconsistency_detected = True
 
-        # 如果检测到不一致，降低置信度
         if inconsistency_detected:
-            confidence = min(confidence, 0.5)  # 降低到最多0.5
+            signals.append("direction_mismatch")
+
+        if signals:
+            caps = self.CONFIDENCE_CAPS
+            confidence = min(confidence, *(caps.get(signal, 1.0) for signal in signals))
 
         # 提取关键字段
         normalized = {
@@ -1480,23 +1900,27 @@ class LLMAnalyzer:
         return normalized
 
     
+    # 规则匹配关键词（子串匹配），每组合并为一个交替正则，单次扫描完成
+    _RULE_GOP_CANDIDATES = ("trump", "desantis", "haley", "vance")
+    _RULE_DEM_CANDIDATES = ("biden", "harris", "newsom")
+    _RULE_CANDIDATE_RE = re.compile("|".join(_RULE_GOP_CANDIDATES + _RULE_DEM_CANDIDATES))
+    _RULE_GOP_CANDIDATE_RE = re.compile("|".join(_RULE_GOP_CANDIDATES))
+    _RULE_DEM_CANDIDATE_RE = re.compile("|".join(_RULE_DEM_CANDIDATES))
+    _RULE_PARTY_RE = re.compile("republican|democrat|gop|dem")
+
     def _analyze_with_rules(self, market_a: Market, market_b: Market) -> Dict:
         """使用规则匹配分析（备用方案）"""
-        q_a = market_a.question.lower()
-        q_b = market_b.question.lower()
+        q_a = market_a.question_lower
+        q_b = market_b.question_lower
         
         # 规则1: 个人候选人 vs 政党
-        candidates = ["trump", "biden", "harris", "desantis", "haley", "newsom", "vance"]
-        parties = ["republican", "democrat", "gop", "dem"]
-        
-        candidate_in_a = any(c in q_a for c in candidates)
-        candidate_in_b = any(c in q_b for c in candidates)
-        party_in_a = any(p in q_a for p in parties)
-        party_in_b = any(p in q_b for p in parties)
+        candidate_in_a = self._RULE_CANDIDATE_RE.search(q_a)
+        candidate_in_b = self._RULE_CANDIDATE_RE.search(q_b)
+        party_in_b = self._RULE_PARTY_RE.search(q_b)
         
         if candidate_in_a and party_in_b and not candidate_in_b:
-            if ("republican" in q_b and any(c in q_a for c in ["trump", "desantis", "haley", "vance"])) or \
-               ("democrat" in q_b and any(c in q_a for c in ["biden", "harris", "newsom"])):
+            if ("republican" in q_b and self._RULE_GOP_CANDIDATE_RE.search(q_a)) or \
+               ("democrat" in q_b and self._RULE_DEM_CANDIDATE_RE.search(q_a)):
                 return {
                     "relationship": "IMPLIES_AB",
                     "confidence": 0.9,
@@ -1548,6 +1972,31 @@ class LLMAnalyzer:
             "resolution_compatible": None,
         }
     
+    # 各关系类型下 reasoning 中不应出现的矛盾词（按检查顺序排列）
+    _CONTRADICTION_TERMS = {
+        'IMPLIES_AB': (
+            'mutual', 'exclusive', 'independent', 'unrelated',
+            '矛盾', '互斥', '无关', '独立'
+        ),
+        'IMPLIES_BA': (
+            'mutual', 'exclusive', 'independent', 'unrelated',
+            '矛盾', '互斥', '无关', '独立'
+        ),
+        'EQUIVALENT': (
+            'different', 'exclusive', 'independent', 'opposite',
+            '不同', '互斥', '矛盾', '相反'
+        ),
+        'MUTUAL_EXCLUSIVE': (
+            'implies', 'equivalent', 'same event', 'identical',
+            '蕴含', '等价', '相同', '一致'
+        ),
+    }
+    # 每种关系的矛盾词合并为一个忽略大小写的交替正则，单次扫描完成检查
+    _CONTRADICTION_RES = {
+        rel: re.compile('|'.join(map(re.escape, terms)), re.IGNORECASE)
+        for rel, terms in _CONTRADICTION_TERMS.items()
+    }
+
     def _validate_llm_response_consistency(self, llm_result: dict) -> tuple[bool, str]:
         """
         验证 LLM 输出的 consistency
@@ -1578,37 +2027,17 @@ class LLMAnalyzer:
              assert 'mutual' in msg.lower()
         """
         relationship = llm_result.get('relationship', '')
-        reasoning = llm_result.get('reasoning', '').lower()
-
-        # 定义矛盾模式
-        contradictions = {
-            'IMPLIES_AB': [
-                'mutual', 'exclusive', 'independent', 'unrelated',
-                '矛盾', '互斥', '无关', '独立'
-            ],
-            'IMPLIES_BA': [
-                'mutual', 'exclusive', 'independent', 'unrelated',
-                '矛盾', '互斥', '无关', '独立'
-            ],
-            'EQUIVALENT': [
-                'different', 'exclusive', 'independent', 'opposite',
-                '不同', '互斥', '矛盾', '相反'
-            ],
-            'MUTUAL_EXCLUSIVE': [
-                'implies', 'equivalent', 'same event', 'identical',
-                '蕴含', '等价', '相同', '一致'
-            ],
-        }
-
-        # 检查是否矛盾
-        if relationship in contradictions:
-            forbidden_terms = contradictions[relationship]
-            for term in forbidden_terms:
-                if term in reasoning:
-                    return False, (
-                        f"LLM 输出矛盾: relationship={relationship}, "
-                        f"但 reasoning 包含 '{term}'"
-                    )
+        pattern = self._CONTRADICTION_RES.get(relationship)
+        if pattern is None:
+            return True, ""
+
+        # 检查是否矛盾（忽略大小写，不复制整段 reasoning）
+        match = pattern.search(llm_result.get('reasoning', ''))
+        if match:
+            return False, (
+                f"LLM 输出矛盾: relationship={relationship}, "
+                f"但 reasoning 包含 '{match.group(0).lower()}'"
+            )
 
         return True, ""
 
@@ -1711,15 +2140,11 @@ Event ID: {market_b.event_id or 'N/A'}
 
         try:
             # ✅ 修正：使用 chat 方法 (Phase 5.4 修复)
-            response = self.client.chat(prompt)
-            # 提取 JSON 内容
-            content = response.content
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-
-            return json.loads(content)
+            return parse_llm_json(self.chat_cached(prompt))
+        except json.JSONDecodeError as e:
+            self.response_cache.discard(LLMResponseCache.make_key(prompt))
+            logger.error(f"批量聚类分析失败: {e}")
+            return {"relationships": [], "synthetic_opportunities": []}
         except Exception as e:
             logger.error(f"批量聚类分析失败: {e}")
             return {"relationships": [], "synthetic_opportunities": []}
@@ -1788,16 +2213,9 @@ class ArbitrageDetector:
         prompt = format_exhaustive_prompt(event_title, markets_dict, total_price)
 
         try:
-            response = self.llm_analyzer.client.chat(prompt)
-            content = response.content
-
-            # 提取 JSON
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-
-            result = json.loads(content.strip())
+            result = parse_llm_json(
+                self.llm_analyzer.chat_cached(prompt, max_tokens=self.llm_analyzer.analysis_max_tokens)
+            )
 
             # 标准化结果
             return {
@@ -1812,6 +2230,7 @@ class ArbitrageDetector:
             }
 
         except json.JSONDecodeError as e:
+            self.llm_analyzer.response_cache.discard(LLMResponseCache.make_key(prompt))
             market_questions = [m.question[:30] + "..." for m in markets[:3]]
             error_msg = (
                 f"LLM完备集验证JSON解析失败\n"
@@ -1829,6 +2248,8 @@ class ArbitrageDetector:
                 "reasoning": f"JSON解析失败: {e}"
             }
         except Exception as e:
+            # 可解析但结构不符的响应同样不保留在缓存中
+            self.llm_analyzer.response_cache.discard(LLMResponseCache.make_key(prompt))
             market_questions = [m.question[:30] + "..." for m in markets[:3]]
             error_msg = (
                 f"LLM完备集验证失败\n"
@@ -1908,6 +2329,14 @@ class ArbitrageScanner:
             logging.warning(f"无法初始化语义聚类器: {e}，将禁用语义聚类功能")
             self.clusterer = None
 
+        # 可选：LLM 分析结果语义缓存（复用语义聚类器的 Embedding 接口）
+        if self.clusterer and getattr(config.scan, 'enable_semantic_llm_cache', False):
+            self.analyzer.semantic_cache = SemanticAnalysisCache(
+                self.clusterer,
+                threshold=getattr(config.scan, 'semantic_cache_threshold', 0.95),
+                ttl=getattr(config.scan, 'cache_ttl', 3600)
+            )
+
         # ✅ 新增：动态分类组件 (v3.1)
         self.category_discovery = None
         self.use_dynamic_categories = getattr(config.scan, 'use_dynamic_categories', False)
@@ -1970,15 +2399,11 @@ class ArbitrageScanner:
         Returns:
             字典，key为类别名，value为tag slug列表
         """
-        tag_categories_file = Path(__file__).parent / "data" / "tag_categories.json"
-        if not tag_categories_file.exists():
-            logging.warning(f"[WARNING] 标签分类文件不存在: {tag_categories_file}")
-            return {}
-
         try:
-            with open(tag_categories_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get("categories", {})
+            return load_tag_categories_file().get("categories", {})
+        except FileNotFoundError:
+            logging.warning(f"[WARNING] 标签分类文件不存在: {TAG_CATEGORIES_FILE}")
+            return {}
         except Exception as e:
             logging.error(f"[ERROR] 加载标签分类失败: {e}")
             return {}
@@ -2141,17 +2566,24 @@ class ArbitrageScanner:
 
             logging.info(f"[FETCH] 正在获取动态分类 '{category.name_zh}' 的市场 (Tags: {len(tag_slugs)})")
 
-            all_markets = []
-            seen_ids = set()
-
-            for i, slug in enumerate(tag_slugs):
+            def fetch_tag(slug):
                 try:
-                    markets = self.client.get_markets_by_tag_slug(
+                    return self.client.get_markets_by_tag_slug(
                         slug,
                         active=True,
                         limit=100,
                         min_liquidity=self.config.scan.min_liquidity
                     )
+                except Exception as e:
+                    logging.debug(f"  获取 tag '{slug}' 失败: {e}")
+                    return []
+
+            all_markets = []
+            seen_ids = set()
+
+            # 与 _fetch_domain_markets 相同：各tag并发获取，RateLimiter 控制请求频率，map 保持tag顺序
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                for i, markets in enumerate(executor.map(fetch_tag, tag_slugs)):
                     for m in markets:
                         if m.id not in seen_ids:
                             all_markets.append(m)
@@ -2159,9 +2591,6 @@ class ArbitrageScanner:
 
                     if (i + 1) % 5 == 0:
                         logging.info(f"  进度: {i+1}/{len(tag_slugs)} tags, 已获取 {len(all_markets)} 个市场")
-                except Exception as e:
-                    logging.debug(f"  获取 tag '{slug}' 失败: {e}")
-                    continue
 
             # 按流动性排序并截断
             all_markets.sort(key=lambda x: x.liquidity, reverse=True)
@@ -2240,18 +2669,17 @@ class ArbitrageScanner:
             else:
                 logging.info(f"[FETCH] 域 '{domain}' 有 {len(tag_slugs)} 个tags")
 
-            all_markets = []
-            for i, slug in enumerate(tag_slugs):
-                try:
-                    # 根据配置决定是否启用全量获取
-                    max_results = (
-                        self.config.scan.fetch_max_per_tag
-                        if getattr(self.config.scan, 'enable_full_fetch', False)
-                        else None
-                    )
-                    page_size = getattr(self.config.scan, 'fetch_page_size', 100)
+            # 根据配置决定是否启用全量获取
+            max_results = (
+                self.config.scan.fetch_max_per_tag
+                if getattr(self.config.scan, 'enable_full_fetch', False)
+                else None
+            )
+            page_size = getattr(self.config.scan, 'fetch_page_size', 100)
 
-                    markets = self.client.get_markets_by_tag_slug(
+            def fetch_tag(slug):
+                try:
+                    return self.client.get_markets_by_tag_slug(
                         slug,
                         active=True,
                         limit=100,
@@ -2259,12 +2687,18 @@ class ArbitrageScanner:
                         max_results=max_results,
                         page_size=page_size
                     )
+                except Exception as e:
+                    logging.debug(f"  获取tag '{slug}' 失败: {e}")
+                    return []
+
+            # 每个tag至少需要 2 次往返（slug查询 + events分页），耗时由网络延迟主导，
+            # 使用线程池并发获取，RateLimiter (线程安全) 控制实际请求频率；map 保持tag顺序
+            all_markets = []
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                for i, markets in enumerate(executor.map(fetch_tag, tag_slugs)):
                     all_markets.extend(markets)
                     if (i + 1) % 20 == 0:
                         logging.info(f"  进度: {i+1}/{len(tag_slugs)} tags, 已获取 {len(all_markets)} 个市场")
-                except Exception as e:
-                    logging.debug(f"  获取tag '{slug}' 失败: {e}")
-                    continue
 
             # 去重（基于market ID）
             seen_ids = set()
@@ -2386,11 +2820,10 @@ class ArbitrageScanner:
                 "min_confidence": self.config.scan.min_confidence
             },
             "opportunities_count": len(opportunities),
-            "opportunities": [json_serialize(opp) for opp in opportunities]
+            "opportunities": opportunities  # 写出时由 json_dump_file 按需展开
         }
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        json_dump_file(report, output_file)
 
         logging.info(f"[OK] 报告已保存到 {output_file}")
         print(f"      [OK] 报告已保存到 {output_file}")
@@ -2743,64 +3176,71 @@ class ArbitrageScanner:
 
     def _print_summary(self, opportunities: List[ArbitrageOpportunity]):
         """打印摘要"""
-        print("\n" + "=" * 65)
-        print("扫描结果摘要")
-        print("=" * 65)
+        # 先收集所有行，最后一次性写出（减少逐行 print 的格式化与 I/O 开销）
+        out = []
+        emit = out.append
+
+        emit("\n" + "=" * 65)
+        emit("扫描结果摘要")
+        emit("=" * 65)
 
         if not opportunities:
-            print("\n暂未发现符合条件的套利机会")
-            print("这很正常——好机会不是时时都有\n")
+            emit("\n暂未发现符合条件的套利机会")
+            emit("这很正常——好机会不是时时都有\n")
+            sys.stdout.write("\n".join(out) + "\n")
             return
 
-        print(f"\n[RESULT] 发现 {len(opportunities)} 个潜在套利机会:\n")
+        emit(f"\n[RESULT] 发现 {len(opportunities)} 个潜在套利机会:\n")
 
         for i, opp in enumerate(opportunities, 1):
-            print(f"{'─' * 60}")
-            print(f"机会 #{i}: {opp.type}")
-            print(f"{'─' * 60}")
+            emit(f"{'─' * 60}")
+            emit(f"机会 #{i}: {opp.type}")
+            emit(f"{'─' * 60}")
 
             # 🔥 显示核心风控度量 (Phase 2.5/3.5 增强)
             apy_val = getattr(opp, 'apy', 0.0)
             rating = getattr(opp, 'apy_rating', 'N/A')
             apy_str = f"{apy_val:.1f}% ({rating})"
 
-            print(f"🔥 年化收益 (APY): {apy_str:25} 🎯 置信度: {opp.confidence:.0%}")
-            print(f"💰 预期净利润: {opp.profit_pct:.2f}% ({opp.profit:.4f} USD)   ⏳ 预估锁仓: {getattr(opp, 'days_to_resolution', 0)} 天")
-            print(f"📡 预言机对齐: {getattr(opp, 'oracle_alignment', 'UNKNOWN'):25} 🛡️ 滑点损失: {getattr(opp, 'slippage_cost', 0):.4f} USD")
-            print(f"📈 建议最大仓位: ${getattr(opp, 'max_position_usd', 0):,.0f} USD")
-            print(f"\n操作:")
+            emit(f"🔥 年化收益 (APY): {apy_str:25} 🎯 置信度: {opp.confidence:.0%}")
+            emit(f"💰 预期净利润: {opp.profit_pct:.2f}% ({opp.profit:.4f} USD)   ⏳ 预估锁仓: {getattr(opp, 'days_to_resolution', 0)} 天")
+            emit(f"📡 预言机对齐: {getattr(opp, 'oracle_alignment', 'UNKNOWN'):25} 🛡️ 滑点损失: {getattr(opp, 'slippage_cost', 0):.4f} USD")
+            emit(f"📈 建议最大仓位: ${getattr(opp, 'max_position_usd', 0):,.0f} USD")
+            emit(f"\n操作:")
             for line in opp.action.split('\n'):
-                print(f"  {line}")
+                emit(f"  {line}")
 
             # ✅ 新增：Polymarket 链接
             links = self._generate_polymarket_links(opp.markets)
-            print(f"\n[Polymarket 链接:]")
+            emit(f"\n[Polymarket 链接:]")
             for j, (market, link) in enumerate(zip(opp.markets, links), 1):
                 question = market.get('question', '')[:60]
-                print(f"  {j}. {question}...")
-                print(f"     {link}")
+                emit(f"  {j}. {question}...")
+                emit(f"     {link}")
 
             # ✅ 新增：人工验证清单
-            print(f"\n[WARNING] 人工验证清单:")
-            print(f"  [ ] 验证逻辑关系是否正确: {opp.type}")
-            print(f"  [ ] 检查结算规则是否兼容")
+            emit(f"\n[WARNING] 人工验证清单:")
+            emit(f"  [ ] 验证逻辑关系是否正确: {opp.type}")
+            emit(f"  [ ] 检查结算规则是否兼容")
 
             # 如果有两个市场，显示结算时间对比
             if len(opp.markets) >= 2:
                 market_1 = opp.markets[0]
                 market_2 = opp.markets[1]
-                print(f"  [ ] 在 Polymarket 上确认当前价格")
-                print(f"  [ ] 检查流动性: ${market_1.get('yes_price', 0):.2f} vs ${market_2.get('yes_price', 0):.2f}")
-            print(f"  [ ] 检查是否有特殊规则（如提前结算）")
-            print(f"  [ ] 验证 LLM 分析的合理性")
+                emit(f"  [ ] 在 Polymarket 上确认当前价格")
+                emit(f"  [ ] 检查流动性: ${market_1.get('yes_price', 0):.2f} vs ${market_2.get('yes_price', 0):.2f}")
+            emit(f"  [ ] 检查是否有特殊规则（如提前结算）")
+            emit(f"  [ ] 验证 LLM 分析的合理性")
 
             # 原有的 needs_review 内容
             if opp.needs_review:
-                print(f"\n[NOTE] 额外注意事项:")
+                emit(f"\n[NOTE] 额外注意事项:")
                 for item in opp.needs_review:
-                    print(f"  • {item}")
+                    emit(f"  • {item}")
 
-            print()
+            emit("")
+
+        sys.stdout.write("\n".join(out) + "\n")
 
     # ============================================================
     # 🆕 验证模式相关方法
@@ -2815,61 +3255,67 @@ class ArbitrageScanner:
         """
         self.opportunity_counter += 1
 
-        print("\n" + "=" * 60)
-        print(f"[套利机会 #{self.opportunity_counter}] {opp.type}")
-        print("=" * 60)
+        # 同 _print_summary：收集后一次性写出
+        out = []
+        emit = out.append
+
+        emit("\n" + "=" * 60)
+        emit(f"[套利机会 #{self.opportunity_counter}] {opp.type}")
+        emit("=" * 60)
 
         # 【市场信息】
-        print("\n[市场信息]")
-        print("-" * 60)
+        emit("\n[市场信息]")
+        emit("-" * 60)
         links = self._generate_polymarket_links(opp.markets)
 
         for i, (market, link) in enumerate(zip(opp.markets, links), 1):
             role = f"市场 {chr(64+i)}"  # A, B, C...
-            print(f"{role}:")
-            print(f"  问题: {market.get('question', '')}")
-            print(f"  YES价格: ${market.get('yes_price', 0):.4f} (ask: ${market.get('best_ask', 0):.4f})")
-            print(f"  NO价格:  ${market.get('no_price', 0):.4f} (bid: ${market.get('best_bid', 0):.4f})")
-            print(f"  流动性:  ${market.get('liquidity', 0):,.0f} USDC")
+            emit(f"{role}:")
+            emit(f"  问题: {market.get('question', '')}")
+            emit(f"  YES价格: ${market.get('yes_price', 0):.4f} (ask: ${market.get('best_ask', 0):.4f})")
+            emit(f"  NO价格:  ${market.get('no_price', 0):.4f} (bid: ${market.get('best_bid', 0):.4f})")
+            emit(f"  流动性:  ${market.get('liquidity', 0):,.0f} USDC")
             end_date = market.get('end_date', 'N/A')
             if end_date and end_date != 'N/A':
                 end_date = end_date[:10] if 'T' in end_date else end_date
-            print(f"  结算:   {end_date}")
-            print(f"  链接:   {link}")
-            print()
+            emit(f"  结算:   {end_date}")
+            emit(f"  链接:   {link}")
+            emit("")
 
         # 【套利详情】
-        print("[套利详情]")
-        print("-" * 60)
-        print(f"逻辑关系: {opp.relationship}")
-        print(f"置信度:   {opp.confidence:.0%}")
-        print(f"利润率:   {opp.profit_pct:.2f}%")
-        print(f"\n操作:")
+        emit("[套利详情]")
+        emit("-" * 60)
+        emit(f"逻辑关系: {opp.relationship}")
+        emit(f"置信度:   {opp.confidence:.0%}")
+        emit(f"利润率:   {opp.profit_pct:.2f}%")
+        emit(f"\n操作:")
         for line in opp.action.split('\n'):
-            print(f"  {line}")
+            emit(f"  {line}")
 
         # 【LLM 完整推理】
         if opp.reasoning:
-            print("\n[LLM 完整推理]")
-            print("-" * 60)
+            emit("\n[LLM 完整推理]")
+            emit("-" * 60)
             # 限制推理长度，避免输出过长
             reasoning = opp.reasoning
             if len(reasoning) > 2000:
                 reasoning = reasoning[:2000] + "\n... (推理内容过长，已截断)"
-            print(reasoning)
+            emit(reasoning)
 
         # 【风险提示】
-        print("\n[风险提示]")
-        print("-" * 60)
+        emit("\n[风险提示]")
+        emit("-" * 60)
         for item in opp.needs_review:
-            print(f"  - {item}")
+            emit(f"  - {item}")
 
         if opp.edge_cases:
-            print("\nEdge Cases:")
+            emit("\nEdge Cases:")
             for case in opp.edge_cases:
-                print(f"  - {case}")
+                emit(f"  - {case}")
+
+        emit("=" * 60)
 
-        print("=" * 60)
+        sys.stdout.write("\n".join(out) + "\n")
 
     def _handle_opportunity_verification(
         self,
@@ -2964,8 +3410,7 @@ class ArbitrageScanner:
                     filename = f"opportunity_{opp.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
                     filepath = Path(self.config.output.output_dir) / filename
                     filepath.parent.mkdir(parents=True, exist_ok=True)
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        json.dump(json_serialize(opp), f, indent=2, ensure_ascii=False)
+                    json_dump_file(opp, filepath)
                     print(f"  -> 已保存到 {filepath}")
                     continue
 
@@ -3040,8 +3485,7 @@ class ArbitrageScanner:
         if self.run_mode == RunMode.DEBUG and self.false_positive_log:
             false_positive_file = Path(self.config.output.output_dir) / f"false_positives_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             false_positive_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(false_positive_file, 'w', encoding='utf-8') as f:
-                json.dump(self.false_positive_log, f, indent=2, ensure_ascii=False)
+            json_dump_file(self.false_positive_log, false_positive_file)
             print(f"\n[OK] 误报日志已保存: {false_positive_file}")
 
     def _save_discovered_opportunities(self) -> None:
@@ -3056,8 +3500,7 @@ class ArbitrageScanner:
             filename = f"discovered_opportunities_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             filepath = Path(self.config.output.output_dir) / filename
             filepath.parent.mkdir(parents=True, exist_ok=True)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump([json_serialize(opp) for opp in self.discovered_opportunities], f, indent=2, ensure_ascii=False)
+            json_dump_file(self.discovered_opportunities, filepath)
             print(f"\n[OK] 所有发现的机会已保存: {filepath}")
 
     def close(self):
@@ -3426,12 +3869,10 @@ def main():
     # ============================================================
     if args.list_subcats:
         # 直接读取tag_categories.json
-        tag_categories_file = Path(__file__).parent / "data" / "tag_categories.json"
-        if tag_categories_file.exists():
-            with open(tag_categories_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        else:
-            print(f"[ERROR] 标签分类文件不存在: {tag_categories_file}")
+        try:
+            data = load_tag_categories_file()
+        except FileNotFoundError:
+            print(f"[ERROR] 标签分类文件不存在: {TAG_CATEGORIES_FILE}")
             return 1
 
         # 优先显示分组
@@ -3480,7 +3921,7 @@ def main():
 
     if use_new_menu:
         # 创建持久的菜单对象（整个会话共享，保存LLM配置等状态）
-        menu = InteractiveMenu()
+        menu = make_menu()
 
         # 🆕 显示当前LLM配置（v3.3新增）
         menu.display_current_llm_config()
@@ -3779,11 +4220,8 @@ def main():
             expanded.append(mapped)
 
         # 🆕 改进的验证逻辑：允许不存在的子类别（会自动扩展为相关标签）
-        tag_categories_file = Path(__file__).parent / "data" / "tag_categories.json"
-        if tag_categories_file.exists():
-            with open(tag_categories_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                tag_categories = data.get("categories", {})
+        if TAG_CATEGORIES_FILE.exists():
+            tag_categories = load_tag_categories_file().get("categories", {})
 
             all_tags = tag_categories.get(domain, [])
 
@@ -3904,6 +4342,8 @@ def main():
                 if output:
                     output.print_step(2, 2, f"正在对 {len(clusters)} 个语义簇进行批量逻辑挖掘...")
 
+                # 已收录机会的 ID 集合，去重为 O(1) 查找而不是逐个扫描 opportunities
+                seen_opp_ids = {o.id for o in opportunities}
                 for i, cluster in enumerate(clusters):
                     if len(cluster) < 2:
                         continue
@@ -3912,11 +4352,14 @@ def main():
                         batch_opps = scanner._analyze_cluster_fully(cluster)
                         if batch_opps:
                             # 排除掉已经通过策略发现的重复机会
+                            new_opps = []
                             for b_opp in batch_opps:
-                                if not any(o.id == b_opp.id for o in opportunities):
+                                if b_opp.id not in seen_opp_ids:
+                                    seen_opp_ids.add(b_opp.id)
                                     opportunities.append(b_opp)
-                                    if output:
-                                        output.print_opportunity(b_opp)
+                                    new_opps.append(b_opp)
+                            if output:
+                                output.print_opportunities(new_opps)
                     except Exception as e:
                         logging.debug(f"批量分析簇 {i+1} 失败: {e}")
 
@@ -3940,6 +4383,8 @@ def main():
                             "subcategories": subcategories,
                             "scan": config.scan,  # 传入完整配置
                             "analyzer": scanner.analyzer,  # 传入 LLM 分析器
+                            "llm_max_workers": config.scan.llm_max_concurrency,  # 市场对并发分析数
+                            "llm_group_size": config.scan.llm_group_size,  # 共享市场B的分组请求大小
                             "clusters": clusters  # 🆕 传入语义聚类结果 (Phase 5.1)
                         },
                         progress_callback=lambda curr, total, msg: (
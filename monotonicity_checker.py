@@ -26,12 +26,27 @@ MonotonicityChecker - 单调性违背套利检测器
 """
 
 import re
+import sys
+import bisect
 import logging
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple, Union
 from datetime import datetime
 from collections import defaultdict
 from enum import Enum
+from functools import lru_cache
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 # 设置日志
 logger = logging.getLogger(__name__)
@@ -50,9 +65,9 @@ class MarketType(Enum):
     INTERVAL = "interval"    # 区间型市场
 
 
-@dataclass
+@dataclass(slots=True)
 class ThresholdInfo:
-    """阈值市场信息"""
+    """阈值市场信息（slots: 每个市场一个实例，去掉 __dict__ 以减少内存并加快属性访问）"""
     market: any  # Market 对象
     asset: str  # 资产名称 (btc, eth, sol, etc.)
     threshold_value: float  # 阈值数值
@@ -123,7 +138,7 @@ class ThresholdInfo:
         return f"{self.threshold_value:,.0f}"
 
 
-@dataclass
+@dataclass(slots=True)
 class IntervalThresholdInfo(ThresholdInfo):
     """
     区间市场信息（扩展自 ThresholdInfo）
@@ -215,6 +230,245 @@ class MonotonicityViolation:
         return f"阈值违背: {self.low_threshold:,.0f} vs {self.high_threshold:,.0f}"
 
 
+# 特殊格式阈值: "triple digits" 等（按顺序匹配，首个命中即返回）
+_DIGIT_WORD_THRESHOLDS = (
+    (re.compile(r'triple\s+digits?'), (100.0, ThresholdDirection.ABOVE)),      # >= $100
+    (re.compile(r'four\s+digits?'), (1_000.0, ThresholdDirection.ABOVE)),      # >= $1,000
+    (re.compile(r'five\s+digits?'), (10_000.0, ThresholdDirection.ABOVE)),     # >= $10,000
+    (re.compile(r'single\s+digit'), (10.0, ThresholdDirection.BELOW)),         # < $10
+    (re.compile(r'double\s+digits?'), (100.0, ThresholdDirection.BELOW)),      # < $100
+)
+
+
+# 单位后缀 -> 乘数（大小写均可，查表前不再做 lower/strip）
+_UNIT_MULTIPLIERS = {
+    'k': 1_000, 'K': 1_000,
+    'm': 1_000_000, 'M': 1_000_000,
+    'b': 1_000_000_000, 'B': 1_000_000_000,
+    't': 1_000_000_000_000, 'T': 1_000_000_000_000,
+}
+
+
+@lru_cache(maxsize=4096)
+def _parse_number(value_str: str, unit_str: str = "") -> float:
+    """
+    解析带单位的数值（如 "100,000" / "1.5" + "m"），无法解析时返回 0.0
+
+    阈值文本在各日期/各阶梯间高度重复（"100,000"、"95k" 等），按原始捕获串缓存，
+    重复值直接命中，不再经过逗号清理、float 转换和单位查表。
+    """
+    try:
+        base_value = float(value_str.replace(',', '') if ',' in value_str else value_str)
+    except ValueError:
+        return 0.0
+
+    if not unit_str:
+        return base_value
+
+    multiplier = _UNIT_MULTIPLIERS.get(unit_str)
+    if multiplier is None:
+        multiplier = _UNIT_MULTIPLIERS.get(unit_str.strip().lower(), 1)
+    return base_value * multiplier
+
+
+@lru_cache(maxsize=1)
+def _interval_parser():
+    """共享的区间解析器（导入并构造一次）；interval_parser_v2 不可用时返回 None"""
+    try:
+        from interval_parser_v2 import IntervalParser
+    except ImportError:
+        return None
+    return IntervalParser()
+
+
+@lru_cache(maxsize=4096)
+def _parse_interval_bounds(group_title: str, question: str) -> Optional[Tuple[float, float]]:
+    """
+    按 (groupItemTitle, question) 缓存的区间边界解析；无法解析时返回 None
+
+    同一组阈值市场在逐对检测中被反复解析，缓存后每个文本组合只解析一次。
+    """
+    parser = _interval_parser()
+    if parser is None:
+        return None
+    try:
+        # 优先从 groupItemTitle 解析，其次 question
+        for kwargs in (
+            {'group_item_title': group_title} if group_title else None,
+            {'question': question} if question else None,
+        ):
+            if kwargs is None:
+                continue
+            interval = parser.parse(**kwargs)
+            if interval and interval.type != 'unknown':
+                if interval.type == 'range':
+                    return (interval.lower, interval.upper)
+                elif interval.type == 'above':
+                    return (interval.lower, float('inf'))
+                elif interval.type == 'below':
+                    return (float('-inf'), interval.upper)
+    except Exception:
+        pass
+    return None
+
+
+def _threshold_key(value: Optional[float]) -> Optional[float]:
+    """
+    阈值量化为 6 位有效数字，用作分组/去重键
+
+    解析得到的浮点阈值可能存在微小误差（如 82000.0 与 82000.00001），
+    量化后视为同一档位，避免同一阈值被拆成多组重复检测。
+    """
+    if value is None:
+        return None
+    return float(f"{value:.6g}")
+
+
+def _inversion_pairs_py(prices: List[float], min_inversion: float, reverse: bool) -> List[Tuple[int, int]]:
+    """
+    找出阶梯中所有价格倒挂的下标对 (i, j)，i < j（纯 Python 实现）
+
+    reverse=False: prices[j] > prices[i] + min_inversion
+    reverse=True:  prices[i] > prices[j] + min_inversion
+    """
+    pairs = []
+    n = len(prices)
+    for i in range(n):
+        p_i = prices[i]
+        for j in range(i + 1, n):
+            p_j = prices[j]
+            if reverse:
+                if p_i > p_j + min_inversion:
+                    pairs.append((i, j))
+            elif p_j > p_i + min_inversion:
+                pairs.append((i, j))
+    return pairs
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _inversion_pairs_jit(prices, min_inversion, reverse):
+        """_inversion_pairs_py 的 Numba 版本，返回 (k, 2) 的下标数组"""
+        n = prices.size
+        out = np.empty((n * (n - 1) // 2, 2), dtype=np.int64)
+        k = 0
+        for i in range(n):
+            p_i = prices[i]
+            for j in range(i + 1, n):
+                p_j = prices[j]
+                if reverse:
+                    hit = p_i > p_j + min_inversion
+                else:
+                    hit = p_j > p_i + min_inversion
+                if hit:
+                    out[k, 0] = i
+                    out[k, 1] = j
+                    k += 1
+        return out[:k]
+
+
+def find_inversion_pairs(prices: List[float], min_inversion: float, reverse: bool = False) -> List[Tuple[int, int]]:
+    """
+    价格倒挂对扫描内核，安装了 numba 时使用 JIT 编译版本（cache=True，跨运行复用编译结果）
+
+    Returns:
+        按 (i, j) 字典序排列的下标对列表
+    """
+    if NUMBA_AVAILABLE and len(prices) >= 2:
+        pairs = _inversion_pairs_jit(np.asarray(prices, dtype=np.float64), min_inversion, reverse)
+        return [(int(i), int(j)) for i, j in pairs]
+    return _inversion_pairs_py(prices, min_inversion, reverse)
+
+
+# 组内区间数不超过该值时用 NumPy 成对矩阵（n² 个布尔元素，内存可忽略），
+# 更大的组走排序 + 二分的扫描，避免平方级内存
+INTERVAL_MATRIX_MAX = 512
+
+
+def _interval_candidate_pairs_np(
+    lowers: List[float],
+    uppers: List[float],
+    prices: List[float],
+    price_cap: float,
+) -> List[Tuple[int, int, bool]]:
+    """
+    find_interval_candidate_pairs 的 NumPy 版本
+
+    边界和价格打包成三个 float64 数组（SoA），包含/不相交/价格和条件
+    各用一次广播比较得到 n×n 矩阵，取上三角后按行主序输出，
+    顺序即 (i, j) 字典序。
+    """
+    lo = np.asarray(lowers, dtype=np.float64)
+    up = np.asarray(uppers, dtype=np.float64)
+    pr = np.asarray(prices, dtype=np.float64)
+
+    contains = (lo[:, None] <= lo[None, :]) & (up[:, None] >= up[None, :])
+    nested = contains ^ contains.T  # 恰有一方包含另一方（相同区间互相包含，排除）
+    disjoint = (up[:, None] < lo[None, :]) | (up[None, :] < lo[:, None])
+    over_cap = disjoint & ((pr[:, None] + pr[None, :]) > price_cap)
+
+    rows, cols = np.nonzero(np.triu(nested | over_cap, 1))
+    flags = nested[rows, cols]
+    return [(int(i), int(j), bool(f)) for i, j, f in zip(rows, cols, flags)]
+
+
+def find_interval_candidate_pairs(
+    lowers: List[float],
+    uppers: List[float],
+    prices: List[float],
+    price_cap: float,
+) -> List[Tuple[int, int, bool]]:
+    """
+    区间对候选扫描：只返回可能构成违背的下标对，替代全量 O(N²) 两两比较
+
+    区间按 (下界升序, 上界降序) 排序后：
+    - 包含区间 p 的子区间，下界必落在 [lower_p, upper_p]，用二分定位这一段；
+      排序保证段内区间下界不小于 lower_p（同下界时上界不大于 upper_p），
+      包含关系退化为一次上界比较 upper <= upper_p，重叠但互不包含的区间直接跳过；
+    - 下界大于 upper_p 的区间与 p 不相交，是排序数组的一段后缀，
+      配合后缀最大价格剪枝：price_p + 后缀最高价 <= price_cap 时整段跳过。
+
+    完全相同的区间互相包含，不构成约束，不返回。
+    numpy 可用且组不大时改用成对矩阵的向量化实现，结果相同。
+
+    Returns:
+        (i, j, nested) 列表，i < j 为原始下标，按 (i, j) 字典序排列；
+        nested=True 为严格包含对，False 为价格和超限的不相交对
+    """
+    n = len(lowers)
+    if NUMPY_AVAILABLE and 2 <= n <= INTERVAL_MATRIX_MAX:
+        return _interval_candidate_pairs_np(lowers, uppers, prices, price_cap)
+
+    order = sorted(range(n), key=lambda k: (lowers[k], -uppers[k]))
+    sorted_lowers = [lowers[k] for k in order]
+
+    # suffix_max[p]: 排序位置 p 及之后的最高价格
+    suffix_max = [0.0] * (n + 1)
+    suffix_max[n] = float('-inf')
+    for pos in range(n - 1, -1, -1):
+        suffix_max[pos] = max(prices[order[pos]], suffix_max[pos + 1])
+
+    pairs = []
+    for pos, a in enumerate(order):
+        lower_a, upper_a, price_a = lowers[a], uppers[a], prices[a]
+        split = bisect.bisect_right(sorted_lowers, upper_a)
+
+        # 包含候选：排序位置 (pos, split) 中上界不超过 upper_a 的区间
+        for b in order[pos + 1:split]:
+            upper_b = uppers[b]
+            if upper_b <= upper_a and (upper_b != upper_a or lowers[b] != lower_a):
+                pairs.append((a, b, True) if a < b else (b, a, True))
+
+        # 不相交候选：排序位置 [split, n)，仅在价格和可能超限时逐个检查
+        if split < n and price_a + suffix_max[split] > price_cap:
+            for b in order[split:]:
+                if price_a + prices[b] > price_cap:
+                    pairs.append((a, b, False) if a < b else (b, a, False))
+
+    pairs.sort()
+    return pairs
+
+
 class MonotonicityChecker:
     """
     单调性违背检测器
@@ -299,13 +553,17 @@ class MonotonicityChecker:
         (r'\$?([\d,]+(?:\.\d+)?)\s*(?:k|K|m|M|b|B|t|T)?\s*[-–to]\s*\$?([\d,]+(?:\.\d+)?)\s*(?:k|K|m|M|b|B|t|T)?', None),  # 特殊处理
     ]
 
-    # 单位换算（扩展支持）
-    UNIT_MULTIPLIERS = {
-        'k': 1_000, 'K': 1_000,
-        'm': 1_000_000, 'M': 1_000_000,
-        'b': 1_000_000_000, 'B': 1_000_000_000,
-        't': 1_000_000_000_000, 'T': 1_000_000_000_000,
+    # 预编译正则（类定义时编译一次，避免每个市场重复查询 re 模块缓存）
+    _ASSET_REGEXES = {
+        asset: tuple(re.compile(p) for p in patterns)
+        for asset, patterns in ASSET_PATTERNS.items()
     }
+    _THRESHOLD_REGEXES = tuple(
+        (re.compile(pattern), direction) for pattern, direction in THRESHOLD_PATTERNS
+    )
+
+    # 单位换算（扩展支持）
+    UNIT_MULTIPLIERS = _UNIT_MULTIPLIERS
 
     # 最小价格倒挂阈值（考虑交易成本）
     MIN_INVERSION_THRESHOLD = 0.005  # 0.5%
@@ -336,7 +594,10 @@ class MonotonicityChecker:
         Returns:
             ThresholdInfo 或 IntervalThresholdInfo，或 None（如果不是阈值市场）
         """
-        question = (getattr(market, 'question', None) or getattr(market, 'title', '')).lower()
+        # 优先复用 Market.question_lower 缓存，避免每次扫描重复分配小写字符串；
+        # 下游 _detect_asset / _extract_threshold 直接使用这份小写文本，不再各自 lower()
+        question = getattr(market, 'question_lower', None) or \
+            (getattr(market, 'question', None) or getattr(market, 'title', '')).lower()
 
         # 1. 识别资产
         asset = self._detect_asset(question)
@@ -351,7 +612,8 @@ class MonotonicityChecker:
         threshold_value, direction = threshold_result
 
         # 3. 根据方向类型构建相应的对象
-        end_date = market.end_date.split('T')[0] if market.end_date else ""
+        # 日期用作分组键，驻留后同日期的市场共享同一字符串对象
+        end_date = sys.intern(market.end_date.split('T')[0]) if market.end_date else ""
         yes_price = market.yes_price
         best_bid = getattr(market, 'best_bid', 0.0)
         best_ask = getattr(market, 'best_ask', 0.0)
@@ -411,74 +673,39 @@ class MonotonicityChecker:
         Returns:
             (lower, upper) 元组
         """
-        # 尝试使用 interval_parser_v2
-        try:
-            from interval_parser_v2 import IntervalParser
-            parser = IntervalParser()
-
-            # 优先从 groupItemTitle 解析
-            group_title = getattr(market, 'group_item_title', None) or getattr(market, 'groupItemTitle', None)
-            question = getattr(market, 'question', None) or getattr(market, 'title', '')
-
-            if group_title:
-                interval = parser.parse(group_item_title=group_title)
-                if interval and interval.type != 'unknown':
-                    if interval.type == 'range':
-                        return (interval.lower, interval.upper)
-                    elif interval.type == 'above':
-                        return (interval.lower, float('inf'))
-                    elif interval.type == 'below':
-                        return (float('-inf'), interval.upper)
-
-            if question:
-                interval = parser.parse(question=question)
-                if interval and interval.type != 'unknown':
-                    if interval.type == 'range':
-                        return (interval.lower, interval.upper)
-                    elif interval.type == 'above':
-                        return (interval.lower, float('inf'))
-                    elif interval.type == 'below':
-                        return (float('-inf'), interval.upper)
-        except Exception:
-            pass
+        group_title = getattr(market, 'group_item_title', None) or getattr(market, 'groupItemTitle', None)
+        question = getattr(market, 'question', None) or getattr(market, 'title', '')
+        bounds = _parse_interval_bounds(group_title or '', question or '')
+        if bounds is not None:
+            return bounds
 
         # 使用默认值
         return (default_lower, default_upper)
 
-    def _detect_asset(self, text: str) -> Optional[str]:
-        """检测文本中的资产类型"""
-        text_lower = text.lower()
-        for asset, patterns in self.ASSET_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
+    def _detect_asset(self, text_lower: str) -> Optional[str]:
+        """检测文本中的资产类型（text_lower 须已转为小写）"""
+        for asset, regexes in self._ASSET_REGEXES.items():
+            for regex in regexes:
+                if regex.search(text_lower):
                     return asset
         return None
 
-    def _extract_threshold(self, text: str) -> Optional[Tuple[float, ThresholdDirection]]:
+    def _extract_threshold(self, text_lower: str) -> Optional[Tuple[float, ThresholdDirection]]:
         """
-        提取阈值和方向（扩展版本，支持更多格式）
+        提取阈值和方向（扩展版本，支持更多格式），text_lower 须已转为小写
 
         特殊格式处理：
         - "triple digits" -> 100 (表示价格 >= $100)
         - "single digits" -> 10 (表示价格 < $10)
         - 区间格式 -> 返回 (lower_value, None) 表示需要特殊处理
         """
-        text_lower = text.lower()
-
         # 特殊格式：triple digits, four digits 等
-        if re.search(r'triple\s+digits?', text_lower):
-            return (100.0, ThresholdDirection.ABOVE)  # >= $100
-        if re.search(r'four\s+digits?', text_lower):
-            return (1_000.0, ThresholdDirection.ABOVE)  # >= $1,000
-        if re.search(r'five\s+digits?', text_lower):
-            return (10_000.0, ThresholdDirection.ABOVE)  # >= $10,000
-        if re.search(r'single\s+digit', text_lower):
-            return (10.0, ThresholdDirection.BELOW)  # < $10
-        if re.search(r'double\s+digits?', text_lower):
-            return (100.0, ThresholdDirection.BELOW)  # < $100
-
-        for pattern, direction in self.THRESHOLD_PATTERNS:
-            match = re.search(pattern, text_lower)
+        for regex, result in _DIGIT_WORD_THRESHOLDS:
+            if regex.search(text_lower):
+                return result
+
+        for regex, direction in self._THRESHOLD_REGEXES:
+            match = regex.search(text_lower)
             if match:
                 # 🆕 特殊处理：All Time High (ATH)
                 if 'all' in match.group(0) and 'high' in match.group(0):
@@ -498,19 +725,17 @@ class MonotonicityChecker:
                         continue
 
                 # 🆕 容错处理：确保至少有一个捕获组
-                try:
-                    value_str = match.group(1).replace(',', '')
-                    # 尝试获取单位捕获组 (通常是第2组)
-                    unit_str = ""
-                    if len(match.groups()) >= 2:
-                        unit_str = match.group(2) or ""
-                except IndexError:
+                groups = match.groups()
+                if not groups:
                     continue
+                value_str = groups[0]
+                # 尝试获取单位捕获组 (通常是第2组)
+                unit_str = (groups[1] or "") if len(groups) >= 2 else ""
 
-                if not value_str:
+                if not value_str or value_str.strip(',') == '':
                     continue
 
-                value = self._parse_value_with_unit(value_str, unit_str)
+                value = _parse_number(value_str, unit_str)
                 return (value, direction)
 
         return None
@@ -526,26 +751,15 @@ class MonotonicityChecker:
         Returns:
             解析后的数值
         """
-        try:
-            # 移除逗号并转为浮点数
-            base_value = float(value_str.replace(',', ''))
-        except ValueError:
-            return 0.0
-
-        if not unit_str:
-            return base_value
-
-        unit = unit_str.lower().strip()
-        multiplier = self.UNIT_MULTIPLIERS.get(unit, 1)
-
-        return base_value * multiplier
+        return _parse_number(value_str, unit_str)
 
     def _deduplicate_thresholds(self, threshold_infos: List[ThresholdInfo]) -> List[ThresholdInfo]:
         """
         去除重复阈值，保留流动性最好的（价格最高的，因为价格高意味着流动性好）
 
         对于相同的 (asset, end_date, direction, threshold_value)，
-        只保留 effective_price 最高的一个。
+        只保留 effective_price 最高的一个。阈值先经 _threshold_key 量化，
+        浮点误差造成的近似重复视为同一档位。
 
         Args:
             threshold_infos: ThresholdInfo 列表
@@ -562,15 +776,15 @@ class MonotonicityChecker:
                     info.asset,
                     info.end_date,
                     info.direction.value,
-                    info.interval_lower,
-                    info.interval_upper
+                    _threshold_key(info.interval_lower),
+                    _threshold_key(info.interval_upper)
                 )
             else:
                 key = (
                     info.asset,
                     info.end_date,
                     info.direction.value,
-                    info.threshold_value
+                    _threshold_key(info.threshold_value)
                 )
 
             # 保留 effective_price 更高的（流动性更好）
@@ -682,31 +896,21 @@ class MonotonicityChecker:
 
         violations = []
         direction = ladder[0].direction
+        prices = [info.effective_price for info in ladder]
 
         # 检测所有可能的阈值对 (i, j) where i < j
-        for i in range(len(ladder)):
-            for j in range(i + 1, len(ladder)):
-                low = ladder[i]
-                high = ladder[j]
-
-                low_price = low.effective_price
-                high_price = high.effective_price
-
-                # 检查单调性违背
-                if direction == ThresholdDirection.ABOVE:
-                    # ABOVE: P(X > k_high) 应该 <= P(X > k_low)
-                    if high_price > low_price + self.MIN_INVERSION_THRESHOLD:
-                        violation = self._create_violation(low, high, high_price - low_price)
-                        if violation:
-                            violations.append(violation)
-                else:
-                    # BELOW: P(X < k_high) 应该 >= P(X < k_low)
-                    # 对于 BELOW: k_i < k_j，应该 P(X < k_i) <= P(X < k_j)
-                    # 违背: P(X < k_i) > P(X < k_j)
-                    if low_price > high_price + self.MIN_INVERSION_THRESHOLD:
-                        violation = self._create_violation(high, low, low_price - high_price)
-                        if violation:
-                            violations.append(violation)
+        # ABOVE: P(X > k_high) 应该 <= P(X > k_low)，违背: high_price > low_price
+        # BELOW: 对于 k_i < k_j，应该 P(X < k_i) <= P(X < k_j)，违背: P(X < k_i) > P(X < k_j)
+        is_below = direction != ThresholdDirection.ABOVE
+        for i, j in find_inversion_pairs(prices, self.MIN_INVERSION_THRESHOLD, reverse=is_below):
+            low = ladder[i]
+            high = ladder[j]
+            if is_below:
+                violation = self._create_violation(high, low, prices[i] - prices[j])
+            else:
+                violation = self._create_violation(low, high, prices[j] - prices[i])
+            if violation:
+                violations.append(violation)
 
         # 按利润率排序
         violations.sort(key=lambda v: v.profit_pct, reverse=True)
@@ -731,37 +935,24 @@ class MonotonicityChecker:
         if len(ladder) < 2:
             return None
 
-        direction = ladder[0].direction
         best_violation = None
         max_profit = 0
-
-        for i in range(len(ladder)):
-            for j in range(i + 1, len(ladder)):
-                low = ladder[i]
-                high = ladder[j]
-
-                low_price = low.effective_price
-                high_price = high.effective_price
-
-                if direction == ThresholdDirection.ABOVE:
-                    # ABOVE: 违背时 high_price > low_price
-                    # 套利: 买入 low YES, 卖出 high YES
-                    # 利润 = 1 - (low_buy + high_no) = 1 - (low_price + (1 - high_price))
-                    #      = high_price - low_price
-                    if high_price > low_price + self.MIN_INVERSION_THRESHOLD:
-                        arb = self.calculate_arbitrage(low, high)
-                        if arb['profit_pct'] > max_profit:
-                            max_profit = arb['profit_pct']
-                            best_violation = self._create_violation(low, high, high_price - low_price)
-                else:
-                    # BELOW: P(X < k_low) >= P(X < k_high), 即 low_price >= high_price
-                    # 违背条件: high_price > low_price
-                    # 套利: 买入 low YES, 卖出 high YES
-                    if high_price > low_price + self.MIN_INVERSION_THRESHOLD:
-                        arb = self.calculate_arbitrage(low, high)
-                        if arb['profit_pct'] > max_profit:
-                            max_profit = arb['profit_pct']
-                            best_violation = self._create_violation(low, high, high_price - low_price)
+        prices = [info.effective_price for info in ladder]
+
+        # ABOVE: 违背时 high_price > low_price
+        #   套利: 买入 low YES, 卖出 high YES
+        #   利润 = 1 - (low_buy + high_no) = 1 - (low_price + (1 - high_price))
+        #        = high_price - low_price
+        # BELOW: P(X < k_low) >= P(X < k_high), 即 low_price >= high_price
+        #   违背条件: high_price > low_price
+        #   套利: 买入 low YES, 卖出 high YES
+        for i, j in find_inversion_pairs(prices, self.MIN_INVERSION_THRESHOLD):
+            low = ladder[i]
+            high = ladder[j]
+            arb = self.calculate_arbitrage(low, high)
+            if arb['profit_pct'] > max_profit:
+                max_profit = arb['profit_pct']
+                best_violation = self._create_violation(low, high, prices[j] - prices[i])
 
         return best_violation
 
@@ -890,20 +1081,40 @@ class MonotonicityChecker:
         Returns:
             所有违背列表，按利润率排序
         """
-        all_violations = []
+        # 1. 提取阈值市场（单次遍历按类型分桶）
+        buckets = self._extract_by_type(markets)
+        threshold_infos = buckets[MarketType.THRESHOLD]
+        interval_infos = buckets[MarketType.INTERVAL]
 
-        # 1. 提取阈值市场
-        threshold_infos = []
-        interval_infos = []
+        logger.info(f"从 {len(markets)} 个市场中提取了 {len(threshold_infos)} 个阈值市场, {len(interval_infos)} 个区间市场")
+
+        return self._scan_extracted(threshold_infos, interval_infos, detection_mode, multi_level)
+
+    def _extract_by_type(self, markets: List) -> Dict[MarketType, List[ThresholdInfo]]:
+        """
+        单次遍历提取市场信息，并按市场类型分桶
+
+        Returns:
+            {MarketType: [ThresholdInfo, ...]}，缺失的类型返回空列表
+        """
+        buckets = defaultdict(list)
         for market in markets:
             info = self.extract_threshold_info(market)
             if info:
-                if info.is_interval_market:
-                    interval_infos.append(info)
-                else:
-                    threshold_infos.append(info)
+                buckets[info.market_type].append(info)
+        return buckets
 
-        logger.info(f"从 {len(markets)} 个市场中提取了 {len(threshold_infos)} 个阈值市场, {len(interval_infos)} 个区间市场")
+    def _scan_extracted(
+        self,
+        threshold_infos: List[ThresholdInfo],
+        interval_infos: List[ThresholdInfo],
+        detection_mode: str = "all",
+        multi_level: bool = True
+    ) -> List[MonotonicityViolation]:
+        """
+        对已提取的阈值/区间市场执行检测（scan 的核心逻辑，供各 scan_* 复用，避免重复提取）
+        """
+        all_violations = []
 
         if len(threshold_infos) < 2:
             return all_violations
@@ -1035,6 +1246,10 @@ class MonotonicityChecker:
             套利: 买入区间 + 买入低于$80k + 买入高于$100k
         """
         violations = []
+        price_cap = 1.0 + self.MIN_INVERSION_THRESHOLD
+
+        # 阈值市场按 (资产, 日期) 一次性转为 SoA 布局，避免每个区间都全量扫描
+        soa_index = self._build_threshold_soa(threshold_markets)
 
         for interval in interval_markets:
             if not interval.is_interval_market:
@@ -1043,30 +1258,28 @@ class MonotonicityChecker:
             interval_lower = interval.interval_lower or 0
             interval_upper = interval.interval_upper or float('inf')
 
-            # 寻找相关的阈值市场
-            related_below = []
-            related_above = []
-
-            for tm in threshold_markets:
-                if tm.asset != interval.asset or tm.end_date != interval.end_date:
-                    continue
+            soa = soa_index.get((interval.asset, interval.end_date))
+            if soa is None:
+                continue
 
-                if tm.direction == ThresholdDirection.BELOW:
-                    # BELOW市场，检查是否与区间上界相关
-                    if tm.threshold_value <= interval_upper:
-                        related_below.append(tm)
-                elif tm.direction == ThresholdDirection.ABOVE:
-                    # ABOVE市场，检查是否与区间下界相关
-                    if tm.threshold_value >= interval_lower:
-                        related_above.append(tm)
+            interval_price = interval.effective_price
 
             # 检查完备集违背: P(区间) + P(下界以下) + P(上界以上) <= 1
             # 简化: P(区间) + P(X < interval_lower) <= 1 或 P(区间) + P(X > interval_upper) <= 1
+            # BELOW市场: 阈值 <= 区间上界；ABOVE市场: 阈值 >= 区间下界
+            related_below = self._select_soa(
+                soa[ThresholdDirection.BELOW], interval_price, price_cap,
+                upper=interval_upper,
+            )
+            related_above = self._select_soa(
+                soa[ThresholdDirection.ABOVE], interval_price, price_cap,
+                lower=interval_lower,
+            )
 
             # 检查与 BELOW 市场的违背
             for below_market in related_below:
-                total_prob = interval.effective_price + below_market.effective_price
-                if total_prob > 1.0 + self.MIN_INVERSION_THRESHOLD:
+                total_prob = interval_price + below_market.effective_price
+                if total_prob > price_cap:
                     # 违背: 区间 + 低于下界 > 100%
                     violation = self._create_interval_threshold_violation(
                         interval, below_market, "interval_below", total_prob - 1.0
@@ -1076,8 +1289,8 @@ class MonotonicityChecker:
 
             # 检查与 ABOVE 市场的违背
             for above_market in related_above:
-                total_prob = interval.effective_price + above_market.effective_price
-                if total_prob > 1.0 + self.MIN_INVERSION_THRESHOLD:
+                total_prob = interval_price + above_market.effective_price
+                if total_prob > price_cap:
                     # 违背: 区间 + 高于上界 > 100%
                     violation = self._create_interval_threshold_violation(
                         interval, above_market, "interval_above", total_prob - 1.0
@@ -1087,6 +1300,66 @@ class MonotonicityChecker:
 
         return violations
 
+    def _build_threshold_soa(self, threshold_markets: List[ThresholdInfo]) -> Dict[Tuple[str, str], Dict]:
+        """
+        将阈值市场转换为 SoA（Struct-of-Arrays）布局
+
+        按 (资产, 日期) 分组，每组按方向保存按阈值升序排列的阈值数组、有效价格数组、
+        原市场列表和输入顺序号。排序后每个区间只需二分定位候选切片，无需全量扫描。
+        numpy 可用时阈值/价格数组为 ndarray，否则为普通 list。
+
+        Returns:
+            {(asset, end_date): {direction: (thresholds, prices, infos, order)}}
+        """
+        grouped = defaultdict(lambda: {
+            ThresholdDirection.BELOW: [],
+            ThresholdDirection.ABOVE: [],
+        })
+        for pos, tm in enumerate(threshold_markets):
+            if tm.direction not in (ThresholdDirection.BELOW, ThresholdDirection.ABOVE):
+                continue
+            grouped[(tm.asset, tm.end_date)][tm.direction].append((tm.threshold_value, pos, tm))
+
+        soa_index = {}
+        for key, by_direction in grouped.items():
+            soa_index[key] = {}
+            for direction, rows in by_direction.items():
+                rows.sort(key=lambda row: (row[0], row[1]))
+                thresholds = [row[0] for row in rows]
+                prices = [row[2].effective_price for row in rows]
+                if NUMPY_AVAILABLE:
+                    thresholds = np.asarray(thresholds, dtype=np.float64)
+                    prices = np.asarray(prices, dtype=np.float64)
+                soa_index[key][direction] = (
+                    thresholds, prices, [row[2] for row in rows], [row[1] for row in rows]
+                )
+
+        return soa_index
+
+    @staticmethod
+    def _select_soa(soa: Tuple, base_price: float, price_cap: float,
+                    lower: float = None, upper: float = None) -> List[ThresholdInfo]:
+        """
+        在 SoA 上二分定位阈值范围 [lower, upper]，再按价格和筛选
+
+        只返回 base_price + 价格 > price_cap 的市场，顺序与输入一致。
+        """
+        thresholds, prices, infos, order = soa
+        if not infos:
+            return []
+
+        if NUMPY_AVAILABLE:
+            lo = int(np.searchsorted(thresholds, lower, side='left')) if lower is not None else 0
+            hi = int(np.searchsorted(thresholds, upper, side='right')) if upper is not None else len(infos)
+            hits = lo + np.flatnonzero((base_price + prices[lo:hi]) > price_cap)
+        else:
+            lo = bisect.bisect_left(thresholds, lower) if lower is not None else 0
+            hi = bisect.bisect_right(thresholds, upper) if upper is not None else len(infos)
+            hits = [k for k in range(lo, hi) if base_price + prices[k] > price_cap]
+
+        # 恢复输入顺序（命中数通常很少）
+        return [infos[k] for k in sorted(hits, key=order.__getitem__)]
+
     def _create_interval_threshold_violation(
         self,
         interval: ThresholdInfo,
@@ -1202,16 +1475,9 @@ class MonotonicityChecker:
             所有违背列表（包括阈值违背和区间违背）
         """
         # 1. 分别提取区间市场和阈值市场
-        interval_markets = []
-        threshold_markets = []
-
-        for market in markets:
-            info = self.extract_threshold_info(market)
-            if info:
-                if info.is_interval_market:
-                    interval_markets.append(info)
-                else:
-                    threshold_markets.append(info)
+        buckets = self._extract_by_type(markets)
+        interval_markets = buckets[MarketType.INTERVAL]
+        threshold_markets = buckets[MarketType.THRESHOLD]
 
         logger.info(f"从 {len(markets)} 个市场中提取了 {len(interval_markets)} 个区间市场和 {len(threshold_markets)} 个阈值市场")
 
@@ -1219,7 +1485,7 @@ class MonotonicityChecker:
 
         # 2. 传统阈值违背检测（多级）
         if len(threshold_markets) >= 2:
-            threshold_violations = self.scan_multi_level(markets)
+            threshold_violations = self._scan_extracted(threshold_markets, interval_markets)
             all_violations.extend(threshold_violations)
 
         # 3. 区间-阈值混合检测
@@ -1267,47 +1533,46 @@ class MonotonicityChecker:
                 groups[key] = []
             groups[key].append(interval)
 
+        min_inversion = self.MIN_INVERSION_THRESHOLD
+        price_cap = 1.0 + min_inversion
+
         for (asset, end_date), group_intervals in groups.items():
-            if len(group_intervals) < 2:
+            n = len(group_intervals)
+            if n < 2:
                 continue
 
-            # 检查所有区间对
-            for i in range(len(group_intervals)):
-                for j in range(i + 1, len(group_intervals)):
-                    int1 = group_intervals[i]
-                    int2 = group_intervals[j]
+            # 边界和价格每个区间只计算一次（热路径只访问这三个数组），
+            # ThresholdInfo 对象仅在确认违背、生成记录时才访问
+            lowers = [iv.interval_lower or 0 for iv in group_intervals]
+            uppers = [iv.interval_upper or float('inf') for iv in group_intervals]
+            prices = [iv.effective_price for iv in group_intervals]
 
-                    # 确保区间边界已提取
-                    lower1 = int1.interval_lower or 0
-                    upper1 = int1.interval_upper or float('inf')
-                    lower2 = int2.interval_lower or 0
-                    upper2 = int2.interval_upper or float('inf')
+            # 只检查严格包含或价格和超限的候选对（区间索引剪掉其余无关对）
+            for i, j, nested in find_interval_candidate_pairs(lowers, uppers, prices, price_cap):
+                lower1, upper1, price1 = lowers[i], uppers[i], prices[i]
+                lower2, upper2, price2 = lowers[j], uppers[j], prices[j]
 
-                    # 检查包含关系
-                    int1_contains_int2 = (lower1 <= lower2 and upper1 >= upper2)
-                    int2_contains_int1 = (lower2 <= lower1 and upper2 >= upper1)
-
-                    if int1_contains_int2 and not int2_contains_int1:
+                if nested:
+                    # 严格包含：只需判断方向
+                    if lower1 <= lower2 and upper1 >= upper2:
                         # 区间1包含区间2，应该 P(int2) <= P(int1)
-                        if int2.effective_price > int1.effective_price + self.MIN_INVERSION_THRESHOLD:
+                        if price2 > price1 + min_inversion:
                             violations.append(self._create_interval_interval_violation(
-                                int1, int2, "containment", int2.effective_price - int1.effective_price
+                                group_intervals[i], group_intervals[j], "containment", price2 - price1
                             ))
-                    elif int2_contains_int1 and not int1_contains_int2:
+                    else:
                         # 区间2包含区间1，应该 P(int1) <= P(int2)
-                        if int1.effective_price > int2.effective_price + self.MIN_INVERSION_THRESHOLD:
+                        if price1 > price2 + min_inversion:
                             violations.append(self._create_interval_interval_violation(
-                                int2, int1, "containment", int1.effective_price - int2.effective_price
+                                group_intervals[j], group_intervals[i], "containment", price1 - price2
                             ))
-
-                    # 检查完备集约束（不相交的区间）
+                else:
+                    # 完备集约束（不相交的区间）
                     # 如果区间不相交，P(A) + P(B) 应该 <= 1（因为两者不能同时发生）
-                    if upper1 < lower2 or upper2 < lower1:
-                        total_prob = int1.effective_price + int2.effective_price
-                        if total_prob > 1.0 + self.MIN_INVERSION_THRESHOLD:
-                            violations.append(self._create_interval_interval_violation(
-                                int1, int2, "completeness", total_prob - 1.0
-                            ))
+                    total_prob = price1 + price2
+                    violations.append(self._create_interval_interval_violation(
+                        group_intervals[i], group_intervals[j], "completeness", total_prob - 1.0
+                    ))
 
         return violations
 
@@ -1452,7 +1717,7 @@ class MonotonicityChecker:
         for tm in threshold_markets:
             if tm.direction == ThresholdDirection.ABOVE or tm.direction == ThresholdDirection.BELOW:
                 # 使用 (asset, threshold_value, direction) 作为键
-                key = (tm.asset, tm.threshold_value, tm.direction.value)
+                key = (tm.asset, _threshold_key(tm.threshold_value), tm.direction.value)
                 groups[key].append(tm)
 
         # 检查每组内的时间违背
@@ -1584,19 +1849,16 @@ class MonotonicityChecker:
             所有违背列表（包括阈值违背和时间违背）
         """
         # 1. 提取阈值市场
-        threshold_infos = []
-        for market in markets:
-            info = self.extract_threshold_info(market)
-            if info and info.market_type == MarketType.THRESHOLD:
-                threshold_infos.append(info)
+        buckets = self._extract_by_type(markets)
+        threshold_infos = buckets[MarketType.THRESHOLD]
 
         logger.info(f"从 {len(markets)} 个市场中提取了 {len(threshold_infos)} 个阈值市场")
 
         if len(threshold_infos) < 2:
             return []
 
-        # 2. 传统阈值违背检测（多级）
-        threshold_violations = self.scan_multi_level(markets)
+        # 2. 传统阈值违背检测（多级，复用已提取结果）
+        threshold_violations = self._scan_extracted(threshold_infos, buckets[MarketType.INTERVAL])
 
         # 3. 时间违背检测
         temporal_violations = self.check_temporal_violations(threshold_infos)
@@ -1756,7 +2018,8 @@ if __name__ == "__main__":
 
     print("\n阈值提取测试:")
     for q in test_questions:
-        result = checker._extract_threshold(q.lower())
-        asset = checker._detect_asset(q.lower())
+        q_lower = q.lower()
+        result = checker._extract_threshold(q_lower)
+        asset = checker._detect_asset(q_lower)
         print(f"  {q}")
         print(f"    -> 资产: {asset}, 阈值: {result}")
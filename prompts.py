@@ -14,9 +14,15 @@ Polymarket 套利系统 - Prompt工程模块
 5. 边界情况分析 - 引导深入分析例外情况
 """
 
+import re
 from typing import Dict, Optional
 from dataclasses import dataclass
 
+# 市场描述中的连续空白（换行、缩进、制表符）压缩为单个空格
+_WHITESPACE_RE = re.compile(r"\s+")
+# 描述字段的最大长度（字符）
+DESCRIPTION_MAX_CHARS = 800
+
 # ============================================================
 # Prompt模板 v2 - 优化版
 # ============================================================
@@ -24,25 +30,7 @@ from dataclasses import dataclass
 RELATIONSHIP_ANALYSIS_PROMPT_V2 = """你是一位预测市场套利分析专家，专门识别Polymarket上市场之间的逻辑关系。
 
 ## 任务
-分析以下两个预测市场之间是否存在可利用的逻辑关系。
-
-## 市场信息
-
-### 市场A
-- **问题**: {question_a}
-- **描述**: {description_a}
-- **YES价格**: ${price_a:.3f} (即市场认为有{prob_a:.1f}%概率发生)
-- **结算日期**: {end_date_a}
-- **所属事件**: {event_id_a}
-- **结算来源**: {source_a}
-
-### 市场B
-- **问题**: {question_b}
-- **描述**: {description_b}
-- **YES价格**: ${price_b:.3f} (即市场认为有{prob_b:.1f}%概率发生)
-- **结算日期**: {end_date_b}
-- **所属事件**: {event_id_b}
-- **结算来源**: {source_b}
+分析文末「市场信息」中的两个预测市场之间是否存在可利用的逻辑关系。
 
 ## 逻辑关系类型定义
 
@@ -146,6 +134,26 @@ RELATIONSHIP_ANALYSIS_PROMPT_V2 = """你是一位预测市场套利分析专家
   "arbitrage_notes": "套利可行性说明"
 }}
 ```
+
+---
+
+## 市场信息
+
+### 市场A
+- **问题**: {question_a}
+- **描述**: {description_a}
+- **YES价格**: ${price_a:.3f} (即市场认为有{prob_a:.1f}%概率发生)
+- **结算日期**: {end_date_a}
+- **所属事件**: {event_id_a}
+- **结算来源**: {source_a}
+
+### 市场B
+- **问题**: {question_b}
+- **描述**: {description_b}
+- **YES价格**: ${price_b:.3f} (即市场认为有{prob_b:.1f}%概率发生)
+- **结算日期**: {end_date_b}
+- **所属事件**: {event_id_b}
+- **结算来源**: {source_b}
 """
 
 
@@ -153,21 +161,13 @@ RELATIONSHIP_ANALYSIS_PROMPT_V2 = """你是一位预测市场套利分析专家
 # 完备集验证Prompt
 # ============================================================
 
-EXHAUSTIVE_SET_VERIFICATION_PROMPT = """你是一位预测市场分析专家，请验证以下市场组是否构成一个完备集。
+EXHAUSTIVE_SET_VERIFICATION_PROMPT = """你是一位预测市场分析专家，请验证文末的市场组是否构成一个完备集。
 
 ## 什么是完备集？
 完备集是一组市场，满足：
 1. **互斥性**: 任意两个市场不能同时为YES
 2. **完备性**: 所有可能的结果都被覆盖，必有且仅有一个市场最终为YES
 
-## 需要验证的市场组
-
-事件: {event_title}
-
-{markets_list}
-
-总YES价格: ${total_price:.4f}
-
 ## 分析要点
 
 1. **互斥性检查**: 这些选项是否真的互斥？有没有可能两个同时发生？
@@ -190,6 +190,16 @@ EXHAUSTIVE_SET_VERIFICATION_PROMPT = """你是一位预测市场分析专家，
   "arbitrage_safe": true或false
 }}
 ```
+
+---
+
+## 需要验证的市场组
+
+事件: {event_title}
+
+{markets_list}
+
+总YES价格: ${total_price:.4f}
 """
 
 
@@ -197,10 +207,7 @@ EXHAUSTIVE_SET_VERIFICATION_PROMPT = """你是一位预测市场分析专家，
 # 简化版Prompt（用于成本敏感场景）
 # ============================================================
 
-RELATIONSHIP_ANALYSIS_PROMPT_LITE = """分析两个预测市场的逻辑关系：
-
-市场A: {question_a} (YES=${price_a:.2f})
-市场B: {question_b} (YES=${price_b:.2f})
+RELATIONSHIP_ANALYSIS_PROMPT_LITE = """分析文末两个预测市场的逻辑关系。
 
 关系类型：
 1. IMPLIES_AB: A发生→B必发生 (约束P(B)≥P(A))
@@ -214,6 +221,11 @@ RELATIONSHIP_ANALYSIS_PROMPT_LITE = """分析两个预测市场的逻辑关系
 ```json
 {{"relationship": "类型", "confidence": 0.0-1.0, "reasoning": "原因", "constraint_violated": true/false}}
 ```
+
+---
+
+市场A: {question_a} (YES=${price_a:.2f})
+市场B: {question_b} (YES=${price_b:.2f})
 """
 
 
@@ -229,6 +241,18 @@ class PromptConfig:
     include_cot: bool = True  # 链式思考
 
 
+def compact_description(text: str, max_chars: int = DESCRIPTION_MAX_CHARS) -> str:
+    """
+    压缩市场描述：合并连续空白后截断
+
+    Polymarket 的 rules 文本常带大量换行和缩进，这些字符同样计入输入 token；
+    先合并空白再截断，相同长度限制内能容纳更多有效的结算规则。
+    """
+    if not text:
+        return ""
+    return _WHITESPACE_RE.sub(" ", text).strip()[:max_chars]
+
+
 def get_analysis_prompt(config: PromptConfig = None) -> str:
     """获取分析Prompt"""
     if config is None:
@@ -264,7 +288,7 @@ def format_analysis_prompt(
 
         # 优先级: event_description > market_description > description
         full_desc = event_desc or market_desc or legacy_desc
-        return full_desc[:800]  # 增加长度限制以容纳更多rules信息
+        return compact_description(full_desc)
 
     # 根据版本选择格式化参数
     if config and config.version == "lite":
@@ -316,31 +340,93 @@ def format_exhaustive_prompt(
 
 
 # ============================================================
-# 找碴验证Prompt (Devil's Advocate) - v1.3新增
+# 分组关系分析Prompt（一个参考市场 vs 多个候选市场）
 # ============================================================
 
-DEVILS_ADVOCATE_PROMPT = """你是一位预测市场的风险分析专家，专门负责"找碴" - 寻找套利策略可能失败的原因。
+GROUPED_RELATIONSHIP_PROMPT = """你是一位预测市场套利分析专家。文末给出一个参考市场B和若干候选市场，
+请逐一判断每个候选市场（作为市场A）与参考市场B之间的逻辑关系。
 
-## 背景
-我们的系统认为市场A和市场B之间存在以下逻辑关系：
-**{relationship}**
+## 关系类型
+1. IMPLIES_AB: 候选A发生→参考B必发生 (约束P(B)≥P(A))
+2. IMPLIES_BA: 参考B发生→候选A必发生 (约束P(A)≥P(B))
+3. EQUIVALENT: A≡B，同一事件的不同表述
+4. MUTUAL_EXCLUSIVE: A、B不能同时发生
+5. EXHAUSTIVE: 同一完备集的成员
+6. UNRELATED: 无可利用的逻辑关系
 
-这意味着如果策略正确，我们可以通过买卖这两个市场来获得无风险利润。
+## 注意
+- 每个候选独立判断，不要因为其他候选的结论影响当前判断
+- 检查结算日期：蕴含关系要求被蕴含市场的结算不早于前提市场
+- 检查阈值、时间范围、结算来源等细节差异，不确定时降低置信度
 
-## 市场信息
+## 输出格式
+请严格按以下JSON格式回答（不要包含其他内容），candidates 中每个候选市场一项，index 与文末编号一致：
+```json
+{{
+  "candidates": [
+    {{
+      "index": 0,
+      "relationship": "类型",
+      "confidence": 0.0到1.0,
+      "reasoning": "分析理由",
+      "probability_constraint": "约束表达式",
+      "edge_cases": ["边界情况"],
+      "resolution_compatible": true或false
+    }}
+  ]
+}}
+```
 
-### 市场A
-- **问题**: {question_a}
-- **YES价格**: ${price_a:.3f}
-- **结算日期**: {end_date_a}
-- **结算来源**: {source_a}
+---
 
-### 市场B
+## 参考市场B
 - **问题**: {question_b}
+- **描述**: {description_b}
 - **YES价格**: ${price_b:.3f}
 - **结算日期**: {end_date_b}
 - **结算来源**: {source_b}
 
+## 候选市场
+{candidates_list}
+"""
+
+
+def format_grouped_analysis_prompt(reference: Dict, candidates: list) -> str:
+    """
+    格式化分组关系分析Prompt
+
+    Args:
+        reference: 参考市场（市场B）字典，字段同 format_analysis_prompt
+        candidates: 候选市场（市场A）字典列表，编号即列表下标
+    """
+    candidates_list = "\n".join(
+        f"[{i}] {m.get('question', '')} | YES=${m.get('yes_price', 0.5):.3f}"
+        f" | 结算日期: {m.get('end_date', '未指定')} | 结算来源: {m.get('resolution_source', '未指定')}\n"
+        f"    描述: {compact_description(m.get('description', '')) or '无'}"
+        for i, m in enumerate(candidates)
+    )
+
+    return GROUPED_RELATIONSHIP_PROMPT.format(
+        question_b=reference.get("question", ""),
+        description_b=compact_description(reference.get("description", "")),
+        price_b=reference.get("yes_price", 0.5),
+        end_date_b=reference.get("end_date", "未指定"),
+        source_b=reference.get("resolution_source", "未指定"),
+        candidates_list=candidates_list,
+    )
+
+
+# ============================================================
+# 找碴验证Prompt (Devil's Advocate) - v1.3新增
+# ============================================================
+
+DEVILS_ADVOCATE_PROMPT = """你是一位预测市场的风险分析专家，专门负责"找碴" - 寻找套利策略可能失败的原因。
+
+## 背景
+我们的系统认为市场A和市场B之间存在某种逻辑关系（关系类型和市场信息见文末）。
+
+这意味着如果策略正确，我们可以通过买卖这两个市场来获得无风险利润。
+
 ## 你的任务
 
 **假设我们的关系判断是正确的**，请深入思考：有哪些情况可能导致"A发生但B没有结算为YES"（或反过来）？
@@ -353,7 +439,7 @@ DEVILS_ADVOCATE_PROMPT = """你是一位预测市场的风险分析专家，专
 - 对"发生"的定义是否有细微差别？
 
 ### 2. 时间窗口差异 [关键检查！]
-- **结算日期对比**：市场A结算日期={end_date_a}，市场B结算日期={end_date_b}
+- **结算日期对比**：对比文末给出的市场A与市场B结算日期
 - **时区问题**：两市场是否使用不同时区？(UTC vs EST vs 本地时间)
 - **蕴含关系规则**：
   - 如果 A→B (A蕴含B)，则 B的结算时间必须 >= A的结算时间
@@ -380,7 +466,7 @@ DEVILS_ADVOCATE_PROMPT = """你是一位预测市场的风险分析专家，专
 
 ```json
 {{
-  "relationship_challenged": "{relationship}",
+  "relationship_challenged": "被质疑的关系类型（即文末给出的关系）",
   "overall_risk_level": "low|medium|high|critical",
   "failure_scenarios": [
     {{
@@ -412,14 +498,29 @@ DEVILS_ADVOCATE_PROMPT = """你是一位预测市场的风险分析专家，专
 ```
 
 注意：你的任务是找问题，不是确认安全。请尽可能挑剔地分析。
-"""
 
+---
 
-DEVILS_ADVOCATE_PROMPT_LITE = """作为风险分析专家，请找出以下套利策略可能失败的原因：
+## 待质疑的关系
+**{relationship}**
 
-关系: {relationship}
-市场A: {question_a} (YES=${price_a:.2f})
-市场B: {question_b} (YES=${price_b:.2f})
+## 市场信息
+
+### 市场A
+- **问题**: {question_a}
+- **YES价格**: ${price_a:.3f}
+- **结算日期**: {end_date_a}
+- **结算来源**: {source_a}
+
+### 市场B
+- **问题**: {question_b}
+- **YES价格**: ${price_b:.3f}
+- **结算日期**: {end_date_b}
+- **结算来源**: {source_b}
+"""
+
+
+DEVILS_ADVOCATE_PROMPT_LITE = """作为风险分析专家，请找出文末套利策略可能失败的原因。
 
 问题：有哪些情况可能导致"A发生但B没结算为YES"？
 
@@ -429,6 +530,12 @@ DEVILS_ADVOCATE_PROMPT_LITE = """作为风险分析专家，请找出以下套
 ```json
 {{"risk_level": "low/medium/high", "failure_scenarios": ["场景1", "场景2"], "recommendation": "proceed/avoid/review", "summary": "总结"}}
 ```
+
+---
+
+关系: {relationship}
+市场A: {question_a} (YES=${price_a:.2f})
+市场B: {question_b} (YES=${price_b:.2f})
 """
 
 
@@ -458,18 +565,7 @@ def format_devils_advocate_prompt(
 # 多模型投票Prompt - v1.3新增
 # ============================================================
 
-SECOND_OPINION_PROMPT = """你是一位独立的预测市场分析师。另一位分析师对两个市场做了以下判断，请提供你的独立意见。
-
-## 市场信息
-
-市场A: {question_a} (YES=${price_a:.2f})
-市场B: {question_b} (YES=${price_b:.2f})
-
-## 第一位分析师的判断
-
-- **关系类型**: {first_relationship}
-- **置信度**: {first_confidence}
-- **理由**: {first_reasoning}
+SECOND_OPINION_PROMPT = """你是一位独立的预测市场分析师。另一位分析师对两个市场做了判断（市场信息和判断见文末），请提供你的独立意见。
 
 ## 你的任务
 
@@ -490,6 +586,19 @@ SECOND_OPINION_PROMPT = """你是一位独立的预测市场分析师。另一
   "combined_confidence": 0.0到1.0
 }}
 ```
+
+---
+
+## 市场信息
+
+市场A: {question_a} (YES=${price_a:.2f})
+市场B: {question_b} (YES=${price_b:.2f})
+
+## 第一位分析师的判断
+
+- **关系类型**: {first_relationship}
+- **置信度**: {first_confidence}
+- **理由**: {first_reasoning}
 """
 
 
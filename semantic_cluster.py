@@ -20,16 +20,22 @@
 """
 
 import sys
+import re
 import json
+import threading
 import numpy as np
 import requests
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
 
 # UTF-8编码说明：所有输出使用ASCII字符，无需特殊编码处理
 
 
+# 聚类套利分析中的市场形态关键词
+_MARKET_SHAPE_RE = re.compile(r"above|below|less than|between|up or down")
+
+
 @dataclass
 class MarketInfo:
     """市场信息"""
@@ -94,8 +100,16 @@ class SemanticClusterer:
         """获取单个文本的向量嵌入"""
         return self.get_embeddings([text])[0]
 
-    def get_embeddings(self, texts: List[str]) -> np.ndarray:
-        """批量获取文本向量嵌入 (带重试逻辑)"""
+    def get_embeddings(self, texts: List[str], allow_fallback: bool = True,
+                       retry: bool = True) -> np.ndarray:
+        """批量获取文本向量嵌入 (带重试逻辑)
+
+        Args:
+            allow_fallback: API 失败时是否用字符分布特征向量代替；
+                为 False 时抛出 RuntimeError（需要真实语义向量的场景）
+            retry: 为 False 时每批只请求一次，且不做请求前的节流等待
+                （用于可随时放弃的可选路径，如 LLM 结果语义缓存）
+        """
         import time
         url = f"{self.api_base}/embeddings"
         batch_size = 10
@@ -110,15 +124,16 @@ class SemanticClusterer:
             }
 
             success = False
-            for attempt in range(3):
+            attempts = 3 if retry else 1
+            for attempt in range(attempts):
                 try:
                     # 🆕 增加基础延迟，避免触发 API 防御 (Phase 5.4 修复)
                     if attempt > 0:
                         time.sleep(2 ** attempt)
-                    else:
+                    elif retry:
                         time.sleep(0.5) # 基础间隔 500ms
 
-                    response = self.session.post(url, json=payload, timeout=20)
+                    response = self.session.post(url, json=payload, timeout=20 if retry else 5)
 
                     if response.status_code == 429: # Rate limit
                         continue
@@ -130,11 +145,13 @@ class SemanticClusterer:
                     success = True
                     break
                 except Exception as e:
-                    if attempt < 2:
+                    if attempt < attempts - 1:
                         continue
                     print(f"Embedding API error on batch {i}: {e}")
 
             if not success:
+                if not allow_fallback:
+                    raise RuntimeError(f"Embedding API 请求失败 (batch {i})")
                 # 🆕 局部降级: 如果 API 失败，为该批次生成简单的特征向量 (保底)
                 print(f"Using fallback features for batch {i}")
                 for t in batch:
@@ -324,13 +341,15 @@ class SemanticClusterer:
                 'slug': m.get('slug', '')
             }
 
-            if 'above' in q:
+            # 一次扫描找出全部形态关键词，再按 above > below > between > up or down 的优先级归类
+            shapes = set(_MARKET_SHAPE_RE.findall(q))
+            if 'above' in shapes:
                 above_markets.append(market_info)
-            elif 'below' in q or 'less than' in q:
+            elif 'below' in shapes or 'less than' in shapes:
                 below_markets.append(market_info)
-            elif 'between' in q:
+            elif 'between' in shapes:
                 range_markets.append(market_info)
-            elif 'up or down' in q:
+            elif 'up or down' in shapes:
                 updown_markets.append(market_info)
 
             result['markets'].append(market_info)
@@ -346,3 +365,189 @@ class SemanticClusterer:
         return result
 
 
+# 数字片段（阈值、日期等）：数字不同的问题语义向量仍可能非常接近，缓存命中要求完全一致
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+class SemanticAnalysisCache:
+    """
+    市场对分析结果的语义缓存
+
+    换一种说法描述同一事件的市场对（如 "Will Trump win 2024?" 与
+    "Will Donald Trump be elected president in 2024?"）复用已有的 LLM 分析结果。
+    命中条件：
+    - A、A' 与 B、B' 的余弦相似度都不低于 threshold（分别比较，保留 A/B 方向）
+    - 两侧问题中的数字片段、两侧结算日期完全一致
+    - 条目未超过 ttl；问题完全相同的同一市场对，描述指纹也须一致
+      （规则改动后不复用旧分析）
+    向量获取失败时不查询也不写入（不使用字符分布降级向量）
+
+    向量获取不节流、不重试：失败后 EMBED_COOLDOWN 秒内直接视为未命中，
+    避免 Embedding 接口故障时每个市场对都付出超时代价。
+    analyze_many 开始前可调用 prime() 把本批问题合并成一次 Embedding 请求。
+
+    条目按 (数字片段, 结算日期) 分组，每组的向量堆叠成矩阵后一次矩阵乘法算出全部相似度；
+    锁内只取快照，矩阵运算在锁外进行（numpy 运算期间释放 GIL），
+    不会让 analyze_many 的并发线程在缓存查询上排队。
+
+    问题向量为有界 LRU（max_entries * 2），淘汰条目时同步清理不再被引用的向量，
+    长时间运行时内存不随查询过的问题数增长。
+    """
+
+    EMBED_COOLDOWN = 60.0  # Embedding 请求失败后的冷却时间（秒）
+
+    def __init__(self, clusterer: SemanticClusterer, threshold: float = 0.95,
+                 max_entries: int = 2000, ttl: float = 3600):
+        self.clusterer = clusterer
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # 问题 -> 归一化向量（LRU，容量 max_entries * 2，即全部条目两侧问题的上限）
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._max_vectors = max(2, max_entries * 2)
+        self._refs: Dict[str, int] = defaultdict(int)  # 问题 -> 引用它的缓存条目数
+        # 分组键 -> {"a"/"b": 向量列表, "results": 结果列表, "mats": 堆叠矩阵缓存或 None,
+        #            "qa"/"qb": 问题列表, "fp": 描述指纹列表}
+        self._groups: Dict[Tuple, Dict[str, list]] = {}
+        # 按写入顺序记录 (分组键, 过期时间)，用于按容量/TTL 淘汰最早条目（ttl 固定，写入顺序即过期顺序）
+        self._order: deque = deque()
+        self._embed_blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _embed(self, questions: List[str]) -> Dict[str, np.ndarray]:
+        """获取并缓存归一化向量（单次请求、不节流不重试；冷却期内或失败时抛出 RuntimeError）"""
+        import time
+        if time.monotonic() < self._embed_blocked_until:
+            raise RuntimeError("Embedding 接口冷却中")
+        try:
+            embeddings = self.clusterer.get_embeddings(questions, allow_fallback=False, retry=False)
+        except Exception:
+            self._embed_blocked_until = time.monotonic() + self.EMBED_COOLDOWN
+            raise
+        fetched = {}
+        for q, raw in zip(questions, embeddings):
+            vec = np.asarray(raw, dtype=np.float64)
+            norm = np.linalg.norm(vec)
+            fetched[q] = vec / norm if norm else vec
+        if len(fetched) != len(questions):
+            raise RuntimeError("Embedding 返回数量不符")
+        with self.lock:
+            for q, vec in fetched.items():
+                self._vectors[q] = vec
+                self._vectors.move_to_end(q)
+            while len(self._vectors) > self._max_vectors:
+                self._vectors.popitem(last=False)
+        return fetched
+
+    def prime(self, questions) -> None:
+        """预取一批问题的向量（合并为一次 Embedding 请求；失败时静默跳过）"""
+        with self.lock:
+            missing = [q for q in dict.fromkeys(questions) if q not in self._vectors]
+        missing = missing[:self._max_vectors]
+        if missing:
+            try:
+                self._embed(missing)
+            except Exception:
+                pass
+
+    def _pair_vectors(self, question_a: str, question_b: str) -> Tuple[np.ndarray, np.ndarray]:
+        """取两侧问题的归一化向量；缺失的向量合并为一次 embeddings 请求获取"""
+        pair = (question_a, question_b)
+        with self.lock:
+            cached = [self._vectors.get(q) for q in pair]
+            for q, vec in zip(pair, cached):
+                if vec is not None:
+                    self._vectors.move_to_end(q)
+
+        missing = list(dict.fromkeys(q for q, vec in zip(pair, cached) if vec is None))
+        if missing:
+            fetched = self._embed(missing)
+            cached = [vec if vec is not None else fetched[q] for q, vec in zip(pair, cached)]
+        return cached[0], cached[1]
+
+    @staticmethod
+    def _group_key(question_a: str, question_b: str, end_dates: Tuple) -> Tuple:
+        return (tuple(_NUMBER_RE.findall(question_a)), tuple(_NUMBER_RE.findall(question_b)), tuple(end_dates))
+
+    def get(self, question_a: str, question_b: str, end_dates: Tuple = (),
+            fingerprint: int = 0) -> Optional[Dict]:
+        """返回最相近的已缓存分析结果，未命中返回 None"""
+        import time
+        key = self._group_key(question_a, question_b, end_dates)
+        with self.lock:
+            self._evict_expired(time.monotonic())
+            if key not in self._groups:
+                return None
+        try:
+            vec_a, vec_b = self._pair_vectors(question_a, question_b)
+        except Exception:
+            return None
+
+        with self.lock:
+            group = self._groups.get(key)
+            if group is None:
+                return None
+            if group["mats"] is None:
+                group["mats"] = (np.vstack(group["a"]), np.vstack(group["b"]))
+            mat_a, mat_b = group["mats"]
+            results = list(group["results"])
+            # 同一市场对（问题完全相同）但描述已变化的条目不可复用
+            stale = [k for k, (qa, qb, fp) in enumerate(zip(group["qa"], group["qb"], group["fp"]))
+                     if qa == question_a and qb == question_b and fp != fingerprint]
+
+        sims = np.minimum(mat_a @ vec_a, mat_b @ vec_b)
+        if stale:
+            sims[stale] = -np.inf
+        best = int(np.argmax(sims))
+        return results[best] if sims[best] >= self.threshold else None
+
+    def put(self, question_a: str, question_b: str, result: Dict, end_dates: Tuple = (),
+            fingerprint: int = 0):
+        """缓存一个市场对的分析结果（超过容量时丢弃最早的条目）"""
+        import time
+        try:
+            vec_a, vec_b = self._pair_vectors(question_a, question_b)
+        except Exception:
+            return
+        key = self._group_key(question_a, question_b, end_dates)
+        now = time.monotonic()
+        with self.lock:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = {
+                    "a": [], "b": [], "results": [], "mats": None, "qa": [], "qb": [], "fp": []
+                }
+            group["a"].append(vec_a)
+            group["b"].append(vec_b)
+            group["results"].append(result)
+            group["qa"].append(question_a)
+            group["qb"].append(question_b)
+            group["fp"].append(fingerprint)
+            group["mats"] = None
+            self._refs[question_a] += 1
+            self._refs[question_b] += 1
+            self._order.append((key, now + self.ttl))
+            self._evict_expired(now)
+            while len(self._order) > self.max_entries:
+                self._evict_oldest()
+
+    def _evict_expired(self, now: float):
+        """淘汰已过期的条目（调用方持有锁）"""
+        while self._order and self._order[0][1] <= now:
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        """淘汰最早的条目，并清理不再被任何条目引用的问题向量（调用方持有锁）"""
+        oldest_key, _ = self._order.popleft()
+        oldest = self._groups[oldest_key]
+        questions = (oldest["qa"][0], oldest["qb"][0])
+        for column in ("a", "b", "results", "qa", "qb", "fp"):
+            del oldest[column][0]
+        oldest["mats"] = None
+        if not oldest["results"]:
+            del self._groups[oldest_key]
+        for q in questions:
+            self._refs[q] -= 1
+            if self._refs[q] <= 0:
+                del self._refs[q]
+                self._vectors.pop(q, None)
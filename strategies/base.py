@@ -157,5 +157,16 @@ class BaseArbitrageStrategy(ABC):
 
         return filtered
 
+    def filter_pairs_by_price_gap(self, pairs: List[tuple]) -> List[tuple]:
+        """
+        跳过 YES 价格差不足利润阈值的市场对（元组前两项为市场）
+
+        价差类策略的理论利润就是两个市场的 YES 价格差，
+        差值低于 min_profit_threshold 时无论 LLM 判定何种关系都不会产生机会，
+        在分析前剔除可直接省掉这部分 LLM 调用。
+        """
+        min_gap = self.metadata.min_profit_threshold / 100
+        return [p for p in pairs if abs(p[0].yes_price - p[1].yes_price) >= min_gap]
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} id={self.metadata.id}>"
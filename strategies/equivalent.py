@@ -79,14 +79,18 @@ class EquivalentStrategy(BaseArbitrageStrategy):
 
             # 使用语义相似度找候选对
             pairs = self._find_similar_pairs(filtered_markets, config)
+            # 等价套利的利润即价差，价差不足的对无需 LLM 分析
+            pairs = self.filter_pairs_by_price_gap(pairs)
             total_pairs = len(pairs)
 
             if progress_callback:
                 progress_callback(0, total_pairs + 1, "分析等价市场...")
 
-            for idx, (m1, m2, similarity) in enumerate(pairs):
+            results = self._analyze_pairs([(m1, m2) for m1, m2, _ in pairs], config)
+            for idx, ((m1, m2, similarity), result) in enumerate(zip(pairs, results)):
                 # 分析是否等价
-                if self._is_equivalent(m1, m2, config):
+                config['_last_analysis'] = result or {}  # 暂存分析结果供下一步使用
+                if self._is_equivalent_result(result):
                     opp = self._check_price_spread(m1, m2, config)
                     if opp and self.validate_opportunity(opp):
                         opportunities.append(opp)
@@ -133,14 +137,17 @@ class EquivalentStrategy(BaseArbitrageStrategy):
         if len(pairs) < 10:
             sample_size = min(len(markets), 40)
             sample = markets[:sample_size]
+            # 每个市场只分词一次，而不是每个配对都重新 lower().split()
+            word_sets = [set(m.question.lower().split()) for m in sample]
             for i, m1 in enumerate(sample):
-                for m2 in sample[i+1:]:
+                q1 = word_sets[i]
+                for j in range(i + 1, sample_size):
+                    m2 = sample[j]
                     pair_id = tuple(sorted([m1.id, m2.id]))
                     if pair_id in seen_pairs:
                         continue
 
-                    q1 = set(m1.question.lower().split())
-                    q2 = set(m2.question.lower().split())
+                    q2 = word_sets[j]
                     intersection = q1.intersection(q2)
                     union = q1.union(q2)
                     sim = len(intersection) / len(union) if union else 0
@@ -151,23 +158,38 @@ class EquivalentStrategy(BaseArbitrageStrategy):
 
         return sorted(pairs, key=lambda x: x[2], reverse=True)[:30]
 
-    def _is_equivalent(
+    def _analyze_pairs(self, pairs: List[tuple], config: Dict[str, Any]):
+        """按顺序产出各市场对的分析结果（分析器支持时按 llm_max_workers 并发请求 LLM）"""
+        analyzer = config.get('analyzer')
+        analyze_many = getattr(analyzer, 'analyze_many', None)
+        if analyze_many is not None:
+            return analyze_many(
+                pairs,
+                max_workers=config.get('llm_max_workers', 4),
+                group_size=config.get('llm_group_size', 1)
+            )
+        return (self._analyze_pair(m1, m2, config) for m1, m2 in pairs)
+
+    @staticmethod
+    def _is_equivalent_result(result: Optional[Dict]) -> bool:
+        """分析结果是否判定为高置信度语义等价"""
+        return bool(result) and result.get('relationship') == 'EQUIVALENT' and result.get('confidence', 0) >= 0.8
+
+    def _analyze_pair(
         self,
         m1: 'Market',
         m2: 'Market',
         config: Dict[str, Any]
-    ) -> bool:
-        """调用 LLM 判断是否语义等价"""
+    ) -> Optional[Dict]:
+        """调用 LLM 分析两个市场的关系"""
         analyzer = config.get('analyzer')
         if not analyzer:
-            return False
+            return None
 
         try:
-            result = analyzer.analyze_relationship(m1, m2)
-            config['_last_analysis'] = result # 暂存分析结果供下一步使用
-            return result.get('relationship') == 'EQUIVALENT' and result.get('confidence', 0) >= 0.8
+            return analyzer.analyze(m1, m2)
         except Exception:
-            return False
+            return None
 
     def _check_price_spread(
         self,
@@ -83,15 +83,14 @@ class ImplicationStrategy(BaseArbitrageStrategy):
 
             # 获取相似市场对进行分析
             pairs = self._get_candidate_pairs(filtered_markets, config)
+            # 两个方向的蕴含套利都要求 |P(A) - P(B)| 达到利润阈值，不满足的对无需 LLM 分析
+            pairs = self.filter_pairs_by_price_gap(pairs)
             total_pairs = len(pairs)
 
             if progress_callback:
                 progress_callback(0, total_pairs + 1, "分析市场对...")
 
-            for idx, (m1, m2) in enumerate(pairs):
-                # 分析逻辑关系
-                result = self._analyze_pair(m1, m2, config)
-
+            for idx, ((m1, m2), result) in enumerate(zip(pairs, self._analyze_pairs(pairs, config))):
                 if result and result.get('relationship') in ['IMPLIES_AB', 'IMPLIES_BA']:
                     opp = self._check_implication_arbitrage(m1, m2, result, config)
                     if opp and self.validate_opportunity(opp):
@@ -152,6 +151,18 @@ class ImplicationStrategy(BaseArbitrageStrategy):
 
         return pairs[:max_pairs]
 
+    def _analyze_pairs(self, pairs: List[tuple], config: Dict[str, Any]):
+        """按顺序产出各市场对的分析结果（分析器支持时并发请求 LLM）"""
+        analyzer = config.get('analyzer')
+        analyze_many = getattr(analyzer, 'analyze_many', None)
+        if analyze_many is not None:
+            return analyze_many(
+                pairs,
+                max_workers=config.get('llm_max_workers', 4),
+                group_size=config.get('llm_group_size', 1)
+            )
+        return (self._analyze_pair(m1, m2, config) for m1, m2 in pairs)
+
     def _analyze_pair(
         self,
         m1: 'Market',
@@ -165,7 +176,7 @@ class ImplicationStrategy(BaseArbitrageStrategy):
 
         try:
             # 调用 LLM 分析两个市场的关系
-            return analyzer.analyze_relationship(m1, m2)
+            return analyzer.analyze(m1, m2)
         except Exception as e:
             return None
 
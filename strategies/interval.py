@@ -5,6 +5,9 @@
 适用于价格区间类市场（如 BTC 在 95k-100k 之间）。
 """
 
+import re
+from bisect import bisect_right
+from itertools import accumulate
 from typing import List, Dict, Any, Optional, TYPE_CHECKING
 from .base import BaseArbitrageStrategy, StrategyMetadata, RiskLevel
 from .registry import StrategyRegistry
@@ -12,6 +15,25 @@ from .registry import StrategyRegistry
 if TYPE_CHECKING:
     from local_scanner_v2 import Market, ArbitrageOpportunity
 
+# 可选：google-re2（线性时间 DFA 引擎，无回溯），未安装时使用标准库 re
+try:
+    import re2 as _regex_engine
+except ImportError:
+    _regex_engine = re
+
+
+# 简化的区间提取模式（按优先级排列，模块加载时编译一次）
+# 每个模式附带廉价的子串判别词：小写问题中不含任一判别词时直接跳过正则
+# 大小写不敏感用内联 (?i) 表示，re 与 re2 的 compile 都能直接接受
+_INTERVAL_PATTERNS = (
+    # between X and Y
+    (('between',), _regex_engine.compile(r'(?i)(\w+)\s+(?:price\s+)?between\s+\$?([\d.]+)k?\s+and\s+\$?([\d.]+)k?')),
+    # X-Y range
+    (('-', '–'), _regex_engine.compile(r'(?i)(\w+)\s+(?:price\s+)?\$?([\d.]+)k?\s*[-–]\s*\$?([\d.]+)k?')),
+    # above/below X
+    (('above', 'over'), _regex_engine.compile(r'(?i)(\w+)\s+(?:will\s+be\s+)?(?:above|over)\s+\$?([\d.]+)k?')),
+)
+
 
 @StrategyRegistry.register
 class IntervalStrategy(BaseArbitrageStrategy):
@@ -112,16 +134,29 @@ BTC[<95k] 价格 30¢，BTC[95k-100k] 价格 35¢，BTC[>100k] 价格 25¢
         self,
         markets: List['Market']
     ) -> List[tuple]:
-        """解析区间市场"""
-        results = []
+        """
+        解析区间市场
+
+        所有问题用 NUL 拼接成一段文本，每个模式只做一次 finditer 扫描，
+        再按各问题的起始偏移二分定位匹配所属的市场。NUL 既不是 \\w 也不是 \\s，
+        匹配不会跨越问题边界；按模式优先级依次填充，每个市场只保留最先命中的模式，
+        结果与逐个调用 _extract_interval 一致。
+        """
+        if not markets:
+            return []
+
+        questions = [getattr(m, 'question', str(m)) for m in markets]
+        blob = "\0".join(questions)
+        starts = list(accumulate((len(q) + 1 for q in questions[:-1]), initial=0))
 
-        for m in markets:
-            question = getattr(m, 'question', str(m))
-            interval = self._extract_interval(question)
-            if interval:
-                results.append((m, interval))
+        intervals: List[Optional[Dict]] = [None] * len(markets)
+        for _, pattern in _INTERVAL_PATTERNS:
+            for match in pattern.finditer(blob):
+                idx = bisect_right(starts, match.start()) - 1
+                if intervals[idx] is None:
+                    intervals[idx] = self._interval_from_groups(match.groups())
 
-        return results
+        return [(m, interval) for m, interval in zip(markets, intervals) if interval]
 
     def _extract_interval(self, question: str) -> Optional[Dict]:
         """
@@ -132,36 +167,33 @@ BTC[<95k] 价格 30¢，BTC[95k-100k] 价格 35¢，BTC[>100k] 价格 25¢
         - "ETH price 2000-2500"
         - "SOL will be above $150"
         """
-        import re
-
-        # 简化的区间提取
-        patterns = [
-            # between X and Y
-            r'(\w+)\s+(?:price\s+)?between\s+\$?([\d.]+)k?\s+and\s+\$?([\d.]+)k?',
-            # X-Y range
-            r'(\w+)\s+(?:price\s+)?\$?([\d.]+)k?\s*[-–]\s*\$?([\d.]+)k?',
-            # above/below X
-            r'(\w+)\s+(?:will\s+be\s+)?(?:above|over)\s+\$?([\d.]+)k?',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, question, re.IGNORECASE)
+        question_lower = question.lower()
+
+        for keywords, pattern in _INTERVAL_PATTERNS:
+            if not any(kw in question_lower for kw in keywords):
+                continue
+            match = pattern.search(question)
             if match:
-                groups = match.groups()
-                if len(groups) == 3:
-                    return {
-                        'asset': groups[0].upper(),
-                        'low': float(groups[1]),
-                        'high': float(groups[2]),
-                        'type': 'range'
-                    }
-                elif len(groups) == 2:
-                    return {
-                        'asset': groups[0].upper(),
-                        'threshold': float(groups[1]),
-                        'type': 'threshold'
-                    }
+                return self._interval_from_groups(match.groups())
+
+        return None
 
+    @staticmethod
+    def _interval_from_groups(groups: tuple) -> Optional[Dict]:
+        """由区间模式的捕获组构造区间信息（3 组为区间，2 组为阈值）"""
+        if len(groups) == 3:
+            return {
+                'asset': groups[0].upper(),
+                'low': float(groups[1]),
+                'high': float(groups[2]),
+                'type': 'range'
+            }
+        elif len(groups) == 2:
+            return {
+                'asset': groups[0].upper(),
+                'threshold': float(groups[1]),
+                'type': 'threshold'
+            }
         return None
 
     def _analyze_intervals(
@@ -23,11 +23,41 @@
     is_valid, reason, details = validator.validate_exhaustive_set(markets)
 """
 
+import re
 from dataclasses import dataclass, field
 from typing import List, Optional, Tuple, Dict, Any
 from enum import Enum
 
 
+# 价格阈值提取模式（模块加载时预编译）
+# 上涨模式: above, hit, reach, exceed, 突破, 超过
+# 支持 k/K (千), M (百万), B (十亿), T (万亿) 后缀
+_UP_THRESHOLD_REGEXES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:above|hit|reach|exceed|突破|超过)\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
+    r'\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)\s*(?:and above|or higher)',
+    r'(?:price|value)\s*(?:>|>=|above)\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
+    # NEW: Handle "> $X" format anywhere in question (e.g., "market cap > $2B")
+    r'>\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
+    # NEW: Handle ">$X" (no space) format
+    r'>\$([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
+    # NEW: Handle "over $X", "exceeds $X", "crosses $X", "surpasses $X"
+    r'(?:over|exceeds|crosses|surpasses|greater than)\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
+))
+
+# 下跌模式: dip, below, fall, drop, 跌到, 跌破, 跌至
+_DOWN_THRESHOLD_REGEXES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:dip|below|fall|drop|跌到|跌破|跌至)\s*(?:to\s*)?\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
+    r'\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)\s*(?:and below|or lower)',
+    r'(?:price|value)\s*(?:<|<=|below)\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
+    # NEW: Handle "< $X" format anywhere
+    r'<\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
+    # NEW: Handle "<$X" (no space) format
+    r'<\$([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
+    # NEW: Handle "under $X", "less than $X"
+    r'(?:under|less than)\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
+))
+
+
 class ValidationResult(Enum):
     """验证结果类型"""
     PASSED = "passed"           # 验证通过
@@ -36,7 +66,7 @@ class ValidationResult(Enum):
     NEEDS_REVIEW = "needs_review"  # 需要人工复核
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationReport:
     """验证报告"""
     result: ValidationResult
@@ -60,7 +90,7 @@ class ValidationReport:
     warnings: List[str] = field(default_factory=list)
 
     def is_valid(self) -> bool:
-        return self.result in [ValidationResult.PASSED, ValidationResult.WARNING]
+        return self.result is ValidationResult.PASSED or self.result is ValidationResult.WARNING
 
     def to_dict(self) -> Dict:
         return {
@@ -80,7 +110,7 @@ class ValidationReport:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketData:
     """市场数据（用于验证）"""
     id: str
@@ -115,7 +145,7 @@ class MarketData:
         return self.best_ask_no if self.best_ask_no > 0 else (1.0 - self.yes_price)
 
 
-@dataclass
+@dataclass(slots=True)
 class IntervalData:
     """
     区间市场数据（用于 T6 区间完备集套利）
@@ -668,34 +698,6 @@ class MathValidator:
             - value: 阈值数值
             如果不是阈值类市场，返回 None
         """
-        import re
-
-        # 上涨模式: above, hit, reach, exceed, 突破, 超过
-        # 支持 k/K (千), M (百万), B (十亿), T (万亿) 后缀
-        up_patterns = [
-            r'(?:above|hit|reach|exceed|突破|超过)\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
-            r'\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)\s*(?:and above|or higher)',
-            r'(?:price|value)\s*(?:>|>=|above)\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
-            # NEW: Handle "> $X" format anywhere in question (e.g., "market cap > $2B")
-            r'>\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
-            # NEW: Handle ">$X" (no space) format
-            r'>\$([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
-            # NEW: Handle "over $X", "exceeds $X", "crosses $X", "surpasses $X"
-            r'(?:over|exceeds|crosses|surpasses|greater than)\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
-        ]
-
-        # 下跌模式: dip, below, fall, drop, 跌到, 跌破, 跌至
-        down_patterns = [
-            r'(?:dip|below|fall|drop|跌到|跌破|跌至)\s*(?:to\s*)?\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
-            r'\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)\s*(?:and below|or lower)',
-            r'(?:price|value)\s*(?:<|<=|below)\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
-            # NEW: Handle "< $X" format anywhere
-            r'<\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
-            # NEW: Handle "<$X" (no space) format
-            r'<\$([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
-            # NEW: Handle "under $X", "less than $X"
-            r'(?:under|less than)\s*\$?([\d,]+(?:\.\d+)?[kKmMbBtT]?)',
-        ]
 
         def parse_value(val_str: str) -> float:
             """解析数值字符串，支持 k/K (千), M (百万), B (十亿), T (万亿) 后缀"""
@@ -715,8 +717,8 @@ class MathValidator:
                 val_str = val_str[:-1]
             return float(val_str) * multiplier
 
-        for pattern in up_patterns:
-            match = re.search(pattern, question, re.IGNORECASE)
+        for regex in _UP_THRESHOLD_REGEXES:
+            match = regex.search(question)
             if match:
                 try:
                     value = parse_value(match.group(1))
@@ -724,8 +726,8 @@ class MathValidator:
                 except (ValueError, IndexError):
                     continue
 
-        for pattern in down_patterns:
-            match = re.search(pattern, question, re.IGNORECASE)
+        for regex in _DOWN_THRESHOLD_REGEXES:
+            match = regex.search(question)
             if match:
                 try:
                     value = parse_value(match.group(1))